@@ -0,0 +1,13 @@
+from app.api.alert.active import ActiveAlertIndex, active_alerts
+from app.api.alert.dedup import AlertFingerprintCache, alert_fingerprint, alert_fingerprints, normalize_message
+from app.api.alert.service import AlertService
+
+__all__ = [
+    "ActiveAlertIndex",
+    "AlertFingerprintCache",
+    "AlertService",
+    "active_alerts",
+    "alert_fingerprint",
+    "alert_fingerprints",
+    "normalize_message",
+]
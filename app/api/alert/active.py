@@ -0,0 +1,113 @@
+from typing import Any, Dict, Iterable, List, Optional
+import threading
+from datetime import datetime
+
+from app.data.enums import AlertSeverity, AlertStatus
+
+# Most severe first when listing every severity
+SEVERITY_ORDER = [
+    AlertSeverity.CRITICAL.value,
+    AlertSeverity.HIGH.value,
+    AlertSeverity.MEDIUM.value,
+    AlertSeverity.LOW.value,
+    AlertSeverity.INFO.value,
+]
+
+
+class ActiveAlertIndex:
+    """
+    Unresolved alerts of the fleet, per severity, as the dictionaries the
+    API returns. It is loaded from the database once per process and then
+    kept current as alerts are created, repeated, acknowledged and resolved,
+    so dashboard counts and lists never query the alerts table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_severity: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._severity_of: Dict[int, str] = {}
+        self.loaded = False
+
+    def load(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Replace the active alerts"""
+        with self._lock:
+            self._by_severity = {}
+            self._severity_of = {}
+            for alert in alerts:
+                self._put(alert)
+            self.loaded = True
+
+    def put(self, alert: Dict[str, Any]) -> None:
+        """Add or replace an alert, dropping it if it is resolved"""
+        with self._lock:
+            self._remove(alert["id"])
+            if alert["status"] != AlertStatus.RESOLVED.value:
+                self._put(alert)
+
+    def touch(self, alert_id: int, repeats: int, last_seen: datetime) -> None:
+        """Record repeats folded into an active alert"""
+        with self._lock:
+            severity = self._severity_of.get(alert_id)
+            if severity is None:
+                return
+            alert = dict(self._by_severity[severity][alert_id])
+            alert["count"] += repeats
+            alert["last_seen"] = last_seen.isoformat()
+            self._by_severity[severity][alert_id] = alert
+
+    def remove(self, alert_id: int) -> None:
+        with self._lock:
+            self._remove(alert_id)
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of active alerts per severity and status"""
+        with self._lock:
+            counts = {}
+            for severity in self._severities():
+                alerts = self._by_severity.get(severity, {})
+                acknowledged = sum(1 for alert in alerts.values() if alert["status"] == AlertStatus.ACKNOWLEDGED.value)
+                counts[severity] = {
+                    AlertStatus.OPEN.value: len(alerts) - acknowledged,
+                    AlertStatus.ACKNOWLEDGED.value: acknowledged,
+                    "total": len(alerts),
+                }
+            return counts
+
+    def list(
+        self,
+        severity: Optional[AlertSeverity] = None,
+        status: Optional[AlertStatus] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Active alerts, most severe first and latest first within a severity"""
+        with self._lock:
+            severities = [severity.value] if severity is not None else self._severities()
+            alerts = []
+            for value in severities:
+                group = [
+                    alert for alert in self._by_severity.get(value, {}).values()
+                    if status is None or alert["status"] == status.value
+                ]
+                group.sort(key=lambda alert: alert["last_seen"] or "", reverse=True)
+                alerts.extend(group)
+                if limit is not None and len(alerts) >= limit:
+                    return alerts[:limit]
+            return alerts
+
+    def _severities(self) -> List[str]:
+        # Severities outside the enum (free-form strings from robots) are listed last
+        return SEVERITY_ORDER + sorted(set(self._by_severity) - set(SEVERITY_ORDER))
+
+    def _put(self, alert: Dict[str, Any]) -> None:
+        # Robots may omit a severity; the column default applies to those
+        severity = alert["severity"] or AlertSeverity.LOW.value
+        self._by_severity.setdefault(severity, {})[alert["id"]] = alert
+        self._severity_of[alert["id"]] = severity
+
+    def _remove(self, alert_id: int) -> None:
+        severity = self._severity_of.pop(alert_id, None)
+        if severity is not None:
+            self._by_severity[severity].pop(alert_id, None)
+
+
+active_alerts = ActiveAlertIndex()
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import re
+import threading
+from datetime import datetime
+
+from app.config import Config
+
+# Numbers, hex values and UUIDs vary between repeats of the same alert
+VARIABLE_TOKENS = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|0x[0-9a-f]+|\d+(?:\.\d+)?")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Alert message with its variable parts replaced, so repeats compare equal"""
+    return WHITESPACE.sub(" ", VARIABLE_TOKENS.sub("#", message.lower())).strip()
+
+
+def alert_fingerprint(robot_id: Optional[str], alert_type: Optional[str], message: Optional[str], details: Optional[Dict[str, Any]]) -> str:
+    """
+    Identity of an alert for deduplication: robot, type and either the
+    "dedup_key" of its details or its normalized message
+    """
+    key = details.get("dedup_key") if isinstance(details, dict) else None
+    basis = str(key) if key is not None else normalize_message(message or "")
+    return hashlib.sha1(f"{robot_id}\x1f{alert_type}\x1f{basis}".encode()).hexdigest()
+
+
+class AlertFingerprintCache:
+    """
+    LRU of fingerprint -> (alert id, last seen) for alerts that may still
+    absorb repeats. The lock also serializes deduplication with status
+    transitions, so two reports of the same alert cannot both insert a row
+    and a repeat cannot fold into an alert being resolved.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.RLock()
+        self._entries: "OrderedDict[str, Tuple[int, datetime]]" = OrderedDict()
+
+    def get(self, fingerprint: str) -> Optional[Tuple[int, datetime]]:
+        with self.lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                self._entries.move_to_end(fingerprint)
+            return entry
+
+    def put(self, fingerprint: str, alert_id: int, last_seen: datetime) -> None:
+        with self.lock:
+            self._entries[fingerprint] = (alert_id, last_seen)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, fingerprint: str) -> None:
+        with self.lock:
+            self._entries.pop(fingerprint, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._entries.clear()
+
+
+alert_fingerprints = AlertFingerprintCache(Config.ALERT_FINGERPRINT_CACHE_SIZE)
@@ -0,0 +1,208 @@
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.api.alert.active import active_alerts
+from app.api.alert.dedup import alert_fingerprint, alert_fingerprints
+from app.api.component.status import normalize
+from app.api.health.service import RobotHealthService
+from app.config import Config
+from app.data.alert.repository import AlertRepository
+from app.data.enums import AlertSeverity, AlertStatus, AlertType
+from app.data.models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(alert: Alert) -> str:
+    """Opaque cursor of the page after an alert"""
+    return base64.urlsafe_b64encode(f"{alert.timestamp.isoformat()}|{alert.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, alert_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(alert_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class AlertService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = AlertRepository(db_session)
+
+    def record(self, alert: Alert) -> List[Alert]:
+        """Store an alert unless it repeats a recent one. Returns the alerts inserted."""
+        return self.record_many([alert])
+
+    def record_many(self, alerts: List[Alert]) -> List[Alert]:
+        """
+        Store alerts, folding each one that repeats an alert seen within
+        ALERT_AGGREGATION_WINDOW_SECONDS into that alert's count and
+        last_seen instead of inserting it. Fingerprints are looked up in
+        the in-memory LRU first and in the database only on a miss.
+        Returns the alerts inserted.
+        """
+        if not alerts:
+            return []
+        window = timedelta(seconds=Config.ALERT_AGGREGATION_WINDOW_SECONDS)
+        new_alerts: List[Alert] = []
+        pending: Dict[str, Alert] = {}
+        repeats: Dict[int, Tuple[int, datetime]] = {}
+        repeated: Dict[int, str] = {}
+
+        with alert_fingerprints.lock:
+            for alert in sorted(alerts, key=lambda alert: alert.timestamp or datetime.min):
+                seen = alert.timestamp = alert.timestamp or datetime.utcnow()
+                # Stored in the enum's case, so "HIGH" is counted and filtered as "high"
+                alert.severity = normalize(AlertSeverity, alert.severity)
+                fingerprint = alert.fingerprint = alert_fingerprint(alert.robot_id, alert.type, alert.message, alert.details)
+
+                # Repeat of an alert inserted by this batch
+                first = pending.get(fingerprint)
+                if first is not None and seen - first.last_seen <= window:
+                    first.count += 1
+                    first.last_seen = max(first.last_seen, seen)
+                    continue
+
+                existing = alert_fingerprints.get(fingerprint) if first is None else None
+                if existing is None and first is None:
+                    existing = self.repository.find_recent_by_fingerprint(fingerprint, seen - window)
+                if existing is not None:
+                    alert_id, last_seen = existing
+                    if alert_id in repeats:
+                        last_seen = repeats[alert_id][1]
+                    if seen - last_seen <= window:
+                        count = repeats[alert_id][0] if alert_id in repeats else 0
+                        repeats[alert_id] = (count + 1, max(last_seen, seen))
+                        repeated[alert_id] = fingerprint
+                        continue
+
+                alert.count = 1
+                alert.last_seen = seen
+                pending[fingerprint] = alert
+                new_alerts.append(alert)
+
+            self.repository.create_many(new_alerts)
+            self.repository.add_occurrences(repeats)
+            for alert in pending.values():
+                alert_fingerprints.put(alert.fingerprint, alert.id, alert.last_seen)
+            for alert_id, (_, last_seen) in repeats.items():
+                alert_fingerprints.put(repeated[alert_id], alert_id, last_seen)
+            for alert in new_alerts:
+                active_alerts.put(alert.to_dict())
+            for alert_id, (count, last_seen) in repeats.items():
+                active_alerts.touch(alert_id, count, last_seen)
+
+        opened: Dict[str, Dict[str, int]] = {}
+        for alert in new_alerts:
+            counts = opened.setdefault(alert.robot_id, {})
+            severity = alert.severity or AlertSeverity.LOW.value
+            counts[severity] = counts.get(severity, 0) + 1
+        for robot_id, counts in opened.items():
+            RobotHealthService(self.db_session).alerts_changed(robot_id, counts)
+
+        if repeats:
+            logger.debug(f"Folded {sum(count for count, _ in repeats.values())} repeated alerts into {len(repeats)} existing ones")
+        return new_alerts
+
+    def acknowledge(self, alert_id: int, by: Optional[str] = None) -> Optional[Alert]:
+        """
+        Acknowledge an open alert. It stays active, and keeps absorbing
+        repeats, until resolved. Returns None if the alert does not exist;
+        raises ValueError if it is not open.
+        """
+        return self._transition(alert_id, [AlertStatus.OPEN], {
+            "status": AlertStatus.ACKNOWLEDGED.value,
+            "acknowledged_at": datetime.utcnow(),
+            "acknowledged_by": by,
+        })
+
+    def resolve(self, alert_id: int, by: Optional[str] = None) -> Optional[Alert]:
+        """
+        Resolve an open or acknowledged alert. A repeat after this opens a
+        new alert. Returns None if the alert does not exist; raises
+        ValueError if it is already resolved.
+        """
+        # Under the deduplication lock, so no concurrent report folds into
+        # the alert between its resolution and dropping its fingerprint
+        with alert_fingerprints.lock:
+            alert = self._transition(alert_id, [AlertStatus.OPEN, AlertStatus.ACKNOWLEDGED], {
+                "status": AlertStatus.RESOLVED.value,
+                "resolved_at": datetime.utcnow(),
+                "resolved_by": by,
+            })
+            if alert is not None and alert.fingerprint:
+                alert_fingerprints.forget(alert.fingerprint)
+        if alert is not None:
+            RobotHealthService(self.db_session).alerts_changed(
+                alert.robot_id, {alert.severity or AlertSeverity.LOW.value: -1}
+            )
+        return alert
+
+    def active_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of unresolved alerts per severity and status"""
+        self.ensure_loaded()
+        return active_alerts.counts()
+
+    def list_active(
+        self,
+        severity: Optional[AlertSeverity] = None,
+        status: Optional[AlertStatus] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Unresolved alerts, most severe and latest first"""
+        self.ensure_loaded()
+        return active_alerts.list(severity, status, limit)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        robot_id: Optional[str] = None,
+        severity: Optional[AlertSeverity] = None,
+        alert_type: Optional[AlertType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Alert], Optional[str]]:
+        """
+        One page of alert history matching a full-text query and filters,
+        newest first, with the cursor of the next page (None on the last).
+        Raises ValueError on an invalid cursor.
+        """
+        limit = min(max(limit or Config.ALERT_SEARCH_PAGE_SIZE, 1), Config.ALERT_SEARCH_MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether there is a next page
+        alerts = self.repository.search(query, robot_id, severity, alert_type, since, until, after, limit + 1)
+        if len(alerts) > limit:
+            alerts = alerts[:limit]
+            return alerts, encode_cursor(alerts[-1])
+        return alerts, None
+
+    def ensure_loaded(self) -> None:
+        """Load the unresolved alerts once per process"""
+        if active_alerts.loaded:
+            return
+        # Inserts and transitions hold this lock, so none is lost between the read and the load
+        with alert_fingerprints.lock:
+            if not active_alerts.loaded:
+                active_alerts.load(alert.to_dict() for alert in self.repository.get_active_alerts())
+
+    def _transition(self, alert_id: int, from_statuses: List[AlertStatus], values: Dict[str, Any]) -> Optional[Alert]:
+        # Transitions and deduplication are serialized, so a repeat never folds into an alert as it is resolved
+        with alert_fingerprints.lock:
+            alert = self.repository.get_by_id(alert_id)
+            if alert is None:
+                return None
+            if alert.status not in [status.value for status in from_statuses]:
+                raise ValueError(f"Alert {alert_id} is {alert.status}")
+            updated = self.repository.transition(alert_id, from_statuses, values)
+            if updated is None:
+                # Changed state since it was read
+                raise ValueError(f"Alert {alert_id} is {self.repository.get_by_id(alert_id).status}")
+            active_alerts.put(updated.to_dict())
+            return updated
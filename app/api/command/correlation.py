@@ -0,0 +1,142 @@
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from app.data.enums import CommandStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_COMMAND_STATUSES = frozenset({
+    CommandStatus.COMPLETED,
+    CommandStatus.FAILED,
+    CommandStatus.CANCELLED,
+})
+
+
+class CommandOutcome:
+    """Final status of a command as reported by a robot"""
+    __slots__ = ("command_id", "status", "result", "error")
+
+    def __init__(
+        self,
+        command_id: str,
+        status: CommandStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        self.command_id = command_id
+        self.status = status
+        self.result = result
+        self.error = error
+
+
+class CommandWaiter:
+    """A single caller blocked on the outcome of a command"""
+    __slots__ = ("command_id", "event", "outcome")
+
+    def __init__(self, command_id: str):
+        self.command_id = command_id
+        self.event = threading.Event()
+        self.outcome: Optional[CommandOutcome] = None
+
+
+class CommandCorrelationIndex:
+    """
+    Maps outstanding command IDs to the callers waiting for their result.
+    Results arriving on any transport (HTTP, MQTT, RabbitMQ, or a NOTIFY from
+    another process) resolve the waiters in O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, List[CommandWaiter]] = {}
+        self._listeners: List[Callable[[CommandOutcome], None]] = []
+        # Identifies notifications sent by this process so they are not handled twice
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def register(self, command_id: str) -> CommandWaiter:
+        """Register interest in the outcome of a command"""
+        waiter = CommandWaiter(command_id)
+        with self._lock:
+            self._waiters.setdefault(command_id, []).append(waiter)
+        return waiter
+
+    def discard(self, waiter: CommandWaiter) -> None:
+        """Remove a waiter that is no longer interested (e.g. after a timeout)"""
+        with self._lock:
+            waiters = self._waiters.get(waiter.command_id)
+            if not waiters:
+                return
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters:
+                del self._waiters[waiter.command_id]
+
+    def wait(self, waiter: CommandWaiter, timeout: float) -> Optional[CommandOutcome]:
+        """Block until the command resolves or the timeout expires"""
+        try:
+            if waiter.event.wait(timeout):
+                return waiter.outcome
+            return None
+        finally:
+            self.discard(waiter)
+
+    def add_listener(self, listener: Callable[[CommandOutcome], None]) -> None:
+        """Call listener for every command outcome resolved in this process"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def pending_count(self) -> int:
+        """Number of commands with at least one waiter"""
+        with self._lock:
+            return len(self._waiters)
+
+    def resolve(
+        self,
+        command_id: str,
+        status: CommandStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> int:
+        """
+        Wake every waiter of a command that reached a terminal status.
+        Returns the number of waiters woken.
+        """
+        if status not in TERMINAL_COMMAND_STATUSES:
+            return 0
+
+        outcome = CommandOutcome(command_id, status, result, error)
+        with self._lock:
+            waiters = self._waiters.pop(command_id, [])
+            listeners = list(self._listeners)
+
+        for waiter in waiters:
+            waiter.outcome = outcome
+            waiter.event.set()
+
+        for listener in listeners:
+            try:
+                listener(outcome)
+            except Exception as e:
+                logger.error(f"Error in command outcome listener: {str(e)}")
+
+        return len(waiters)
+
+    def resolve_remote(self, payload: Dict[str, Any]) -> int:
+        """Resolve a command from a notification sent by another process"""
+        if payload.get("origin") == self.origin:
+            return 0
+        command_id = payload.get("command_id")
+        if not command_id:
+            return 0
+        try:
+            status = CommandStatus(payload.get("status"))
+        except (ValueError, AttributeError):
+            logger.error(f"Unknown status in command notification: {payload}")
+            return 0
+        return self.resolve(command_id, status, error=payload.get("error"))
+
+
+command_correlation = CommandCorrelationIndex()
@@ -69,4 +69,7 @@ class CreateMissionCommandParameters(BaseModel):
     name: str = Field(..., description="Mission name")
     description: Optional[str] = Field(None, description="Mission description")
     steps: List[MissionStep] = Field(..., description="List of mission steps")
-    priority: Optional[int] = Field(None, description="Mission priority") 
\ No newline at end of file
+    priority: Optional[int] = Field(None, description="Mission priority")
+
+class ExecuteMissionCommandParameters(BaseModel):
+    action_id: str = Field(..., description="ID of the mission (action) to execute")
@@ -0,0 +1,100 @@
+from typing import Any, Dict, List, Optional, Type
+import logging
+from pydantic import BaseModel, ValidationError
+
+from app.api.command.dto import (
+    MoveCommandParameters,
+    GotoCommandParameters,
+    SetModeCommandParameters,
+    CreateMissionCommandParameters,
+    ExecuteMissionCommandParameters,
+    MissionStep
+)
+from app.data.enums import CommandType
+
+logger = logging.getLogger(__name__)
+
+# Parameter schema per command type; types not listed take free-form parameters
+COMMAND_PARAMETER_SCHEMAS: Dict[CommandType, Type[BaseModel]] = {
+    CommandType.MOVE: MoveCommandParameters,
+    CommandType.GOTO: GotoCommandParameters,
+    CommandType.SET_MODE: SetModeCommandParameters,
+    CommandType.CREATE_MISSION: CreateMissionCommandParameters,
+    CommandType.EXECUTE_MISSION: ExecuteMissionCommandParameters,
+}
+
+
+class CommandValidationError(ValueError):
+    """Raised when command parameters do not match the schema of their command type"""
+
+    def __init__(self, command_type: CommandType, errors: List[Dict[str, Any]], prefix: str = ""):
+        self.command_type = command_type
+        self.errors = errors
+        details = "; ".join(
+            f"{prefix}{'.'.join(str(part) for part in error['loc']) or 'parameters'}: {error['msg']}"
+            for error in errors
+        )
+        super().__init__(f"Invalid parameters for {command_type.value} command: {details}")
+
+
+class CommandParameterRegistry:
+    """
+    Validates command parameters against the schema registered for their
+    command type. Validators are resolved once in compile(), so validating
+    a command is one dict lookup plus the pydantic core validation.
+    """
+
+    def __init__(self, schemas: Dict[CommandType, Type[BaseModel]]):
+        self._schemas = dict(schemas)
+        self._validators: Dict[CommandType, Any] = {}
+
+    def compile(self) -> "CommandParameterRegistry":
+        """Build the validator of every registered schema"""
+        for command_type, schema in self._schemas.items():
+            schema.model_rebuild()
+            self._validators[command_type] = schema.__pydantic_validator__
+        logger.debug(f"Compiled parameter schemas for {len(self._validators)} command types")
+        return self
+
+    def schema_for(self, command_type: CommandType) -> Optional[Type[BaseModel]]:
+        """Get the parameter schema of a command type, if any"""
+        return self._schemas.get(command_type)
+
+    def validate(self, command_type: CommandType, parameters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate parameters for a command type and return them with the
+        schema's coercions applied. Raises CommandValidationError.
+        """
+        parameters = parameters or {}
+        validator = self._validators.get(command_type)
+        if validator is None:
+            return parameters
+
+        try:
+            model = validator.validate_python(parameters)
+        except ValidationError as e:
+            raise CommandValidationError(command_type, e.errors()) from e
+
+        if command_type == CommandType.CREATE_MISSION:
+            self.validate_steps(model.steps)
+        return {**parameters, **model.model_dump(exclude_unset=True)}
+
+    def validate_steps(self, steps: List[MissionStep]) -> None:
+        """Validate each mission step against the schema of its own command type"""
+        for step in steps:
+            try:
+                command_type = CommandType(step.command_type)
+            except (ValueError, AttributeError):
+                raise ValueError(f"Invalid command type in mission step {step.sequence}: {step.command_type}")
+            if command_type in (CommandType.CREATE_MISSION, CommandType.EXECUTE_MISSION):
+                raise ValueError(f"Mission step {step.sequence} cannot be a {command_type.value} command")
+            validator = self._validators.get(command_type)
+            if validator is None:
+                continue
+            try:
+                validator.validate_python(step.parameters)
+            except ValidationError as e:
+                raise CommandValidationError(command_type, e.errors(), prefix=f"steps[{step.sequence}].") from e
+
+
+command_parameter_registry = CommandParameterRegistry(COMMAND_PARAMETER_SCHEMAS).compile()
@@ -1,19 +1,47 @@
 from typing import List, Optional, Dict, Any
 import logging
+import uuid
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.data.command.repository import CommandRepository
+from app.data.robot.repository import RobotRepository
 from app.data.models import Command
 from app.data.enums import CommandStatus, CommandType
+from app.api.command.correlation import command_correlation, TERMINAL_COMMAND_STATUSES
+from app.api.command.parameters import command_parameter_registry
 from app.api.command.dto import CommandCreate, CommandUpdate, CommandResponse
-from app.data.command.dto import CommandCreateDTO, CommandUpdateDTO, CommandStatusUpdateDTO, CommandResponseDTO
+from app.data.command.dto import (
+    CommandCreateDTO,
+    CommandUpdateDTO,
+    CommandStatusUpdateDTO,
+    CommandResponseDTO,
+    CommandBroadcastDTO,
+    CommandBatchEntryDTO,
+    CommandBatchResponseDTO
+)
 
 logger = logging.getLogger(__name__)
 
+# Status values used by robots that do not map directly onto CommandStatus
+ROBOT_STATUS_ALIASES = {
+    "success": CommandStatus.COMPLETED,
+    "done": CommandStatus.COMPLETED,
+    "failure": CommandStatus.FAILED,
+    "error": CommandStatus.FAILED,
+}
+
+MISSION_COMMAND_TYPES = frozenset({CommandType.CREATE_MISSION, CommandType.EXECUTE_MISSION})
+
 class CommandService:
     def __init__(self, db: Session):
         self.repository = CommandRepository(db)
+        self.robot_repository = RobotRepository(db)
+        self.messaging_service = None
+
+    def set_messaging_service(self, service):
+        """Set the messaging service used to publish commands"""
+        self.messaging_service = service
 
     def get_command(self, command_id: str) -> Optional[CommandResponseDTO]:
         """Get a command by ID"""
@@ -27,13 +55,40 @@ class CommandService:
 
     def create_command(self, command_data: CommandCreateDTO) -> CommandResponseDTO:
         """Create a new command"""
+        parameters = command_parameter_registry.validate(command_data.command_type, command_data.parameters)
         command = self.repository.create(
             robot_id=command_data.robot_id,
             command_type=command_data.command_type,
-            parameters=command_data.parameters
+            parameters=parameters
         )
+        if command_data.command_type in MISSION_COMMAND_TYPES:
+            return self._run_mission_command(command, command_data)
         return CommandResponseDTO.from_orm(command)
 
+    def _run_mission_command(self, command: Command, command_data: CommandCreateDTO) -> CommandResponseDTO:
+        """Mission commands are executed server-side by the mission executor"""
+        from app.api.mission.dto import MissionCreate
+        from app.api.mission.service import MissionService
+
+        mission_service = MissionService(self.repository.db)
+        try:
+            if command_data.command_type == CommandType.CREATE_MISSION:
+                # The command's robot wins over any robot_id among its parameters
+                mission = MissionCreate(**{**command_data.parameters, "robot_id": command_data.robot_id})
+                action = mission_service.create_mission(mission)
+                return self.record_result(command.command_id, CommandStatus.COMPLETED, {"action_id": action.action_id})
+
+            action_id = command_data.parameters.get("action_id")
+            self.record_result(command.command_id, CommandStatus.IN_PROGRESS, {"action_id": action_id})
+            if not mission_service.execute_mission(action_id, command_id=command.command_id):
+                raise ValueError(f"Mission {action_id} not found")
+            # The mission may already have finished and resolved the command
+            self.repository.db.expire_all()
+            return self.get_command(command.command_id)
+        except ValueError as e:
+            self.record_result(command.command_id, CommandStatus.FAILED, error=str(e))
+            raise
+
     def update_command(self, command_id: str, command_data: CommandUpdateDTO) -> Optional[CommandResponseDTO]:
         """Update a command"""
         command = self.repository.get_by_id(command_id)
@@ -48,43 +103,154 @@ class CommandService:
 
     def update_command_status(self, command_id: str, status_data: CommandStatusUpdateDTO) -> Optional[CommandResponseDTO]:
         """Update command status"""
-        command = self.repository.get_by_id(command_id)
-        if not command:
-            return None
-            
-        command = self.repository.update_status(
+        return self.record_result(
             command_id=command_id,
             status=status_data.status,
             result=status_data.result,
             error=status_data.error
         )
-        return CommandResponseDTO.from_orm(command) if command else None
+
+    def record_result(
+        self,
+        command_id: str,
+        status: Any,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> Optional[CommandResponseDTO]:
+        """
+        Store a command status reported over any transport and wake the callers
+        waiting on it, in this process and (through NOTIFY) in the others.
+        """
+        status = self.normalize_status(status)
+        command = self.repository.update_status(
+            command_id=command_id,
+            status=status,
+            result=result,
+            error=error
+        )
+        if not command:
+            return None
+
+        if status in TERMINAL_COMMAND_STATUSES:
+            self.repository.notify_result(command_id, status, command_correlation.origin, error)
+            command_correlation.resolve(command_id, status, result, error)
+        return CommandResponseDTO.from_orm(command)
+
+    def await_result(self, command_id: str, timeout: float) -> Optional[CommandResponseDTO]:
+        """
+        Wait up to timeout seconds for a command to finish and return its
+        latest state, or None if there is no such command (any more)
+        """
+        waiter = command_correlation.register(command_id)
+        try:
+            # The result may have been stored before the waiter was registered
+            self.repository.db.expire_all()
+            command = self.repository.get_by_id(command_id)
+            if not command:
+                return None
+            if command.status in TERMINAL_COMMAND_STATUSES:
+                return CommandResponseDTO.from_orm(command)
+
+            # Give the connection back to the pool while blocked; the session
+            # starts a new transaction on a fresh connection for the re-read
+            self.repository.db.rollback()
+            self.repository.db.close()
+            command_correlation.wait(waiter, timeout)
+            command = self.repository.get_by_id(command_id)
+            return CommandResponseDTO.from_orm(command) if command else None
+        finally:
+            command_correlation.discard(waiter)
+
+    @staticmethod
+    def normalize_status(status: Any) -> CommandStatus:
+        """Convert a reported status (enum, value or robot alias) to a CommandStatus"""
+        if isinstance(status, CommandStatus):
+            return status
+        alias = ROBOT_STATUS_ALIASES.get(str(status).lower())
+        if alias:
+            return alias
+        return CommandStatus(str(status))
 
     def delete_command(self, command_id: str) -> bool:
         """Delete a command"""
         return self.repository.delete(command_id)
 
-    def _validate_command_parameters(self, command_type: str, parameters: Dict[str, Any]) -> None:
-        """Validate command parameters based on command type."""
-        if command_type == CommandType.MOVE.value:
-            required_params = ["x", "y", "z"]
-            if not all(param in parameters for param in required_params):
-                raise ValueError(f"Move command requires parameters: {required_params}")
-            
-        elif command_type == CommandType.GOTO.value:
-            required_params = ["location_id"]
-            if not all(param in parameters for param in required_params):
-                raise ValueError(f"Goto command requires parameters: {required_params}")
-            
-        elif command_type == CommandType.SET_MODE.value:
-            required_params = ["mode"]
-            if not all(param in parameters for param in required_params):
-                raise ValueError(f"Set mode command requires parameters: {required_params}")
-            
-        elif command_type == CommandType.CREATE_MISSION.value:
-            required_params = ["name", "steps"]
-            if not all(param in parameters for param in required_params):
-                raise ValueError(f"Create mission command requires parameters: {required_params}")
-            
-            if not isinstance(parameters.get("steps"), list):
-                raise ValueError("Mission steps must be a list") 
\ No newline at end of file
+    def broadcast_command(self, broadcast_data: CommandBroadcastDTO) -> CommandBatchResponseDTO:
+        """Create one command per selected robot and publish them as a single batch"""
+        selector = broadcast_data.selector
+        if selector.is_empty():
+            raise ValueError("Robot selector must specify robot_ids, status or capability")
+        parameters = command_parameter_registry.validate(broadcast_data.command_type, broadcast_data.parameters)
+
+        robot_ids = self.robot_repository.select_ids(
+            robot_ids=selector.robot_ids,
+            status=selector.status,
+            capability=selector.capability
+        )
+        batch_id = str(uuid.uuid4())
+        rows = self.repository.create_many(
+            robot_ids=robot_ids,
+            command_type=broadcast_data.command_type,
+            parameters=parameters,
+            batch_id=batch_id
+        )
+
+        if rows and self.messaging_service:
+            timestamp = datetime.now().isoformat()
+            self.messaging_service.publish_many([
+                (
+                    f"robots/{row['robot_id']}/commands",
+                    {
+                        "command_id": row["command_id"],
+                        "command_type": broadcast_data.command_type.value,
+                        "parameters": parameters,
+                        "batch_id": batch_id,
+                        "timestamp": timestamp,
+                    }
+                )
+                for row in rows
+            ])
+        elif rows:
+            logger.warning(f"Messaging service not initialized, batch {batch_id} left for polling")
+
+        logger.info(f"Broadcast {broadcast_data.command_type.value} to {len(rows)} robots as batch {batch_id}")
+        return CommandBatchResponseDTO(
+            batch_id=batch_id,
+            command_type=broadcast_data.command_type,
+            total=len(rows),
+            status_counts={CommandStatus.PENDING.value: len(rows)} if rows else {},
+            commands=[
+                CommandBatchEntryDTO(
+                    command_id=row["command_id"],
+                    robot_id=row["robot_id"],
+                    status=CommandStatus.PENDING
+                )
+                for row in rows
+            ]
+        )
+
+    def get_batch(self, batch_id: str, include_commands: bool = True) -> Optional[CommandBatchResponseDTO]:
+        """Get the aggregate and per-robot status of a broadcast batch"""
+        if not include_commands:
+            counts = self.repository.count_by_batch_status(batch_id)
+            if not counts:
+                return None
+            return CommandBatchResponseDTO(
+                batch_id=batch_id,
+                total=sum(counts.values()),
+                status_counts={status.value: count for status, count in counts.items()}
+            )
+
+        commands = self.repository.get_by_batch(batch_id)
+        if not commands:
+            return None
+        status_counts: Dict[str, int] = {}
+        for command in commands:
+            status_counts[command.status.value] = status_counts.get(command.status.value, 0) + 1
+        return CommandBatchResponseDTO(
+            batch_id=batch_id,
+            command_type=commands[0].command_type,
+            total=len(commands),
+            status_counts=status_counts,
+            commands=[CommandBatchEntryDTO.from_orm(command) for command in commands]
+        )
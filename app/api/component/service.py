@@ -2,6 +2,9 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.api.component.model import RobotComponent
+from app.api.component.status import component_states
+from app.api.health.service import RobotHealthService
+from app.api.maintenance.planner import maintenance_index
 from app.data.component.repository import ComponentRepository
 
 
@@ -30,6 +33,7 @@ class ComponentService:
 
         db_component = Component.from_api_model(component, robot_id)
         created_component = self.component_repo.create(db_component)
+        self._components_changed(robot_id)
         return created_component.to_api_model()
 
     def update_component(self, component: RobotComponent) -> Optional[RobotComponent]:
@@ -43,8 +47,22 @@ class ComponentService:
         # Preserve the robot_id when updating
         db_component = Component.from_api_model(component, existing.robot_id)
         updated_component = self.component_repo.update(db_component)
+        # Status reports are diffed against the cached state, which this write replaced
+        component_states.forget(component.uuid)
+        self._components_changed(existing.robot_id)
         return updated_component.to_api_model()
 
     def delete_component(self, component_id: str) -> bool:
         """Delete a component by its ID"""
-        return self.component_repo.delete(component_id)
+        existing = self.component_repo.get_by_id(component_id)
+        robot_id = existing.robot_id if existing else None
+        deleted = self.component_repo.delete(component_id)
+        component_states.forget(component_id)
+        if deleted:
+            self._components_changed(robot_id)
+        return deleted
+
+    def _components_changed(self, robot_id: str) -> None:
+        """Rescore the robot and reindex maintenance after its components were written"""
+        RobotHealthService(self.db_session).recompute(robot_id)
+        maintenance_index.invalidate()
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Type
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.api.health.service import RobotHealthService
+from app.config import Config
+from app.data.component.repository import ComponentRepository
+from app.data.enums import CaseInsensitiveEnum, ComponentDiagnosisState, ComponentStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentState:
+    """Last known status of a component, as stored"""
+    __slots__ = ("robot_id", "status", "diagnosis_state", "parameters")
+
+    def __init__(self, robot_id: str, status: Optional[str], diagnosis_state: Optional[str], parameters: Any):
+        self.robot_id = robot_id
+        self.status = status
+        self.diagnosis_state = diagnosis_state
+        self.parameters = parameters
+
+
+class ComponentStateCache:
+    """LRU of the last known state of components, so status reports are diffed without a read"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self._entries: "OrderedDict[str, ComponentState]" = OrderedDict()
+
+    def get(self, component_id: str) -> Optional[ComponentState]:
+        with self.lock:
+            state = self._entries.get(component_id)
+            if state is not None:
+                self._entries.move_to_end(component_id)
+            return state
+
+    def put(self, component_id: str, state: ComponentState) -> None:
+        with self.lock:
+            self._entries[component_id] = state
+            self._entries.move_to_end(component_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, component_id: str) -> None:
+        with self.lock:
+            self._entries.pop(component_id, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._entries.clear()
+
+
+component_states = ComponentStateCache(Config.COMPONENT_STATE_CACHE_SIZE)
+
+
+def normalize(enum: Type[CaseInsensitiveEnum], value: Any) -> Optional[str]:
+    """Stored form of a reported enum value; values outside the enum are kept as given"""
+    if value is None:
+        return None
+    try:
+        return enum(value.value if isinstance(value, enum) else value).value
+    except ValueError:
+        return str(value)
+
+
+class ComponentStatusService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = ComponentRepository(db_session)
+
+    def apply_status(
+        self,
+        robot_id: str,
+        component_id: str,
+        status: Any = None,
+        diagnosis_state: Any = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply a component status report. Fields that are missing from the
+        report or equal to the last known state are not written; a status or
+        diagnosis change is appended to the component history. Returns the
+        fields written, or None if the robot has no such component.
+        """
+        state = component_states.get(component_id)
+        if state is None:
+            row = self.repository.get_state(component_id)
+            if row is None:
+                return None
+            state = ComponentState(row.robot_id, row.status, row.diagnosis_state, row.parameters)
+            component_states.put(component_id, state)
+        if state.robot_id != robot_id:
+            logger.warning(f"Robot {robot_id} reported status of component {component_id} of robot {state.robot_id}")
+            return None
+
+        status = normalize(ComponentStatus, status)
+        diagnosis_state = normalize(ComponentDiagnosisState, diagnosis_state)
+        values: Dict[str, Any] = {}
+        if status is not None and status != state.status:
+            values["status"] = status
+        if diagnosis_state is not None and diagnosis_state != state.diagnosis_state:
+            values["diagnosis_state"] = diagnosis_state
+        if parameters is not None and parameters != state.parameters:
+            values["parameters"] = parameters
+        if not values:
+            return {}
+
+        transition = None
+        if "status" in values or "diagnosis_state" in values:
+            transition = {
+                "robot_id": robot_id,
+                "changed_at": timestamp or datetime.utcnow(),
+                "previous_status": state.status,
+                "status": values.get("status", state.status),
+                "previous_diagnosis_state": state.diagnosis_state,
+                "diagnosis_state": values.get("diagnosis_state", state.diagnosis_state),
+            }
+        try:
+            self.repository.apply_changes(robot_id, component_id, values, transition)
+        except Exception:
+            # The stored state is unknown now; read it again next time
+            component_states.forget(component_id)
+            raise
+        component_states.put(component_id, ComponentState(
+            robot_id,
+            values.get("status", state.status),
+            values.get("diagnosis_state", state.diagnosis_state),
+            values.get("parameters", state.parameters),
+        ))
+        if "diagnosis_state" in values:
+            RobotHealthService(self.db_session).component_changed(
+                robot_id, state.diagnosis_state, values["diagnosis_state"]
+            )
+        return values
+
+    def get_history(
+        self,
+        component_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> list:
+        """Status and diagnosis transitions of a component, oldest first"""
+        return [entry.to_dict() for entry in self.repository.get_history(component_id, since, until)]
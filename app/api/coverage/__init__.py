@@ -0,0 +1,4 @@
+from app.api.coverage.raster import CoverageRaster
+from app.api.coverage.service import CoverageEngine, CoverageService, coverage_engine
+
+__all__ = ["CoverageRaster", "CoverageEngine", "CoverageService", "coverage_engine"]
@@ -0,0 +1,234 @@
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import math
+import zlib
+from datetime import datetime
+import numpy as np
+
+from app.api.geofence.index import PreparedGeofence
+
+# Cells tested per containment pass when rasterizing a field polygon
+MASK_CHUNK_CELLS = 1 << 16
+
+# Changes when the grid layout changes, so rasters stored with an older layout are rebuilt
+GRID_VERSION = 2
+
+
+def polygon_hash(polygon: Any) -> str:
+    """Stable hash of a polygon, used to detect that a stored raster is outdated"""
+    return hashlib.sha1(json.dumps(polygon, separators=(",", ":")).encode()).hexdigest()
+
+
+def field_hash(fence: PreparedGeofence) -> str:
+    """Hash of a field's polygon and the grid layout its raster was built with"""
+    return polygon_hash([GRID_VERSION, fence.vertices.tolist()])
+
+
+def longitude_scale(latitude: float) -> float:
+    """Meters per degree of longitude relative to meters per degree of latitude"""
+    return max(math.cos(math.radians(latitude)), 1e-6)
+
+
+def pack_grid(grid: np.ndarray) -> bytes:
+    """Bit-pack and compress a boolean grid"""
+    return zlib.compress(np.packbits(grid, axis=None).tobytes(), 6)
+
+
+def unpack_grid(data: bytes, shape: Tuple[int, int]) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8), count=shape[0] * shape[1])
+    return bits.reshape(shape).astype(bool)
+
+
+class CoverageRaster:
+    """
+    Occupancy grid of one field, with x latitude and y longitude. Cell (i, j)
+    spans [origin_x + i * resolution, origin_x + (i + 1) * resolution) along
+    x and resolution_y along y, which is resolution stretched by the
+    longitude scale at the grid's middle latitude, so cells are square on
+    the ground. Distances are measured with longitude scaled the same way.
+    mask marks cells inside the field polygon and covered the cells an
+    implement has passed over. The covered count is kept up to date while
+    painting, so coverage is never recomputed from the grid.
+    """
+
+    def __init__(
+        self,
+        geofence_id: str,
+        origin_x: float,
+        origin_y: float,
+        resolution: float,
+        mask: np.ndarray,
+        covered: Optional[np.ndarray] = None,
+        shape_hash: str = "",
+        updated_at: Optional[datetime] = None
+    ):
+        self.geofence_id = geofence_id
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.resolution = resolution
+        self.mask = mask
+        # Derived from the stored grid, so a raster read back lines up with the one written
+        self.y_scale = longitude_scale(origin_x + mask.shape[0] * resolution / 2)
+        self.resolution_y = resolution / self.y_scale
+        self.covered = covered if covered is not None else np.zeros_like(mask)
+        self.shape_hash = shape_hash
+        self.field_cells = int(np.count_nonzero(mask))
+        self.covered_cells = int(np.count_nonzero(self.covered & mask))
+        self.updated_at = updated_at
+        self.dirty = False
+
+    @classmethod
+    def for_field(cls, fence: PreparedGeofence, resolution: float, max_cells: int) -> "CoverageRaster":
+        """Rasterize a field polygon, coarsening the resolution if the grid would exceed max_cells"""
+        width = fence.max_x - fence.min_x
+        # Longitude extent in latitude-degree units, i.e. proportional to meters
+        height = (fence.max_y - fence.min_y) * longitude_scale((fence.min_x + fence.max_x) / 2)
+        if width * height / (resolution * resolution) > max_cells:
+            resolution = math.sqrt(width * height / max_cells)
+        rows = max(1, math.ceil(width / resolution))
+        resolution_y = resolution / longitude_scale(fence.min_x + rows * resolution / 2)
+        shape = (rows, max(1, math.ceil((fence.max_y - fence.min_y) / resolution_y)))
+
+        centers_y = fence.min_y + (np.arange(shape[1]) + 0.5) * resolution_y
+        mask = np.zeros(shape, dtype=bool)
+        rows_per_chunk = max(1, MASK_CHUNK_CELLS // shape[1])
+        for start in range(0, shape[0], rows_per_chunk):
+            rows = np.arange(start, min(start + rows_per_chunk, shape[0]))
+            xs = np.repeat(fence.min_x + (rows + 0.5) * resolution, shape[1])
+            ys = np.tile(centers_y, len(rows))
+            mask[rows] = fence.contains_many(xs, ys).reshape(len(rows), shape[1])
+
+        return cls(
+            fence.geofence_id, fence.min_x, fence.min_y, resolution, mask,
+            shape_hash=field_hash(fence)
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.mask.shape
+
+    @property
+    def coverage_percent(self) -> float:
+        if not self.field_cells:
+            return 0.0
+        return 100.0 * self.covered_cells / self.field_cells
+
+    def paint_segment(self, x0: float, y0: float, x1: float, y1: float, half_width: float) -> int:
+        """
+        Mark cells within half_width (in latitude degrees, i.e. meters times
+        units per meter) of a segment as covered. Returns the number of newly
+        covered cells.
+        """
+        # A swath narrower than a cell still covers the cells it passes through
+        half_width = max(half_width, self.resolution / 2)
+        half_width_y = half_width / self.y_scale
+        i0 = max(0, math.floor((min(x0, x1) - half_width - self.origin_x) / self.resolution))
+        i1 = min(self.shape[0], math.ceil((max(x0, x1) + half_width - self.origin_x) / self.resolution))
+        j0 = max(0, math.floor((min(y0, y1) - half_width_y - self.origin_y) / self.resolution_y))
+        j1 = min(self.shape[1], math.ceil((max(y0, y1) + half_width_y - self.origin_y) / self.resolution_y))
+        if i0 >= i1 or j0 >= j1:
+            return 0
+
+        # Cell centers and the segment with longitude scaled to latitude degrees
+        px = (self.origin_x + (np.arange(i0, i1) + 0.5) * self.resolution)[:, None]
+        py = ((self.origin_y + (np.arange(j0, j1) + 0.5) * self.resolution_y) * self.y_scale)[None, :]
+        y0, y1 = y0 * self.y_scale, y1 * self.y_scale
+        dx, dy = x1 - x0, y1 - y0
+        length_squared = dx * dx + dy * dy
+        if length_squared == 0:
+            t = 0.0
+        else:
+            t = np.clip(((px - x0) * dx + (py - y0) * dy) / length_squared, 0.0, 1.0)
+        hit = np.hypot(px - (x0 + t * dx), py - (y0 + t * dy)) <= half_width
+
+        window = (slice(i0, i1), slice(j0, j1))
+        hit &= self.mask[window]
+        newly = hit & ~self.covered[window]
+        painted = int(np.count_nonzero(newly))
+        if painted:
+            self.covered[window] |= newly
+            self.covered_cells += painted
+            self.dirty = True
+        return painted
+
+    def paint_track(self, xs: np.ndarray, ys: np.ndarray, half_width: float) -> int:
+        """Paint consecutive segments of a track"""
+        painted = 0
+        if len(xs) == 1:
+            return self.paint_segment(xs[0], ys[0], xs[0], ys[0], half_width)
+        for k in range(len(xs) - 1):
+            painted += self.paint_segment(xs[k], ys[k], xs[k + 1], ys[k + 1], half_width)
+        return painted
+
+    def reset(self) -> None:
+        """Clear all coverage, e.g. at the start of a season"""
+        self.covered[:] = False
+        self.covered_cells = 0
+        self.dirty = True
+
+    def sample(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(inside field, covered) at arbitrary points, broadcasting xs against ys"""
+        i = np.floor((xs - self.origin_x) / self.resolution).astype(np.int64)
+        j = np.floor((ys - self.origin_y) / self.resolution_y).astype(np.int64)
+        i, j = np.broadcast_arrays(i, j)
+        valid = (i >= 0) & (i < self.shape[0]) & (j >= 0) & (j < self.shape[1])
+        inside = np.zeros(i.shape, dtype=bool)
+        covered = np.zeros(i.shape, dtype=bool)
+        inside[valid] = self.mask[i[valid], j[valid]]
+        covered[valid] = self.covered[i[valid], j[valid]] & inside[valid]
+        return inside, covered
+
+    def covered_rectangles(self, max_cells: int) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """
+        Covered area as horizontal runs of cells, (row, first column, last column),
+        on a grid downsampled so it has at most max_cells cells. A downsampled
+        cell counts as covered when most of its field cells are. Returns the
+        downsampling factor and the runs.
+        """
+        factor = max(1, math.ceil(math.sqrt(self.mask.size / max_cells)))
+        if factor > 1:
+            rows = math.ceil(self.shape[0] / factor) * factor
+            columns = math.ceil(self.shape[1] / factor) * factor
+            covered = np.zeros((rows, columns), dtype=np.int32)
+            field = np.zeros((rows, columns), dtype=np.int32)
+            covered[:self.shape[0], :self.shape[1]] = self.covered & self.mask
+            field[:self.shape[0], :self.shape[1]] = self.mask
+            covered = covered.reshape(rows // factor, factor, columns // factor, factor).sum(axis=(1, 3))
+            field = field.reshape(rows // factor, factor, columns // factor, factor).sum(axis=(1, 3))
+            grid = (field > 0) & (covered * 2 >= field)
+        else:
+            grid = self.covered & self.mask
+
+        runs = []
+        for row in np.flatnonzero(grid.any(axis=1)).tolist():
+            line = np.concatenate(([0], grid[row].astype(np.int8), [0]))
+            edges = np.flatnonzero(np.diff(line))
+            for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+                runs.append((row, start, end - 1))
+        return factor, runs
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "geofence_id": self.geofence_id,
+            "polygon_hash": self.shape_hash,
+            "origin_x": self.origin_x,
+            "origin_y": self.origin_y,
+            "resolution": self.resolution,
+            "width": self.shape[0],
+            "height": self.shape[1],
+            "field_cells": self.field_cells,
+            "covered_cells": self.covered_cells,
+            "mask": pack_grid(self.mask),
+            "covered": pack_grid(self.covered),
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_row(cls, row) -> "CoverageRaster":
+        shape = (row.width, row.height)
+        return cls(
+            row.geofence_id, row.origin_x, row.origin_y, row.resolution,
+            unpack_grid(row.mask, shape), unpack_grid(row.covered, shape),
+            shape_hash=row.polygon_hash, updated_at=row.updated_at
+        )
@@ -0,0 +1,215 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.coverage.raster import CoverageRaster, field_hash
+from app.api.geofence.evaluator import geofence_evaluator
+from app.api.geofence.index import PreparedGeofence
+from app.api.geofence.service import GeofenceService
+from app.config import Config
+from app.data.coverage.repository import CoverageRepository
+from app.data.models import Component
+from app.data.enums import GeofenceType
+from app.utils.png import encode_png
+from app.utils.tiles import TILE_SIZE, tile_pixel_centers
+
+logger = logging.getLogger(__name__)
+
+# (x, y, timestamp)
+TrackPosition = Tuple[float, float, datetime]
+
+COVERED_COLOR = (46, 160, 67, 170)
+UNCOVERED_COLOR = (200, 200, 200, 70)
+
+
+class CoverageEngine:
+    """In-memory coverage rasters of the fields robots are working, with the last position of each robot"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.rasters: Dict[str, CoverageRaster] = {}
+        self.last_positions: Dict[str, TrackPosition] = {}
+        self.half_widths: Dict[str, Tuple[float, float]] = {}  # robot_id -> (half width, fetched at)
+        self.last_flush = time.monotonic()
+
+
+coverage_engine = CoverageEngine()
+
+
+class CoverageService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = CoverageRepository(db_session)
+
+    def record_positions(self, robot_id: str, positions: Sequence[TrackPosition]) -> int:
+        """
+        Paint the swath a robot's implement covered between consecutive
+        positions onto the fields those positions are in. Returns the number
+        of newly covered cells.
+        """
+        if not positions:
+            return 0
+        GeofenceService(self.db_session).ensure_loaded()
+        index = geofence_evaluator.index
+        painted = 0
+
+        with coverage_engine.lock:
+            previous = coverage_engine.last_positions.get(robot_id)
+            track = sorted(positions, key=lambda position: position[2])
+            if previous is not None:
+                # Positions older than the last one painted cannot be joined to the track
+                track = [position for position in track if position[2] >= previous[2]]
+                if not track:
+                    return 0
+                track.insert(0, previous)
+            coverage_engine.last_positions[robot_id] = track[-1]
+
+            segments: Dict[str, List[Tuple[float, float, float, float]]] = {}
+            for start, end in zip(track, track[1:]):
+                if (end[2] - start[2]).total_seconds() > Config.COVERAGE_MAX_GAP_SECONDS:
+                    continue
+                for fence_id in index.containing(start[0], start[1]) | index.containing(end[0], end[1]):
+                    fence = index.fences[fence_id]
+                    if fence.fence_type == GeofenceType.FIELD:
+                        segments.setdefault(fence_id, []).append((start[0], start[1], end[0], end[1]))
+            if not segments:
+                return 0
+
+            half_width = self._half_width(robot_id)
+            for fence_id, field_segments in segments.items():
+                raster = self._raster(index.fences[fence_id])
+                for x0, y0, x1, y1 in field_segments:
+                    painted += raster.paint_segment(x0, y0, x1, y1, half_width)
+                if raster.dirty:
+                    raster.updated_at = track[-1][2]
+
+        if time.monotonic() - coverage_engine.last_flush >= Config.COVERAGE_FLUSH_SECONDS:
+            self.flush()
+        return painted
+
+    def get_coverage(self, geofence_id: str) -> Optional[Dict[str, Any]]:
+        """Coverage statistics of a field, None if it is not an active field"""
+        raster = self._field_raster(geofence_id)
+        if raster is None:
+            return None
+        # resolution is in latitude degrees and resolution_y in longitude degrees at the field's latitude
+        cell_area = (raster.resolution / Config.COVERAGE_UNITS_PER_METER) * (
+            raster.resolution_y * raster.y_scale / Config.COVERAGE_UNITS_PER_METER
+        )
+        return {
+            "geofence_id": geofence_id,
+            "coverage_percent": round(raster.coverage_percent, 2),
+            "covered_cells": raster.covered_cells,
+            "field_cells": raster.field_cells,
+            "covered_area_m2": round(raster.covered_cells * cell_area, 1),
+            "field_area_m2": round(raster.field_cells * cell_area, 1),
+            "resolution": raster.resolution,
+            "updated_at": raster.updated_at.isoformat() if raster.updated_at else None,
+        }
+
+    def render_tile(self, geofence_id: str, z: int, x: int, y: int) -> Optional[bytes]:
+        """PNG map tile of a field's coverage. Location x is latitude and y longitude."""
+        raster = self._field_raster(geofence_id)
+        if raster is None:
+            return None
+        latitudes, longitudes = tile_pixel_centers(z, x, y)
+        with coverage_engine.lock:
+            inside, covered = raster.sample(latitudes[:, None], longitudes[None, :])
+        image = np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype=np.uint8)
+        image[inside] = UNCOVERED_COLOR
+        image[covered] = COVERED_COLOR
+        return encode_png(image)
+
+    def covered_geojson(self, geofence_id: str, max_cells: int) -> Optional[Dict[str, Any]]:
+        """Covered area of a field as a GeoJSON MultiPolygon with [longitude, latitude] coordinates"""
+        raster = self._field_raster(geofence_id)
+        if raster is None:
+            return None
+        with coverage_engine.lock:
+            factor, runs = raster.covered_rectangles(max_cells)
+        cell_x, cell_y = raster.resolution * factor, raster.resolution_y * factor
+        polygons = []
+        for row, first, last in runs:
+            south = raster.origin_x + row * cell_x
+            north = south + cell_x
+            west = raster.origin_y + first * cell_y
+            east = raster.origin_y + (last + 1) * cell_y
+            polygons.append([[[west, south], [east, south], [east, north], [west, north], [west, south]]])
+        return {
+            "type": "Feature",
+            "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+            "properties": self.get_coverage(geofence_id),
+        }
+
+    def reset(self, geofence_id: str) -> bool:
+        """Clear a field's coverage"""
+        raster = self._field_raster(geofence_id)
+        if raster is None:
+            return False
+        with coverage_engine.lock:
+            raster.reset()
+            raster.updated_at = datetime.utcnow()
+        self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Store every raster painted since the last flush"""
+        with coverage_engine.lock:
+            dirty = [raster for raster in coverage_engine.rasters.values() if raster.dirty]
+            rows = [raster.to_row() for raster in dirty]
+            coverage_engine.last_flush = time.monotonic()
+        try:
+            self.repository.save_many(rows)
+        except Exception as e:
+            logger.error(f"Error flushing coverage rasters: {str(e)}")
+            return 0
+        with coverage_engine.lock:
+            for raster in dirty:
+                raster.dirty = False
+        return len(rows)
+
+    def _field_raster(self, geofence_id: str) -> Optional[CoverageRaster]:
+        GeofenceService(self.db_session).ensure_loaded()
+        fence = geofence_evaluator.index.fences.get(geofence_id)
+        if fence is None or fence.fence_type != GeofenceType.FIELD:
+            return None
+        with coverage_engine.lock:
+            return self._raster(fence)
+
+    def _raster(self, fence: PreparedGeofence) -> CoverageRaster:
+        # Called with the engine lock held
+        raster = coverage_engine.rasters.get(fence.geofence_id)
+        shape_hash = field_hash(fence)
+        if raster is not None and raster.shape_hash == shape_hash:
+            return raster
+
+        stored = self.repository.get(fence.geofence_id) if raster is None else None
+        if stored is not None and stored.polygon_hash == shape_hash:
+            raster = CoverageRaster.from_row(stored)
+        else:
+            # New field, or its boundary or the grid layout changed and the old grid no longer lines up
+            raster = CoverageRaster.for_field(fence, Config.COVERAGE_RESOLUTION_METERS * Config.COVERAGE_UNITS_PER_METER, Config.COVERAGE_MAX_CELLS)
+            raster.dirty = True
+            logger.info(f"Created {raster.shape[0]}x{raster.shape[1]} coverage raster for field {fence.name}")
+        coverage_engine.rasters[fence.geofence_id] = raster
+        return raster
+
+    def _half_width(self, robot_id: str) -> float:
+        # Called with the engine lock held; component parameters are re-read periodically
+        cached = coverage_engine.half_widths.get(robot_id)
+        if cached is not None and time.monotonic() - cached[1] < Config.COVERAGE_IMPLEMENT_REFRESH_SECONDS:
+            return cached[0]
+
+        widths = []
+        for (parameters,) in self.db_session.query(Component.parameters).filter(Component.robot_id == robot_id):
+            width = (parameters or {}).get("implement_width")
+            if isinstance(width, (int, float)) and width > 0:
+                widths.append(float(width))
+        width = max(widths) if widths else Config.COVERAGE_DEFAULT_IMPLEMENT_WIDTH
+        half_width = width * Config.COVERAGE_UNITS_PER_METER / 2
+        coverage_engine.half_widths[robot_id] = (half_width, time.monotonic())
+        return half_width
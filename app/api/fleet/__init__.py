@@ -0,0 +1,3 @@
+from app.api.fleet.service import SNAPSHOT_FIELDS, FleetSnapshotService, parse_fields
+
+__all__ = ["FleetSnapshotService", "SNAPSHOT_FIELDS", "parse_fields"]
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional, Sequence
+import json
+from sqlalchemy.orm import Session
+
+from app.api.mission.executor import mission_executor
+from app.data.fleet.repository import FleetRepository
+from app.data.models import Robot
+
+# Snapshot field -> Robot column
+ROBOT_FIELDS = {
+    "name": "name",
+    "ip_address": "ip_address",
+    "port": "port",
+    "version": "version",
+    "software_version": "software_version",
+    "capabilities": "capabilities",
+    "status": "status",
+    "last_seen": "last_seen",
+    "health_metrics": "health_metrics",
+    "health_score": "health_score",
+    "metadata": "robot_metadata",
+}
+# Fields loaded from other tables, each by at most one query for the whole fleet
+RELATED_FIELDS = ("components", "location", "telemetry", "alerts", "mission")
+SNAPSHOT_FIELDS = tuple(ROBOT_FIELDS) + RELATED_FIELDS
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Snapshot fields from a comma separated list; all of them if none are given"""
+    if not fields:
+        return list(SNAPSHOT_FIELDS)
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(selected) - set(SNAPSHOT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown fields {', '.join(unknown)}; expected some of {', '.join(SNAPSHOT_FIELDS)}")
+    return selected
+
+
+def robot_value(robot: Robot, field: str) -> Any:
+    value = getattr(robot, ROBOT_FIELDS[field])
+    if field == "capabilities" and isinstance(value, str):
+        # Registration stores capabilities as a JSON string
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    if field == "last_seen":
+        return value.isoformat() if value else None
+    return value
+
+
+class FleetSnapshotService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = FleetRepository(db_session)
+
+    def snapshot(
+        self,
+        robot_ids: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Robots with the selected fields, loaded in at most four queries
+        whatever the fleet size: robots with their locations, their
+        components, latest telemetry and open alert counts. Running missions
+        come from the mission executor.
+        """
+        fields = list(SNAPSHOT_FIELDS) if fields is None else list(fields)
+        columns = ["robot_id"] + [ROBOT_FIELDS[field] for field in fields if field in ROBOT_FIELDS]
+        robots = self.repository.get_robots(
+            robot_ids,
+            columns=columns,
+            with_components="components" in fields,
+            with_location="location" in fields,
+        )
+        if robot_ids is None:
+            # Whole fleet: unfiltered aggregates need no IN list of every robot
+            ids = None
+        else:
+            ids = [robot.robot_id for robot in robots]
+        telemetry = self.repository.get_latest_telemetry(ids) if "telemetry" in fields and robots else {}
+        alerts = self.repository.get_open_alert_counts(ids) if "alerts" in fields and robots else {}
+        missions = mission_executor.running_by_robot() if "mission" in fields else {}
+
+        snapshots = []
+        for robot in robots:
+            snapshot = {"robot_id": robot.robot_id}
+            for field in fields:
+                if field in ROBOT_FIELDS:
+                    snapshot[field] = robot_value(robot, field)
+            if "components" in fields:
+                snapshot["components"] = [component.to_dict() for component in robot.components]
+            if "location" in fields:
+                snapshot["location"] = robot.location.to_dict() if robot.location else None
+            if "telemetry" in fields:
+                record = telemetry.get(robot.robot_id)
+                snapshot["telemetry"] = {
+                    "timestamp": record.timestamp.isoformat() if record.timestamp else None,
+                    "data": record.data,
+                } if record else None
+            if "alerts" in fields:
+                counts = alerts.get(robot.robot_id, {})
+                snapshot["alerts"] = {"open": sum(counts.values()), "by_severity": counts}
+            if "mission" in fields:
+                progress = missions.get(robot.robot_id)
+                snapshot["mission"] = dict(progress.dict(), status=progress.status.value) if progress else None
+            snapshots.append(snapshot)
+        return snapshots
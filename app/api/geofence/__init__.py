@@ -0,0 +1,15 @@
+from app.api.geofence.dto import GeofenceCreate, GeofenceUpdate
+from app.api.geofence.evaluator import GeofenceEvaluator, GeofenceTransition, geofence_evaluator
+from app.api.geofence.index import GeofenceIndex, PreparedGeofence
+from app.api.geofence.service import GeofenceService
+
+__all__ = [
+    "GeofenceCreate",
+    "GeofenceUpdate",
+    "GeofenceEvaluator",
+    "GeofenceTransition",
+    "geofence_evaluator",
+    "GeofenceIndex",
+    "PreparedGeofence",
+    "GeofenceService",
+]
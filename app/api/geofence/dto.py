@@ -0,0 +1,27 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field, validator
+
+from app.api.geofence.index import validate_polygon
+from app.data.enums import GeofenceType
+
+
+class GeofenceCreate(BaseModel):
+    name: str = Field(..., description="Geofence name")
+    fence_type: GeofenceType = Field(GeofenceType.FIELD, description="Field boundary or exclusion zone")
+    polygon: List[List[float]] = Field(..., description="Polygon vertices as [x, y] pairs")
+    active: bool = Field(True, description="Whether positions are evaluated against this geofence")
+
+    @validator("polygon")
+    def check_polygon(cls, v):
+        return validate_polygon(v)
+
+
+class GeofenceUpdate(BaseModel):
+    name: Optional[str] = None
+    fence_type: Optional[GeofenceType] = None
+    polygon: Optional[List[List[float]]] = None
+    active: Optional[bool] = None
+
+    @validator("polygon")
+    def check_polygon(cls, v):
+        return validate_polygon(v) if v is not None else v
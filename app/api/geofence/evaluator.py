@@ -0,0 +1,165 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+import threading
+from datetime import datetime
+import numpy as np
+
+from app.api.geofence.index import GeofenceIndex, PreparedGeofence
+from app.config import Config
+from app.data.enums import AlertSeverity, GeofenceType
+
+GEOFENCE_ENTER = "enter"
+GEOFENCE_EXIT = "exit"
+
+
+class GeofenceTransition:
+    """A robot crossing a geofence boundary"""
+    __slots__ = ("robot_id", "fence", "event", "x", "y", "timestamp")
+
+    def __init__(self, robot_id: str, fence: PreparedGeofence, event: str, x: float, y: float, timestamp: datetime):
+        self.robot_id = robot_id
+        self.fence = fence
+        self.event = event
+        self.x = x
+        self.y = y
+        self.timestamp = timestamp
+
+    @property
+    def is_violation(self) -> bool:
+        """Leaving a field or entering an exclusion zone"""
+        if self.fence.fence_type == GeofenceType.EXCLUSION:
+            return self.event == GEOFENCE_ENTER
+        return self.event == GEOFENCE_EXIT
+
+    @property
+    def severity(self) -> AlertSeverity:
+        if not self.is_violation:
+            return AlertSeverity.INFO
+        return AlertSeverity.HIGH if self.fence.fence_type == GeofenceType.EXCLUSION else AlertSeverity.MEDIUM
+
+    @property
+    def message(self) -> str:
+        verb = "entered" if self.event == GEOFENCE_ENTER else "left"
+        kind = "exclusion zone" if self.fence.fence_type == GeofenceType.EXCLUSION else "field"
+        return f"Robot {self.robot_id} {verb} {kind} {self.fence.name}"
+
+
+class GeofenceEvaluator:
+    """
+    Tracks which geofences each robot is inside and reports enter/exit
+    transitions. The first position of a robot only sets its state (and is
+    reported if it is inside an exclusion zone), and a repeat of the same
+    transition within the cooldown is suppressed, so a robot jittering on a
+    boundary does not flood alerts.
+    """
+
+    def __init__(self, cell_size: float, cooldown_seconds: float):
+        self.cell_size = cell_size
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._index = GeofenceIndex((), cell_size)
+        self._inside: Dict[str, FrozenSet[str]] = {}
+        self._last_emitted: Dict[Tuple[str, str, str], datetime] = {}
+        self.loaded = False
+
+    @property
+    def index(self) -> GeofenceIndex:
+        """Index of the active geofences"""
+        return self._index
+
+    @property
+    def fence_count(self) -> int:
+        return len(self._index)
+
+    def load(self, fences: Iterable[PreparedGeofence]) -> None:
+        """Replace the active geofences"""
+        index = GeofenceIndex(fences, self.cell_size)
+        with self._lock:
+            self._index = index
+            # Forget fences that no longer exist without reporting an exit
+            self._inside = {
+                robot_id: frozenset(fence_id for fence_id in inside if fence_id in index.fences)
+                for robot_id, inside in self._inside.items()
+            }
+            self.loaded = True
+
+    def evaluate(self, robot_id: str, x: float, y: float, timestamp: datetime) -> List[GeofenceTransition]:
+        """Test one position and return the transitions it causes"""
+        index = self._index
+        inside = index.containing(x, y)
+        with self._lock:
+            previous = self._inside.get(robot_id)
+            self._inside[robot_id] = inside
+            changes = self._changes(index, previous, inside)
+            return self._emit(robot_id, [(fence, event, x, y, timestamp) for fence, event in changes])
+
+    def evaluate_batch(
+        self,
+        robot_id: str,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        timestamps: Sequence[datetime]
+    ) -> List[GeofenceTransition]:
+        """Test a time-ordered batch of positions of one robot, vectorized per fence"""
+        if len(xs) == 0:
+            return []
+        index = self._index
+        inside_by_fence = index.containing_many(xs, ys)
+        with self._lock:
+            previous = self._inside.get(robot_id)
+            fence_ids = set(inside_by_fence) | (previous or frozenset())
+            found: List[Tuple[int, PreparedGeofence, str]] = []
+            final = set()
+            for fence_id in fence_ids:
+                fence = index.fences.get(fence_id)
+                if fence is None:
+                    continue
+                inside = inside_by_fence.get(fence_id)
+                if inside is None:
+                    inside = np.zeros(len(xs), dtype=bool)
+                if previous is not None:
+                    was_inside = fence_id in previous
+                else:
+                    # First sighting: only being inside an exclusion zone is reported
+                    was_inside = bool(inside[0]) and fence.fence_type != GeofenceType.EXCLUSION
+                states = np.concatenate(([was_inside], inside)).astype(np.int8)
+                for position in np.flatnonzero(np.diff(states)).tolist():
+                    found.append((position, fence, GEOFENCE_ENTER if inside[position] else GEOFENCE_EXIT))
+                if inside[-1]:
+                    final.add(fence_id)
+            self._inside[robot_id] = frozenset(final)
+            found.sort(key=lambda change: change[0])
+            return self._emit(robot_id, [
+                (fence, event, float(xs[position]), float(ys[position]), timestamps[position])
+                for position, fence, event in found
+            ])
+
+    @staticmethod
+    def _changes(
+        index: GeofenceIndex,
+        previous: Optional[FrozenSet[str]],
+        inside: FrozenSet[str]
+    ) -> List[Tuple[PreparedGeofence, str]]:
+        if previous is None:
+            return [
+                (index.fences[fence_id], GEOFENCE_ENTER) for fence_id in inside
+                if index.fences[fence_id].fence_type == GeofenceType.EXCLUSION
+            ]
+        changes = [(index.fences[fence_id], GEOFENCE_ENTER) for fence_id in inside - previous]
+        changes.extend(
+            (index.fences[fence_id], GEOFENCE_EXIT) for fence_id in previous - inside if fence_id in index.fences
+        )
+        return changes
+
+    def _emit(self, robot_id: str, changes) -> List[GeofenceTransition]:
+        transitions = []
+        for fence, event, x, y, timestamp in changes:
+            key = (robot_id, fence.geofence_id, event)
+            last = self._last_emitted.get(key)
+            if last is not None and abs((timestamp - last).total_seconds()) < self.cooldown_seconds:
+                continue
+            self._last_emitted[key] = timestamp
+            transitions.append(GeofenceTransition(robot_id, fence, event, x, y, timestamp))
+        return transitions
+
+
+geofence_evaluator = GeofenceEvaluator(Config.GEOFENCE_CELL_SIZE, Config.GEOFENCE_ALERT_COOLDOWN_SECONDS)
@@ -0,0 +1,119 @@
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+import math
+import numpy as np
+
+from app.data.enums import GeofenceType
+
+Cell = Tuple[int, int]
+
+
+def validate_polygon(polygon: Sequence[Sequence[float]]) -> List[List[float]]:
+    """Check a polygon is a ring of at least three finite [x, y] vertices and return it as floats"""
+    if not isinstance(polygon, (list, tuple)) or len(polygon) < 3:
+        raise ValueError("Polygon must have at least 3 vertices")
+    vertices = []
+    for vertex in polygon:
+        if not isinstance(vertex, (list, tuple)) or len(vertex) != 2:
+            raise ValueError("Polygon vertices must be [x, y] pairs")
+        x, y = float(vertex[0]), float(vertex[1])
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise ValueError("Polygon vertices must be finite numbers")
+        vertices.append([x, y])
+    if vertices[0] == vertices[-1]:
+        # Closing vertex is implicit
+        vertices.pop()
+    if len(vertices) < 3:
+        raise ValueError("Polygon must have at least 3 distinct vertices")
+    return vertices
+
+
+class PreparedGeofence:
+    """A geofence polygon with its edges and bounding box precomputed for containment tests"""
+    __slots__ = ("geofence_id", "name", "fence_type", "vertices", "min_x", "min_y", "max_x", "max_y", "_edges", "_x1", "_y1", "_x2", "_y2")
+
+    def __init__(self, geofence_id: str, name: str, fence_type: GeofenceType, polygon: Sequence[Sequence[float]]):
+        self.geofence_id = geofence_id
+        self.name = name
+        self.fence_type = fence_type
+        vertices = np.asarray(polygon, dtype=np.float64)
+        self.vertices = vertices
+        following = np.roll(vertices, -1, axis=0)
+        self.min_x, self.min_y = vertices.min(axis=0).tolist()
+        self.max_x, self.max_y = vertices.max(axis=0).tolist()
+        self._x1, self._y1 = vertices[:, 0], vertices[:, 1]
+        self._x2, self._y2 = following[:, 0], following[:, 1]
+        self._edges = list(zip(self._x1.tolist(), self._y1.tolist(), self._x2.tolist(), self._y2.tolist()))
+
+    def contains(self, x: float, y: float) -> bool:
+        """Even-odd ray casting for one point"""
+        if not (self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y):
+            return False
+        inside = False
+        for x1, y1, x2, y2 in self._edges:
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                inside = not inside
+        return inside
+
+    def contains_many(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Even-odd ray casting for many points at once, as a (points x edges) array operation"""
+        inside = np.zeros(len(xs), dtype=bool)
+        in_bbox = (xs >= self.min_x) & (xs <= self.max_x) & (ys >= self.min_y) & (ys <= self.max_y)
+        if not in_bbox.any():
+            return inside
+        px, py = xs[in_bbox][:, None], ys[in_bbox][:, None]
+        straddles = (self._y1 > py) != (self._y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = (self._x2 - self._x1) * (py - self._y1) / (self._y2 - self._y1) + self._x1
+        crossings = np.count_nonzero(straddles & (px < crossing_x), axis=1)
+        inside[in_bbox] = crossings % 2 == 1
+        return inside
+
+
+class GeofenceIndex:
+    """
+    Uniform grid over geofence bounding boxes. A point only tests the fences
+    registered in its cell, so evaluation cost depends on how many fences
+    overlap a spot rather than on how many fences exist.
+    """
+
+    def __init__(self, fences: Iterable[PreparedGeofence], cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self.fences: Dict[str, PreparedGeofence] = {}
+        self._cells: Dict[Cell, Tuple[PreparedGeofence, ...]] = {}
+        cells: Dict[Cell, List[PreparedGeofence]] = {}
+        for fence in fences:
+            self.fences[fence.geofence_id] = fence
+            min_cx, min_cy = self._cell(fence.min_x, fence.min_y)
+            max_cx, max_cy = self._cell(fence.max_x, fence.max_y)
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    cells.setdefault((cx, cy), []).append(fence)
+        self._cells = {cell: tuple(members) for cell, members in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.fences)
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def containing(self, x: float, y: float) -> FrozenSet[str]:
+        """IDs of the fences containing a point"""
+        candidates = self._cells.get(self._cell(x, y))
+        if not candidates:
+            return frozenset()
+        return frozenset(fence.geofence_id for fence in candidates if fence.contains(x, y))
+
+    def containing_many(self, xs: np.ndarray, ys: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        For every fence near at least one point, a boolean array telling which
+        points it contains. Fences absent from the result contain no point.
+        """
+        cell_x = np.floor(xs / self.cell_size).astype(np.int64)
+        cell_y = np.floor(ys / self.cell_size).astype(np.int64)
+        candidates: Dict[str, PreparedGeofence] = {}
+        for cell in set(zip(cell_x.tolist(), cell_y.tolist())):
+            for fence in self._cells.get(cell, ()):
+                candidates[fence.geofence_id] = fence
+        return {geofence_id: fence.contains_many(xs, ys) for geofence_id, fence in candidates.items()}
@@ -0,0 +1,119 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+from datetime import datetime
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.alert.service import AlertService
+from app.api.geofence.dto import GeofenceCreate, GeofenceUpdate
+from app.api.geofence.evaluator import GeofenceTransition, geofence_evaluator
+from app.api.geofence.index import PreparedGeofence
+from app.data.geofence.repository import GeofenceRepository
+from app.data.models import Alert, Geofence
+from app.data.enums import AlertType, GeofenceType
+
+logger = logging.getLogger(__name__)
+
+
+class GeofenceService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = GeofenceRepository(db_session)
+        self.alert_service = AlertService(db_session)
+
+    def list_geofences(self) -> List[Geofence]:
+        """Get all geofences"""
+        return self.repository.get_all()
+
+    def get_geofence(self, geofence_id: str) -> Optional[Geofence]:
+        """Get a geofence by ID"""
+        return self.repository.get_by_id(geofence_id)
+
+    def create_geofence(self, geofence_data: GeofenceCreate) -> Geofence:
+        """Create a geofence and start evaluating positions against it"""
+        geofence = self.repository.create({
+            "name": geofence_data.name,
+            "fence_type": geofence_data.fence_type.value,
+            "polygon": geofence_data.polygon,
+            "active": geofence_data.active,
+        })
+        self.reload()
+        return geofence
+
+    def update_geofence(self, geofence_id: str, geofence_data: GeofenceUpdate) -> Optional[Geofence]:
+        """Update a geofence"""
+        changes = geofence_data.dict(exclude_unset=True)
+        if changes.get("fence_type") is not None:
+            changes["fence_type"] = changes["fence_type"].value
+        geofence = self.repository.update(geofence_id, changes)
+        if geofence:
+            self.reload()
+        return geofence
+
+    def delete_geofence(self, geofence_id: str) -> bool:
+        """Delete a geofence"""
+        deleted = self.repository.delete(geofence_id)
+        if deleted:
+            self.reload()
+        return deleted
+
+    def reload(self) -> None:
+        """Rebuild the evaluator index from the active geofences"""
+        fences = [
+            PreparedGeofence(fence.geofence_id, fence.name, GeofenceType(fence.fence_type), fence.polygon)
+            for fence in self.repository.get_all(active_only=True)
+        ]
+        geofence_evaluator.load(fences)
+        logger.info(f"Loaded {len(fences)} active geofences")
+
+    def check_location(self, robot_id: str, x: float, y: float, timestamp: datetime) -> List[Alert]:
+        """Evaluate one position and store an alert for each geofence transition"""
+        self.ensure_loaded()
+        if not geofence_evaluator.fence_count:
+            return []
+        return self._store_alerts(geofence_evaluator.evaluate(robot_id, x, y, timestamp))
+
+    def check_batch(self, robot_id: str, points: Sequence[Tuple[float, float, datetime]]) -> List[Alert]:
+        """Evaluate a batch of positions of one robot, in time order"""
+        self.ensure_loaded()
+        if not points or not geofence_evaluator.fence_count:
+            return []
+        ordered = sorted(points, key=lambda point: point[2])
+        xs = np.array([point[0] for point in ordered], dtype=np.float64)
+        ys = np.array([point[1] for point in ordered], dtype=np.float64)
+        timestamps = [point[2] for point in ordered]
+        return self._store_alerts(geofence_evaluator.evaluate_batch(robot_id, xs, ys, timestamps))
+
+    def ensure_loaded(self) -> None:
+        """Load the active geofences once per process"""
+        if not geofence_evaluator.loaded:
+            self.reload()
+
+    def _store_alerts(self, transitions: List[GeofenceTransition]) -> List[Alert]:
+        if not transitions:
+            return []
+        alerts = [
+            Alert(
+                robot_id=transition.robot_id,
+                type=AlertType.LOCATION.value,
+                severity=transition.severity.value,
+                message=transition.message,
+                timestamp=transition.timestamp,
+                details=self._details(transition),
+            )
+            for transition in transitions
+        ]
+        for transition in transitions:
+            logger.info(transition.message)
+        # Repeated transitions within the aggregation window are folded
+        return self.alert_service.record_many(alerts)
+
+    @staticmethod
+    def _details(transition: GeofenceTransition) -> Dict[str, Any]:
+        return {
+            "geofence_id": transition.fence.geofence_id,
+            "geofence_name": transition.fence.name,
+            "fence_type": transition.fence.fence_type.value,
+            "event": transition.event,
+            "location": [transition.x, transition.y],
+        }
@@ -0,0 +1,12 @@
+from app.api.health.score import DEFAULT_HEALTH_WEIGHTS, configured_weights, health_score, metrics_penalty
+from app.api.health.service import RobotHealthService, health_sweep, health_weights
+
+__all__ = [
+    "DEFAULT_HEALTH_WEIGHTS",
+    "RobotHealthService",
+    "configured_weights",
+    "health_score",
+    "health_sweep",
+    "health_weights",
+    "metrics_penalty",
+]
@@ -0,0 +1,92 @@
+from typing import Any, Dict, Optional
+import copy
+import json
+import logging
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Penalties subtracted from a score of 100. Percent metrics are penalised
+# linearly from their threshold up to 100%; each group is capped.
+DEFAULT_HEALTH_WEIGHTS: Dict[str, Any] = {
+    "metrics": {
+        "cpu_percent": {"threshold": 80, "weight": 10},
+        "memory_percent": {"threshold": 80, "weight": 10},
+        "disk_percent": {"threshold": 85, "weight": 10},
+        "mavlink_disconnected": 15,
+        "no_gps_fix": 10,
+        "cap": 40,
+    },
+    "components": {"warning": 5, "error": 15, "critical": 30, "unknown": 2, "cap": 60},
+    "alerts": {"info": 0, "low": 1, "medium": 3, "high": 8, "critical": 20, "cap": 50},
+    "stale_heartbeat": 40,
+}
+
+
+def merged_weights(overrides: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Default weights with the given ones replacing them, group by group"""
+    weights = copy.deepcopy(DEFAULT_HEALTH_WEIGHTS if defaults is None else defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(weights.get(key), dict):
+            weights[key] = merged_weights(value, weights[key])
+        else:
+            weights[key] = value
+    return weights
+
+
+def configured_weights() -> Dict[str, Any]:
+    """HEALTH_WEIGHTS (JSON, merged over the defaults) or the default weights"""
+    if not Config.HEALTH_WEIGHTS:
+        return copy.deepcopy(DEFAULT_HEALTH_WEIGHTS)
+    try:
+        overrides = json.loads(Config.HEALTH_WEIGHTS)
+        if not isinstance(overrides, dict):
+            raise ValueError("HEALTH_WEIGHTS must be a JSON object")
+        return merged_weights(overrides)
+    except ValueError as e:
+        logger.error(f"Invalid HEALTH_WEIGHTS, using the defaults: {str(e)}")
+        return copy.deepcopy(DEFAULT_HEALTH_WEIGHTS)
+
+
+def metrics_penalty(metrics: Optional[Dict[str, Any]], weights: Dict[str, Any]) -> float:
+    """Penalty of a robot's reported health metrics (the heartbeat's quick_health)"""
+    if not isinstance(metrics, dict):
+        return 0.0
+    groups = weights["metrics"]
+    penalty = 0.0
+    for name in ("cpu_percent", "memory_percent", "disk_percent"):
+        value, rule = metrics.get(name), groups.get(name)
+        if not isinstance(value, (int, float)) or not rule:
+            continue
+        threshold = rule["threshold"]
+        if value > threshold and threshold < 100:
+            penalty += rule["weight"] * min(1.0, (value - threshold) / (100 - threshold))
+    if metrics.get("mavlink_connected") is False:
+        penalty += groups.get("mavlink_disconnected", 0)
+    if metrics.get("gps_fix") is False:
+        penalty += groups.get("no_gps_fix", 0)
+    return min(penalty, groups.get("cap", penalty))
+
+
+def counted_penalty(counts: Dict[str, int], group: Dict[str, Any]) -> float:
+    penalty = sum(group.get(key, 0) * max(count, 0) for key, count in counts.items() if key != "cap")
+    return min(penalty, group.get("cap", penalty))
+
+
+def empty_factors() -> Dict[str, Any]:
+    return {"metrics": 0.0, "components": {}, "alerts": {}, "stale": False}
+
+
+def health_score(factors: Dict[str, Any], weights: Dict[str, Any]) -> float:
+    """
+    Composite health from 0 (worst) to 100 from a robot's stored factors:
+    its metrics penalty, components per diagnosis state, open alerts per
+    severity and whether its heartbeat is stale
+    """
+    penalty = factors.get("metrics", 0.0)
+    penalty += counted_penalty(factors.get("components", {}), weights["components"])
+    penalty += counted_penalty(factors.get("alerts", {}), weights["alerts"])
+    if factors.get("stale"):
+        penalty += weights["stale_heartbeat"]
+    return round(max(0.0, 100.0 - penalty), 2)
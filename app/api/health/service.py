@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import base64
+import copy
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.api.health.score import configured_weights, empty_factors, health_score, metrics_penalty
+from app.config import Config
+from app.data.robot.repository import RobotRepository
+from app.data.models import Robot
+
+logger = logging.getLogger(__name__)
+
+health_weights = configured_weights()
+
+# Serializes read-modify-write of a robot's stored factors within the process
+_factors_lock = threading.Lock()
+
+
+class HealthSweep:
+    """Marks robots with stale heartbeats, at most once per interval"""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._last_run: Optional[float] = None
+
+    def due(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._last_run is not None and now - self._last_run < self.interval_seconds:
+                return False
+            self._last_run = now
+            return True
+
+
+health_sweep = HealthSweep(Config.HEALTH_SWEEP_SECONDS)
+
+
+def encode_health_cursor(robot: Robot) -> str:
+    return base64.urlsafe_b64encode(f"{robot.health_score!r}|{robot.robot_id}".encode()).decode()
+
+
+def decode_health_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        score, robot_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(score), robot_id
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def scored(factors: Dict[str, Any]) -> Dict[str, Any]:
+    """Health columns of a robot for its factors"""
+    return {
+        "health_factors": factors,
+        "health_score": health_score(factors, health_weights),
+        "heartbeat_stale": bool(factors.get("stale")),
+    }
+
+
+class RobotHealthService:
+    """
+    Keeps each robot's health score current. The score is recomputed from
+    the factors stored with it whenever one factor changes, so no change
+    needs the robot's other inputs to be read again.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = RobotRepository(db_session)
+
+    def heartbeat(self, robot_id: str, metrics: Optional[Dict[str, Any]]) -> Optional[float]:
+        """A heartbeat (or status report) with the robot's health metrics arrived"""
+        def change(factors: Dict[str, Any]) -> None:
+            factors["metrics"] = round(metrics_penalty(metrics, health_weights), 2)
+            factors["stale"] = False
+        return self._update(robot_id, change)
+
+    def component_changed(self, robot_id: str, previous_state: Optional[str], state: Optional[str]) -> Optional[float]:
+        """A component's diagnosis state changed"""
+        def change(factors: Dict[str, Any]) -> None:
+            counts = factors["components"]
+            if previous_state and counts.get(previous_state):
+                counts[previous_state] -= 1
+                if not counts[previous_state]:
+                    del counts[previous_state]
+            if state:
+                counts[state] = counts.get(state, 0) + 1
+        return self._update(robot_id, change, incremental=True)
+
+    def alerts_changed(self, robot_id: str, deltas: Dict[str, int]) -> Optional[float]:
+        """Alerts of a robot were opened (positive deltas) or resolved (negative) per severity"""
+        def change(factors: Dict[str, Any]) -> None:
+            counts = factors["alerts"]
+            for severity, delta in deltas.items():
+                count = max(0, counts.get(severity, 0) + delta)
+                if count:
+                    counts[severity] = count
+                else:
+                    counts.pop(severity, None)
+        return self._update(robot_id, change, incremental=True)
+
+    def recompute(self, robot_id: str) -> Optional[float]:
+        """Recount a robot's components and open alerts, e.g. after its components are replaced"""
+        components = self.repository.count_component_states(robot_id)
+        alerts = self.repository.count_open_alerts(robot_id)
+
+        def change(factors: Dict[str, Any]) -> None:
+            factors["components"] = components
+            factors["alerts"] = alerts
+        return self._update(robot_id, change)
+
+    def sweep(self, now: Optional[datetime] = None, force: bool = False) -> int:
+        """
+        Mark robots whose heartbeat is older than HEALTH_STALE_SECONDS, and
+        score robots that never were; runs at most once per HEALTH_SWEEP_SECONDS
+        """
+        if not force and not health_sweep.due():
+            return 0
+        stale_before = (now or datetime.utcnow()) - timedelta(seconds=Config.HEALTH_STALE_SECONDS)
+        rows = self.repository.find_health_outdated(stale_before)
+        for row in rows:
+            if row.health_score is None:
+                self.recompute(row.robot_id)
+            else:
+                self._update(row.robot_id, lambda factors: factors.update(stale=True))
+        if rows:
+            logger.info(f"Updated health of {len(rows)} robots with stale heartbeats or no score")
+        return len(rows)
+
+    def list_robots(
+        self,
+        descending: bool = False,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of robots ordered by health, worst first unless descending"""
+        limit = min(max(limit or Config.HEALTH_PAGE_SIZE, 1), Config.HEALTH_MAX_PAGE_SIZE)
+        after = decode_health_cursor(cursor) if cursor else None
+        self.sweep()
+        robots = self.repository.list_by_health(descending, min_score, max_score, status, after, limit + 1)
+        next_cursor = encode_health_cursor(robots[limit - 1]) if len(robots) > limit else None
+        return [
+            {
+                "robot_id": robot.robot_id,
+                "name": robot.name,
+                "status": robot.status,
+                "last_seen": robot.last_seen.isoformat() if robot.last_seen else None,
+                "health_score": robot.health_score,
+                "health_factors": robot.health_factors,
+            }
+            for robot in robots[:limit]
+        ], next_cursor
+
+    def _update(
+        self,
+        robot_id: str,
+        change: Callable[[Dict[str, Any]], None],
+        incremental: bool = False
+    ) -> Optional[float]:
+        """
+        Apply a change to a robot's stored factors and score them. A robot
+        that was never scored has its components and alerts counted first;
+        an incremental change (a delta of those counts) is then already in
+        the counts and is not applied.
+        """
+        with _factors_lock:
+            health = self.repository.get_health(robot_id)
+            if health is None:
+                return None
+            stored, stored_score = health
+            factors = dict(empty_factors(), **copy.deepcopy(stored))
+            if not stored:
+                factors["components"] = self.repository.count_component_states(robot_id)
+                factors["alerts"] = self.repository.count_open_alerts(robot_id)
+            if stored or not incremental:
+                change(factors)
+            columns = scored(factors)
+            # The score also changes with HEALTH_WEIGHTS, not only with the factors
+            if factors != stored or columns["health_score"] != stored_score:
+                self.repository.set_health(robot_id, columns)
+            return columns["health_score"]
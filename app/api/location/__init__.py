@@ -0,0 +1,10 @@
+from app.api.location.batch import LocationBatch
+from app.api.location.spatial import GridSpatialIndex
+from app.api.location.tiles import FleetTileCache, RecentTrails, TileVersions, fleet_tile_cache
+from app.api.location.table import LatestLocation, LatestLocationTable, latest_locations
+from app.api.location.service import LocationService
+
+__all__ = [
+    "LocationBatch", "GridSpatialIndex", "FleetTileCache", "RecentTrails", "TileVersions", "fleet_tile_cache",
+    "LatestLocation", "LatestLocationTable", "latest_locations", "LocationService",
+]
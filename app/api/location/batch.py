@@ -0,0 +1,88 @@
+from typing import Any, Iterator, List, Optional, Tuple
+import math
+from datetime import datetime, timezone
+import numpy as np
+
+from app.api.trajectory.codec import to_millis
+
+# Invalid fixes listed in a validation error
+MAX_REPORTED_ERRORS = 10
+
+
+class LocationBatch:
+    """
+    Timestamped fixes of one or more robots, held as columns. Fixes are
+    checked in one pass over the arrays rather than one by one, and grouped
+    per robot in time order.
+    """
+
+    def __init__(self, robot_ids: np.ndarray, times: np.ndarray, xs: np.ndarray, ys: np.ndarray, headings: np.ndarray):
+        self.robot_ids = robot_ids
+        self.times = times
+        self.xs = xs
+        self.ys = ys
+        self.headings = headings
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_fixes(cls, fixes: Any, default_robot_id: Optional[str] = None, max_fixes: Optional[int] = None) -> "LocationBatch":
+        """
+        Build a batch from fixes like {"robot_id", "location": [x, y],
+        "heading", "timestamp"}. robot_id defaults to default_robot_id.
+        Raises ValueError naming the invalid fixes.
+        """
+        if not isinstance(fixes, list) or not fixes:
+            raise ValueError("fixes must be a non-empty array")
+        if max_fixes is not None and len(fixes) > max_fixes:
+            raise ValueError(f"A batch can hold at most {max_fixes} fixes")
+
+        count = len(fixes)
+        robot_ids = np.empty(count, dtype=object)
+        coordinates = np.full((count, 3), np.nan)
+        times = np.zeros(count, dtype=np.int64)
+        malformed = np.zeros(count, dtype=bool)
+        for i, fix in enumerate(fixes):
+            try:
+                robot_ids[i] = fix.get("robot_id", default_robot_id)
+                x, y = fix["location"]
+                heading = fix.get("heading")
+                coordinates[i] = (x, y, math.nan if heading is None else heading)
+                timestamp = datetime.fromisoformat(fix["timestamp"])
+                if timestamp.tzinfo is not None:
+                    # Stored timestamps are naive UTC
+                    timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+                times[i] = to_millis(timestamp)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                malformed[i] = True
+
+        xs, ys, headings = coordinates.T
+        invalid = malformed | ~np.isfinite(xs) | ~np.isfinite(ys) | np.isinf(headings)
+        invalid |= np.array([not isinstance(robot_id, str) or not robot_id for robot_id in robot_ids.tolist()])
+        if invalid.any():
+            indices = np.flatnonzero(invalid)
+            listed = ", ".join(str(i) for i in indices[:MAX_REPORTED_ERRORS].tolist())
+            more = f" and {len(indices) - MAX_REPORTED_ERRORS} more" if len(indices) > MAX_REPORTED_ERRORS else ""
+            raise ValueError(
+                f"Invalid fixes at {listed}{more}: each fix needs a robot_id, a finite [x, y] location "
+                f"and an ISO 8601 timestamp"
+            )
+        return cls(robot_ids, times, xs.copy(), ys.copy(), headings.copy())
+
+    def unique_robot_ids(self) -> List[str]:
+        return sorted(set(self.robot_ids.tolist()))
+
+    def by_robot(self) -> Iterator[Tuple[str, "LocationBatch"]]:
+        """Fixes of each robot, oldest first"""
+        order = np.lexsort((self.times, self.robot_ids.astype(str)))
+        robot_ids = self.robot_ids[order]
+        boundaries = np.flatnonzero(robot_ids[1:] != robot_ids[:-1]) + 1
+        for rows in np.split(order, boundaries):
+            yield self.robot_ids[rows[0]], LocationBatch(
+                self.robot_ids[rows], self.times[rows], self.xs[rows], self.ys[rows], self.headings[rows]
+            )
+
+    def heading_at(self, i: int) -> Optional[float]:
+        heading = float(self.headings[i])
+        return None if math.isnan(heading) else heading
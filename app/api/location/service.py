@@ -0,0 +1,182 @@
+from typing import List, Optional, Tuple
+import json
+import logging
+import math
+from datetime import datetime, timezone
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.coverage.service import CoverageService
+from app.api.geofence.service import GeofenceService
+from app.api.location.batch import LocationBatch
+from app.api.location.table import LatestLocation, latest_locations
+from app.api.location.tiles import TILE_EPOCH, cluster_features, fleet_tile_cache, robot_feature
+from app.api.trajectory.codec import from_millis, to_millis
+from app.api.trajectory.service import TrajectoryService
+from app.config import Config
+from app.data.location.repository import LocationRepository
+from app.data.robot.repository import RobotRepository
+from app.utils.tiles import TILE_SIZE, tile_bounds
+
+logger = logging.getLogger(__name__)
+
+
+def require_finite(**values: Optional[float]) -> None:
+    """Reject infinite or NaN query coordinates, which no grid cell can hold"""
+    for name, value in values.items():
+        if value is not None and not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
+
+
+class LocationService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = LocationRepository(db_session)
+
+    def record_location(
+        self,
+        robot_id: str,
+        x: float,
+        y: float,
+        heading: Optional[float] = None,
+        timestamp: Optional[datetime] = None
+    ) -> LatestLocation:
+        """
+        Record a location report as the robot's latest position. Returns the
+        latest known location, which is the stored one if the report is older.
+        """
+        x, y = float(x), float(y)
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise ValueError("Location coordinates must be finite numbers")
+        if heading is not None:
+            heading = float(heading)
+            if not math.isfinite(heading):
+                raise ValueError("Heading must be a finite number")
+
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        elif timestamp.tzinfo is not None:
+            # Stored timestamps are naive UTC
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        location = LatestLocation(robot_id, x, y, heading, timestamp)
+        self.repository.upsert(robot_id, location.x, location.y, location.heading, location.timestamp)
+        # Every report is part of the track, including ones older than the latest position
+        TrajectoryService(self.db_session).record_point(robot_id, x, y, timestamp)
+        self._ensure_loaded()
+        if not latest_locations.update(location):
+            return latest_locations.get(robot_id)
+        # Geofence state follows the latest position only
+        GeofenceService(self.db_session).check_location(robot_id, x, y, timestamp)
+        CoverageService(self.db_session).record_positions(robot_id, [(x, y, timestamp)])
+        return location
+
+    def record_batch(self, batch: LocationBatch) -> List[LatestLocation]:
+        """
+        Record buffered fixes of one or more robots: all fixes go to the
+        trajectory store in one insert, and each robot's latest position is
+        updated once, with its newest fix. Returns the latest location of
+        every robot in the batch.
+        """
+        robot_ids = batch.unique_robot_ids()
+        missing = set(robot_ids) - set(RobotRepository(self.db_session).select_ids(robot_ids=robot_ids))
+        if missing:
+            raise ValueError(f"Robot not found: {', '.join(sorted(missing))}")
+
+        groups = list(batch.by_robot())
+        TrajectoryService(self.db_session).record_batch({
+            robot_id: (fixes.times, fixes.xs, fixes.ys) for robot_id, fixes in groups
+        })
+        newest = [
+            LatestLocation(
+                robot_id, float(fixes.xs[-1]), float(fixes.ys[-1]), fixes.heading_at(-1), from_millis(fixes.times[-1])
+            )
+            for robot_id, fixes in groups
+        ]
+        self.repository.upsert_many([
+            {"robot_id": location.robot_id, "x": location.x, "y": location.y, "heading": location.heading, "timestamp": location.timestamp}
+            for location in newest
+        ])
+
+        self._ensure_loaded()
+        latest = []
+        geofences = GeofenceService(self.db_session)
+        coverage = CoverageService(self.db_session)
+        for (robot_id, fixes), location in zip(groups, newest):
+            previous = latest_locations.get(robot_id)
+            if not latest_locations.update(location):
+                latest.append(latest_locations.get(robot_id))
+                continue
+            # Geofence state follows the latest position, so only fixes newer than the previous one count
+            newer = fixes.times > to_millis(previous.timestamp) if previous else np.ones(len(fixes), dtype=bool)
+            positions = [
+                (x, y, from_millis(millis))
+                for millis, x, y in zip(fixes.times[newer].tolist(), fixes.xs[newer].tolist(), fixes.ys[newer].tolist())
+            ]
+            geofences.check_batch(robot_id, positions)
+            coverage.record_positions(robot_id, positions)
+            latest.append(location)
+        logger.info(f"Recorded {len(batch)} fixes of {len(groups)} robots")
+        return latest
+
+    def get_latest(self, robot_id: str) -> Optional[LatestLocation]:
+        """Latest location of a robot"""
+        self._ensure_loaded()
+        return latest_locations.get(robot_id)
+
+    def get_all(self) -> List[LatestLocation]:
+        """Latest location of every robot"""
+        self._ensure_loaded()
+        return latest_locations.all()
+
+    def find_in_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[LatestLocation]:
+        """Robots whose latest location is inside a bounding box"""
+        require_finite(min_x=min_x, min_y=min_y, max_x=max_x, max_y=max_y)
+        self._ensure_loaded()
+        return latest_locations.within_bbox(min_x, min_y, max_x, max_y)
+
+    def find_within_radius(self, x: float, y: float, radius: float) -> List[Tuple[LatestLocation, float]]:
+        """Robots within a radius of a point, nearest first"""
+        require_finite(x=x, y=y, radius=radius)
+        self._ensure_loaded()
+        return latest_locations.within_radius(x, y, radius)
+
+    def find_nearest(self, x: float, y: float, count: int, max_distance: Optional[float] = None) -> List[Tuple[LatestLocation, float]]:
+        """The count closest robots to a point, nearest first"""
+        require_finite(x=x, y=y, max_distance=max_distance)
+        self._ensure_loaded()
+        return latest_locations.nearest(x, y, count, max_distance)
+
+    def get_fleet_tile(self, z: int, x: int, y: int) -> Tuple[str, bytes]:
+        """
+        GeoJSON FeatureCollection of the robots in a map tile as (ETag, body).
+        Robots are clustered at low zoom and carry trails at high zoom. The
+        ETag only changes when a robot in the tile moves, so unchanged tiles
+        are served from cache.
+        """
+        bounds = tile_bounds(z, x, y)
+        self._ensure_loaded()
+        with_trails = z >= Config.TILE_TRAIL_MIN_ZOOM
+        (generation, version), locations, trails = latest_locations.tile_contents(z, x, y, bounds, with_trails)
+        etag = f"{TILE_EPOCH}-{generation}-{version}"
+        body = fleet_tile_cache.get((z, x, y), etag)
+        if body is not None:
+            return etag, body
+
+        if z < Config.TILE_CLUSTER_MAX_ZOOM and len(locations) > 1:
+            features = cluster_features(z, x, y, locations, Config.TILE_CLUSTER_RADIUS_PX, TILE_SIZE)
+        else:
+            features = [feature for location in locations for feature in robot_feature(location, trails.get(location.robot_id))]
+        body = json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":")).encode()
+        fleet_tile_cache.put((z, x, y), etag, body)
+        return etag, body
+
+    def _ensure_loaded(self) -> None:
+        # One full read per process; afterwards ingest keeps the table current
+        if latest_locations.loaded:
+            return
+        stored = self.repository.get_all()
+        latest_locations.load(
+            LatestLocation(row.robot_id, row.x, row.y, row.heading, row.timestamp) for row in stored
+        )
+        logger.info(f"Loaded latest locations for {len(stored)} robots")
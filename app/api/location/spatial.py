@@ -0,0 +1,157 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+
+# (robot_id, distance) pairs returned by radius and nearest queries
+Neighbor = Tuple[str, float]
+Cell = Tuple[int, int]
+
+
+class GridSpatialIndex:
+    """
+    Uniform grid over robot positions. Each robot lives in exactly one cell,
+    so a position update is O(1), and a query only visits the cells it
+    overlaps. When a query would visit more cells than are occupied it scans
+    the occupied cells instead, which bounds the cost for sparse fleets.
+
+    Distances are euclidean in location units. The index is not thread-safe
+    on its own; LatestLocationTable updates it under its lock.
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[str]] = {}
+        self._points: Dict[str, Tuple[float, float, Cell]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def update(self, robot_id: str, x: float, y: float) -> None:
+        """Insert or move a robot"""
+        cell = self._cell(x, y)
+        current = self._points.get(robot_id)
+        if current is not None and current[2] != cell:
+            self._discard_from_cell(robot_id, current[2])
+        self._points[robot_id] = (x, y, cell)
+        self._cells.setdefault(cell, set()).add(robot_id)
+
+    def remove(self, robot_id: str) -> None:
+        """Remove a robot from the index"""
+        current = self._points.pop(robot_id, None)
+        if current is not None:
+            self._discard_from_cell(robot_id, current[2])
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._points.clear()
+
+    def _discard_from_cell(self, robot_id: str, cell: Cell) -> None:
+        members = self._cells.get(cell)
+        if members is None:
+            return
+        members.discard(robot_id)
+        if not members:
+            del self._cells[cell]
+
+    def _cells_in_range(self, min_cell: Cell, max_cell: Cell) -> Iterable[Set[str]]:
+        span = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if span > len(self._cells):
+            # Fewer occupied cells than cells in range: filter the occupied ones
+            for (cx, cy), members in self._cells.items():
+                if min_cell[0] <= cx <= max_cell[0] and min_cell[1] <= cy <= max_cell[1]:
+                    yield members
+            return
+        for cx in range(min_cell[0], max_cell[0] + 1):
+            for cy in range(min_cell[1], max_cell[1] + 1):
+                members = self._cells.get((cx, cy))
+                if members:
+                    yield members
+
+    def within_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[str]:
+        """Robots inside a bounding box (edges included)"""
+        if min_x > max_x or min_y > max_y:
+            raise ValueError("Bounding box minimum must not exceed its maximum")
+        found = []
+        points = self._points
+        for members in self._cells_in_range(self._cell(min_x, min_y), self._cell(max_x, max_y)):
+            for robot_id in members:
+                x, y, _ = points[robot_id]
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    found.append(robot_id)
+        return found
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[Neighbor]:
+        """Robots within a radius of a point, nearest first"""
+        if radius < 0:
+            raise ValueError("Radius must not be negative")
+        found = []
+        points = self._points
+        min_cell = self._cell(x - radius, y - radius)
+        max_cell = self._cell(x + radius, y + radius)
+        for members in self._cells_in_range(min_cell, max_cell):
+            for robot_id in members:
+                px, py, _ = points[robot_id]
+                distance = math.hypot(px - x, py - y)
+                if distance <= radius:
+                    found.append((robot_id, distance))
+        found.sort(key=lambda neighbor: neighbor[1])
+        return found
+
+    def nearest(self, x: float, y: float, count: int, max_distance: Optional[float] = None) -> List[Neighbor]:
+        """The closest robots to a point, nearest first"""
+        if count <= 0 or not self._points:
+            return []
+        if max_distance is not None:
+            return self.within_radius(x, y, max_distance)[:count]
+
+        points = self._points
+        cx, cy = self._cell(x, y)
+        candidates: List[Neighbor] = []
+        visited = 0
+        ring = 0
+        # Search square rings of cells around the query cell. Every robot outside
+        # ring k is at least k cells away, so once the count-th candidate is
+        # within that distance no farther ring can improve the result.
+        while True:
+            for cell in self._ring(cx, cy, ring):
+                visited += 1
+                members = self._cells.get(cell)
+                if not members:
+                    continue
+                for robot_id in members:
+                    px, py, _ = points[robot_id]
+                    candidates.append((robot_id, math.hypot(px - x, py - y)))
+
+            if len(candidates) >= count:
+                best = heapq.nsmallest(count, candidates, key=lambda neighbor: neighbor[1])
+                if best[-1][1] <= ring * self.cell_size:
+                    return best
+            if len(candidates) == len(points):
+                return heapq.nsmallest(count, candidates, key=lambda neighbor: neighbor[1])
+            if visited > len(self._cells):
+                break
+            ring += 1
+
+        # Sparse fleet: scanning every occupied cell is cheaper than more rings
+        return heapq.nsmallest(
+            count,
+            ((robot_id, math.hypot(px - x, py - y)) for robot_id, (px, py, _) in points.items()),
+            key=lambda neighbor: neighbor[1]
+        )
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> Iterable[Cell]:
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
@@ -0,0 +1,139 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+from datetime import datetime
+
+from app.api.location.spatial import GridSpatialIndex
+from app.api.location.tiles import RecentTrails, TileVersions
+from app.config import Config
+from app.data.versions import entity_versions
+
+
+class LatestLocation:
+    """Latest known position of a robot"""
+    __slots__ = ("robot_id", "x", "y", "heading", "timestamp")
+
+    def __init__(self, robot_id: str, x: float, y: float, heading: Optional[float], timestamp: datetime):
+        self.robot_id = robot_id
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "robot_id": self.robot_id,
+            "location": [self.x, self.y],
+            "heading": self.heading,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+        }
+
+
+class LatestLocationTable:
+    """
+    In-memory table of the latest position per robot. It is filled once from
+    the robot_locations table and then kept current by location ingest, so
+    single-robot and fleet-wide reads never touch the database. A spatial
+    index over the same positions answers proximity queries, and per-tile
+    versions plus recent trails back the live map tiles.
+    """
+
+    def __init__(self, index: GridSpatialIndex, tile_versions: TileVersions, trails: RecentTrails):
+        self._lock = threading.Lock()
+        self._locations: Dict[str, LatestLocation] = {}
+        self.index = index
+        self.tile_versions = tile_versions
+        self.trails = trails
+        self.loaded = False
+
+    def load(self, locations: Iterable[LatestLocation]) -> None:
+        """Fill the table from stored locations, keeping any newer in-memory entry"""
+        with self._lock:
+            for location in locations:
+                current = self._locations.get(location.robot_id)
+                if current is None or current.timestamp <= location.timestamp:
+                    self._locations[location.robot_id] = location
+                    self.index.update(location.robot_id, location.x, location.y)
+                    self.trails.append(location.robot_id, location.x, location.y, location.timestamp)
+                    entity_versions.bump_location(location.robot_id)
+            self.tile_versions.reset()
+            self.loaded = True
+
+    def update(self, location: LatestLocation) -> bool:
+        """Store a location unless a newer one is already known. Returns True if stored."""
+        with self._lock:
+            current = self._locations.get(location.robot_id)
+            if current is not None and current.timestamp > location.timestamp:
+                return False
+            self._locations[location.robot_id] = location
+            self.index.update(location.robot_id, location.x, location.y)
+            if current is None or (current.x, current.y, current.heading) != (location.x, location.y, location.heading):
+                # A robot reporting the same pose does not change any map tile
+                self.tile_versions.moved((current.x, current.y) if current else None, (location.x, location.y))
+                self.trails.append(location.robot_id, location.x, location.y, location.timestamp)
+            # The location route serves this table, and even the same pose has a new timestamp
+            entity_versions.bump_location(location.robot_id)
+            return True
+
+    def get(self, robot_id: str) -> Optional[LatestLocation]:
+        """Latest location of a robot"""
+        return self._locations.get(robot_id)
+
+    def all(self) -> List[LatestLocation]:
+        """Latest location of every robot"""
+        with self._lock:
+            return list(self._locations.values())
+
+    def remove(self, robot_id: str) -> None:
+        """Forget a robot, e.g. after it is deleted"""
+        with self._lock:
+            current = self._locations.pop(robot_id, None)
+            self.index.remove(robot_id)
+            self.trails.remove(robot_id)
+            if current is not None:
+                self.tile_versions.moved((current.x, current.y), None)
+
+    def within_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[LatestLocation]:
+        """Robots inside a bounding box"""
+        with self._lock:
+            return [self._locations[robot_id] for robot_id in self.index.within_bbox(min_x, min_y, max_x, max_y)]
+
+    def tile_contents(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        bounds: Tuple[float, float, float, float],
+        with_trails: bool
+    ) -> Tuple[Tuple[int, int], List[LatestLocation], Dict[str, List[Tuple[float, float]]]]:
+        """
+        Version of a map tile with the robots inside its (south, west, north,
+        east) bounds and optionally their trails, read consistently
+        """
+        with self._lock:
+            version = self.tile_versions.version(z, x, y)
+            locations = [self._locations[robot_id] for robot_id in self.index.within_bbox(*bounds)]
+            trails = {location.robot_id: self.trails.get(location.robot_id) for location in locations} if with_trails else {}
+            return version, locations, trails
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[Tuple[LatestLocation, float]]:
+        """Robots within a radius of a point with their distance, nearest first"""
+        with self._lock:
+            return [(self._locations[robot_id], distance) for robot_id, distance in self.index.within_radius(x, y, radius)]
+
+    def nearest(self, x: float, y: float, count: int, max_distance: Optional[float] = None) -> List[Tuple[LatestLocation, float]]:
+        """The closest robots to a point with their distance, nearest first"""
+        with self._lock:
+            return [
+                (self._locations[robot_id], distance)
+                for robot_id, distance in self.index.nearest(x, y, count, max_distance)
+            ]
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+
+latest_locations = LatestLocationTable(
+    GridSpatialIndex(Config.SPATIAL_INDEX_CELL_SIZE),
+    TileVersions(Config.TILE_MAX_ZOOM),
+    RecentTrails(Config.TILE_TRAIL_POINTS, Config.TILE_TRAIL_SECONDS)
+)
@@ -0,0 +1,166 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+import math
+import threading
+import uuid
+from datetime import datetime, timedelta
+import numpy as np
+
+from app.config import Config
+
+# (z, x, y) of a web mercator tile
+TileKey = Tuple[int, int, int]
+
+# Distinguishes ETags of different processes, whose tile versions are counted independently
+TILE_EPOCH = uuid.uuid4().hex[:8]
+
+
+def mercator_fraction(latitude: float, longitude: float) -> Tuple[float, float]:
+    """Position as fractions of the world's width and height in web mercator, origin top left"""
+    latitude = max(min(latitude, 85.05112878), -85.05112878)
+    fx = (longitude + 180.0) / 360.0
+    fy = (1 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2
+    return min(max(fx, 0.0), 1.0 - 1e-12), min(max(fy, 0.0), 1.0 - 1e-12)
+
+
+def robot_feature(location, trail: Optional[List[Tuple[float, float]]]) -> List[Dict[str, Any]]:
+    """A robot's position, and its trail if it has one, as GeoJSON features with [longitude, latitude] coordinates"""
+    features = [{
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [location.y, location.x]},
+        "properties": {"robot_id": location.robot_id, "heading": location.heading},
+    }]
+    if trail and len(trail) > 1:
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": [[y, x] for x, y in trail]},
+            "properties": {"robot_id": location.robot_id, "trail": True},
+        })
+    return features
+
+
+def cluster_features(
+    z: int,
+    x: int,
+    y: int,
+    locations: Sequence,
+    radius_px: int,
+    tile_size: int
+) -> List[Dict[str, Any]]:
+    """
+    Group robots falling in the same radius_px square of a tile into one
+    cluster point at their centroid; robots alone in their square stay
+    individual points
+    """
+    n = 1 << z
+    fractions = np.array([mercator_fraction(location.x, location.y) for location in locations]).reshape(-1, 2)
+    grid = max(1, tile_size // radius_px)
+    columns = np.clip(((fractions[:, 0] * n - x) * grid).astype(np.int64), 0, grid - 1)
+    rows = np.clip(((fractions[:, 1] * n - y) * grid).astype(np.int64), 0, grid - 1)
+    cells, members = np.unique(rows * grid + columns, return_inverse=True)
+    counts = np.bincount(members, minlength=len(cells))
+    latitudes = np.bincount(members, weights=[location.x for location in locations], minlength=len(cells)) / counts
+    longitudes = np.bincount(members, weights=[location.y for location in locations], minlength=len(cells)) / counts
+
+    features = []
+    for cell in range(len(cells)):
+        if counts[cell] == 1:
+            continue
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(longitudes[cell]), float(latitudes[cell])]},
+            "properties": {"cluster": True, "point_count": int(counts[cell])},
+        })
+    for k in np.flatnonzero(counts[members] == 1).tolist():
+        features.extend(robot_feature(locations[k], None))
+    return features
+
+
+class RecentTrails:
+    """
+    Recent positions of each robot, for drawing trails on the live map. A
+    trail is the positions within window_seconds of the robot's latest one,
+    so it only changes when the robot moves. Not thread-safe on its own;
+    LatestLocationTable updates it under its lock.
+    """
+
+    def __init__(self, max_points: int, window_seconds: float):
+        self.max_points = max_points
+        self.window = timedelta(seconds=window_seconds)
+        self._trails: Dict[str, Deque[Tuple[float, float, datetime]]] = {}
+
+    def append(self, robot_id: str, x: float, y: float, timestamp: datetime) -> None:
+        trail = self._trails.get(robot_id)
+        if trail is None:
+            trail = self._trails[robot_id] = deque(maxlen=self.max_points)
+        trail.append((x, y, timestamp))
+        while trail[0][2] < timestamp - self.window:
+            trail.popleft()
+
+    def get(self, robot_id: str) -> List[Tuple[float, float]]:
+        return [(x, y) for x, y, _ in self._trails.get(robot_id, ())]
+
+    def remove(self, robot_id: str) -> None:
+        self._trails.pop(robot_id, None)
+
+
+class TileVersions:
+    """
+    Version counter per map tile, bumped for the tiles at every zoom level
+    that a robot leaves or enters when it moves. Tiles deeper than max_zoom
+    share the version of their ancestor at max_zoom. Not thread-safe on its
+    own; LatestLocationTable updates it under its lock.
+    """
+
+    def __init__(self, max_zoom: int):
+        self.max_zoom = max_zoom
+        self.generation = 0
+        self._versions: Dict[TileKey, int] = {}
+
+    def moved(self, old: Optional[Tuple[float, float]], new: Optional[Tuple[float, float]]) -> None:
+        """Record a robot moving from old to new (x = latitude, y = longitude); None for appearing or leaving"""
+        fractions = [mercator_fraction(*position) for position in (old, new) if position is not None]
+        for z in range(self.max_zoom + 1):
+            n = 1 << z
+            for key in {(z, int(fx * n), int(fy * n)) for fx, fy in fractions}:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def reset(self) -> None:
+        """Invalidate every tile, e.g. after reloading the positions"""
+        self.generation += 1
+        self._versions.clear()
+
+    def version(self, z: int, x: int, y: int) -> Tuple[int, int]:
+        """(generation, version) of a tile"""
+        if z > self.max_zoom:
+            shift = z - self.max_zoom
+            z, x, y = self.max_zoom, x >> shift, y >> shift
+        return self.generation, self._versions.get((z, x, y), 0)
+
+
+class FleetTileCache:
+    """LRU cache of rendered fleet tiles, each stored with the tile version it was rendered at"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[TileKey, Tuple[str, bytes]]" = OrderedDict()
+
+    def get(self, key: TileKey, etag: str) -> Optional[bytes]:
+        """Cached tile body if it was rendered with this ETag"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: TileKey, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+fleet_tile_cache = FleetTileCache(Config.TILE_CACHE_SIZE)
@@ -0,0 +1,12 @@
+from app.api.logs.service import LogService, log_retention
+from app.api.logs.stream import LogLine, LogLineParser, LogUploadTooLarge, decompressed_chunks, split_lines
+
+__all__ = [
+    "LogLine",
+    "LogLineParser",
+    "LogService",
+    "LogUploadTooLarge",
+    "decompressed_chunks",
+    "log_retention",
+    "split_lines",
+]
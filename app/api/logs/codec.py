@@ -0,0 +1,38 @@
+from typing import Iterable, List, Set
+import re
+import zlib
+
+from app.api.logs.stream import LogLine
+
+WORD = re.compile(r"\w+")
+# Longer words are hashes or encoded data, not keywords anyone searches for
+MAX_INDEXED_WORD = 40
+
+
+def encode_lines(lines: Iterable[LogLine]) -> bytes:
+    """Compress lines as "millis<TAB>level<TAB>message" text"""
+    text = "\n".join(f"{line.millis}\t{line.level}\t{line.message}" for line in lines)
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decode_lines(data: bytes) -> List[LogLine]:
+    lines = []
+    for row in zlib.decompress(data).decode("utf-8").split("\n"):
+        millis, level, message = row.split("\t", 2)
+        lines.append(LogLine(int(millis), level, message))
+    return lines
+
+
+def line_words(line: LogLine) -> List[str]:
+    return WORD.findall(f"{line.level} {line.message}".lower())
+
+
+def index_words(words: Iterable[str]) -> Set[str]:
+    """Words worth indexing: not bare numbers and not too long"""
+    return {word for word in words if not word.isdigit() and len(word) <= MAX_INDEXED_WORD}
+
+
+def matches_words(line: LogLine, words: List[str]) -> bool:
+    """Whether every word starts a word of the line"""
+    found = line_words(line)
+    return all(any(candidate.startswith(word) for candidate in found) for word in words)
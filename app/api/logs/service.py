@@ -0,0 +1,222 @@
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+import base64
+import logging
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.api.logs.codec import WORD, decode_lines, encode_lines, index_words, line_words, matches_words
+from app.api.logs.stream import LogLine, LogLineParser, decompressed_chunks, split_lines
+from app.api.trajectory.codec import from_millis, to_millis
+from app.config import Config
+from app.data.logs.repository import LogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentWriter:
+    """
+    Groups parsed lines into segments of one UTC day and at most
+    LOG_SEGMENT_MAX_LINES lines or LOG_SEGMENT_MAX_BYTES bytes, and inserts
+    them a few at a time, so an upload of any size is held a segment at a time.
+    """
+
+    def __init__(self, repository: LogRepository, robot_id: str, upload_id: str, source: Optional[str]):
+        self.repository = repository
+        self.robot_id = robot_id
+        self.upload_id = upload_id
+        self.source = source
+        self.lines: List[LogLine] = []
+        self.words: Set[str] = set()
+        self.size = 0
+        self.day: Optional[date] = None
+        self.pending: List[Dict[str, Any]] = []
+        self.line_count = 0
+        self.segment_count = 0
+        self.first_millis: Optional[int] = None
+        self.last_millis: Optional[int] = None
+
+    def append(self, line: LogLine) -> None:
+        day = from_millis(line.millis).date()
+        if self.lines and (
+            day != self.day
+            or len(self.lines) >= Config.LOG_SEGMENT_MAX_LINES
+            or self.size >= Config.LOG_SEGMENT_MAX_BYTES
+        ):
+            self._rotate()
+        self.day = day
+        self.lines.append(line)
+        self.words.update(line_words(line))
+        self.size += len(line.message) + 24
+        self.line_count += 1
+        self.first_millis = line.millis if self.first_millis is None else min(self.first_millis, line.millis)
+        self.last_millis = line.millis if self.last_millis is None else max(self.last_millis, line.millis)
+
+    def close(self) -> None:
+        if self.lines:
+            self._rotate()
+        self._insert()
+
+    def _rotate(self) -> None:
+        times = [line.millis for line in self.lines]
+        self.pending.append({
+            "robot_id": self.robot_id,
+            "upload_id": self.upload_id,
+            "source": self.source,
+            "day": self.day,
+            "start_time": from_millis(min(times)),
+            "end_time": from_millis(max(times)),
+            "line_count": len(self.lines),
+            "words": " ".join(sorted(index_words(self.words))),
+            "data": encode_lines(self.lines),
+        })
+        self.lines, self.words, self.size = [], set(), 0
+        if len(self.pending) >= Config.LOG_INSERT_SEGMENTS:
+            self._insert()
+
+    def _insert(self) -> None:
+        self.segment_count += self.repository.insert_segments(self.pending)
+        self.pending = []
+
+
+class LogRetention:
+    """Deletes days of logs older than LOG_RETENTION_DAYS, at most once per interval"""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._last_run: Optional[float] = None
+
+    def due(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._last_run is not None and now - self._last_run < self.interval_seconds:
+                return False
+            self._last_run = now
+            return True
+
+
+log_retention = LogRetention(Config.LOG_RETENTION_CHECK_SECONDS)
+
+
+def encode_log_cursor(start_time: datetime, segment_id: int, line: int) -> str:
+    return base64.urlsafe_b64encode(f"{start_time.isoformat()}|{segment_id}|{line}".encode()).decode()
+
+
+def decode_log_cursor(cursor: str) -> Tuple[datetime, int, int]:
+    try:
+        start_time, segment_id, line = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(start_time), int(segment_id), int(line)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class LogService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = LogRepository(db_session)
+
+    def ingest(
+        self,
+        robot_id: str,
+        stream: BinaryIO,
+        encoding: Optional[str] = None,
+        source: Optional[str] = None,
+        received_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Store an uploaded log, decompressing and parsing it as it is read.
+        Lines before the first timestamped line are dated received_at. An
+        upload that fails part way is removed. Raises ValueError (or
+        LogUploadTooLarge) on an invalid upload.
+        """
+        received_at = received_at or datetime.utcnow()
+        upload_id = str(uuid.uuid4())
+        writer = SegmentWriter(self.repository, robot_id, upload_id, source)
+        parser = LogLineParser(received_at)
+        chunks = decompressed_chunks(stream, encoding, Config.LOG_READ_CHUNK_BYTES, Config.LOG_UPLOAD_MAX_BYTES)
+        try:
+            for text in split_lines(chunks, Config.LOG_MAX_LINE_BYTES):
+                if text.strip():
+                    writer.append(parser.parse(text))
+            writer.close()
+        except Exception:
+            if writer.segment_count:
+                self.repository.delete_upload(robot_id, upload_id)
+            raise
+
+        self.purge_expired()
+        logger.info(f"Stored {writer.line_count} log lines of robot {robot_id} in {writer.segment_count} segments")
+        return {
+            "upload_id": upload_id,
+            "robot_id": robot_id,
+            "source": source,
+            "lines": writer.line_count,
+            "segments": writer.segment_count,
+            "start": from_millis(writer.first_millis).isoformat() if writer.first_millis is not None else None,
+            "end": from_millis(writer.last_millis).isoformat() if writer.last_millis is not None else None,
+        }
+
+    def query(
+        self,
+        robot_id: str,
+        start: datetime,
+        end: datetime,
+        query: Optional[str] = None,
+        level: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lines of a robot's logs in a time window, segment by segment in
+        time order, keeping those that contain every word of query (as a
+        word prefix) and have the given level. Returns a page of lines and
+        the cursor of the next page (None on the last).
+        """
+        limit = min(max(limit or Config.LOG_QUERY_PAGE_LINES, 1), Config.LOG_QUERY_MAX_LINES)
+        words = WORD.findall((query or "").lower())
+        level = level.upper() if level else None
+        start_ms, end_ms = to_millis(start), to_millis(end)
+        from_key, skip = None, 0
+        if cursor:
+            start_time, segment_id, skip = decode_log_cursor(cursor)
+            from_key = (start_time, segment_id)
+
+        lines: List[Dict[str, Any]] = []
+        while True:
+            segments = self.repository.get_segment_page(
+                robot_id, start, end, sorted(index_words(words)), from_key, Config.LOG_QUERY_SEGMENT_PAGE
+            )
+            for segment in segments:
+                first = skip if from_key is not None and segment.id == from_key[1] else 0
+                decoded = decode_lines(segment.data)
+                for position in range(first, len(decoded)):
+                    line = decoded[position]
+                    if not start_ms <= line.millis <= end_ms or (level and line.level != level):
+                        continue
+                    if words and not matches_words(line, words):
+                        continue
+                    if len(lines) == limit:
+                        return lines, encode_log_cursor(segment.start_time, segment.id, position)
+                    lines.append({
+                        "timestamp": from_millis(line.millis).isoformat(),
+                        "level": line.level or None,
+                        "message": line.message,
+                        "source": segment.source,
+                    })
+            if len(segments) < Config.LOG_QUERY_SEGMENT_PAGE:
+                return lines, None
+            last = segments[-1]
+            from_key, skip = (last.start_time, last.id + 1), 0
+
+    def purge_expired(self, today: Optional[date] = None, force: bool = False) -> int:
+        """Delete days of logs past LOG_RETENTION_DAYS; runs at most once per LOG_RETENTION_CHECK_SECONDS"""
+        if not force and not log_retention.due():
+            return 0
+        cutoff = (today or datetime.utcnow().date()) - timedelta(days=Config.LOG_RETENTION_DAYS)
+        deleted = self.repository.delete_before(cutoff)
+        if deleted:
+            logger.info(f"Deleted {deleted} log segments from before {cutoff}")
+        return deleted
@@ -0,0 +1,173 @@
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+import re
+import zlib
+from datetime import datetime, timezone
+import zstandard
+
+from app.api.trajectory.codec import to_millis
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Content-Encoding values an upload may declare
+LOG_ENCODINGS = ("gzip", "zstd", "identity")
+
+# An ISO 8601 timestamp, optionally followed by a level, at the start of a line
+LINE_PREFIX = re.compile(
+    r"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d{1,9})?(?:Z|[+-]\d{2}:?\d{2})?)\]?\s*"
+    r"(?:[\[<(]?(TRACE|DEBUG|INFO|NOTICE|WARN|WARNING|ERROR|ERR|CRITICAL|CRIT|FATAL)[\]>)]?:?\s+)?",
+    re.IGNORECASE
+)
+LEVEL_ALIASES = {"WARN": "WARNING", "ERR": "ERROR", "CRIT": "CRITICAL", "FATAL": "CRITICAL"}
+
+
+class LogUploadTooLarge(ValueError):
+    """A log upload decompressed to more than the allowed size"""
+
+
+class LogLine(NamedTuple):
+    millis: int
+    level: str
+    message: str
+
+
+class PrefixedStream:
+    """A readable stream with bytes already read from it put back in front"""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if self.prefix:
+            data, self.prefix = (self.prefix, b"") if size < 0 or size >= len(self.prefix) else (self.prefix[:size], self.prefix[size:])
+            return data
+        return self.stream.read(size)
+
+
+def detect_encoding(head: bytes, declared: Optional[str]) -> str:
+    """Encoding of an upload from its first bytes, or the declared one for text"""
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    if declared in ("gzip", "zstd"):
+        raise ValueError(f"Upload is not {declared}-compressed")
+    return "identity"
+
+
+def decompressed_chunks(stream: BinaryIO, declared: Optional[str], chunk_bytes: int, max_bytes: int) -> Iterator[bytes]:
+    """
+    Decompress an upload as it is read, at most chunk_bytes of output at a
+    time, so memory stays bounded whatever the compression ratio. gzip
+    (including concatenated members), zstd and plain text are accepted.
+    Raises LogUploadTooLarge past max_bytes of output, ValueError on
+    corrupt input.
+    """
+    head = stream.read(len(ZSTD_MAGIC))
+    encoding = detect_encoding(head, declared)
+    stream = PrefixedStream(head, stream)
+    total = 0
+    for chunk in _decompress(stream, encoding, chunk_bytes):
+        total += len(chunk)
+        if total > max_bytes:
+            raise LogUploadTooLarge(f"Log upload is larger than {max_bytes} bytes uncompressed")
+        yield chunk
+
+
+def _decompress(stream: PrefixedStream, encoding: str, chunk_bytes: int) -> Iterator[bytes]:
+    if encoding == "identity":
+        while True:
+            data = stream.read(chunk_bytes)
+            if not data:
+                return
+            yield data
+
+    if encoding == "zstd":
+        reader = zstandard.ZstdDecompressor().stream_reader(stream, read_size=chunk_bytes, read_across_frames=True)
+        try:
+            while True:
+                data = reader.read(chunk_bytes)
+                if not data:
+                    return
+                yield data
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupt zstd upload: {e}")
+
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    # Whether the current member has been fed any input
+    started = False
+    try:
+        while True:
+            data = stream.read(chunk_bytes)
+            if not data:
+                break
+            while data:
+                started = True
+                output = decompressor.decompress(data, chunk_bytes)
+                if output:
+                    yield output
+                data = decompressor.unconsumed_tail
+                if decompressor.eof:
+                    # Input past the end of this member starts another one
+                    data = decompressor.unused_data
+                    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                    started = False
+        output = decompressor.flush()
+        if output:
+            yield output
+    except zlib.error as e:
+        raise ValueError(f"Corrupt gzip upload: {e}")
+    if started and not decompressor.eof:
+        raise ValueError("Truncated gzip upload")
+
+
+def split_lines(chunks: Iterator[bytes], max_line_bytes: int) -> Iterator[str]:
+    """
+    Lines of decompressed chunks, decoded as UTF-8. Lines longer than
+    max_line_bytes are truncated, so a missing newline cannot grow the
+    pending line without bound.
+    """
+    pending = b""
+    truncated = False
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if truncated:
+                truncated = False
+                continue
+            yield line[:max_line_bytes].rstrip(b"\r").decode("utf-8", errors="replace")
+        if len(pending) > max_line_bytes:
+            if not truncated:
+                yield pending[:max_line_bytes].decode("utf-8", errors="replace")
+            truncated = True
+            pending = b""
+    if pending and not truncated:
+        yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+class LogLineParser:
+    """
+    Splits lines into timestamp, level and message. Lines without a
+    timestamp (continuations such as stack traces) take the timestamp of
+    the line before them, or default_time before the first timestamp.
+    """
+
+    def __init__(self, default_time: datetime):
+        self.last_millis = to_millis(default_time)
+
+    def parse(self, line: str) -> LogLine:
+        match = LINE_PREFIX.match(line)
+        if match is None:
+            return LogLine(self.last_millis, "", line)
+        try:
+            timestamp = datetime.fromisoformat(match.group(1).replace(",", ".").replace(" ", "T", 1))
+        except ValueError:
+            return LogLine(self.last_millis, "", line)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        self.last_millis = to_millis(timestamp)
+        level = (match.group(2) or "").upper()
+        return LogLine(self.last_millis, LEVEL_ALIASES.get(level, level), line[match.end():])
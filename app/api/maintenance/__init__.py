@@ -0,0 +1,11 @@
+from app.api.maintenance.planner import MaintenanceIndex, MaintenanceItem, OperatingClock, maintenance_index
+from app.api.maintenance.service import MaintenanceService, operating_clock
+
+__all__ = [
+    "MaintenanceIndex",
+    "MaintenanceItem",
+    "MaintenanceService",
+    "OperatingClock",
+    "maintenance_index",
+    "operating_clock",
+]
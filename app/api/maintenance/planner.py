@@ -0,0 +1,195 @@
+from bisect import bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import threading
+import time
+from datetime import datetime
+
+from app.api.telemetry.engine import telemetry_seconds
+
+# Component parameter giving the operating hours between maintenances
+INTERVAL_PARAMETER = "maintenance_interval_hours"
+
+
+def interval_hours(parameters: Any) -> Optional[float]:
+    """Operating hours between maintenances of a component, if its parameters give them"""
+    if not isinstance(parameters, dict):
+        return None
+    try:
+        hours = float(parameters.get(INTERVAL_PARAMETER))
+    except (TypeError, ValueError):
+        return None
+    return hours if hours > 0 else None
+
+
+def projected_due(
+    since: Optional[datetime],
+    usage_hours: Optional[float],
+    interval: Optional[float],
+    now: datetime
+) -> Optional[datetime]:
+    """
+    When a component reaches its interval of operating hours, at the rate
+    it has been used since its last maintenance (or since it was added)
+    """
+    if not interval or not usage_hours or since is None or now <= since:
+        return None
+    return since + (now - since) * (interval / usage_hours)
+
+
+class MaintenanceItem:
+    """A component's maintenance schedule; due is the earlier of the planned and projected dates"""
+    __slots__ = (
+        "component_id", "robot_id", "name", "component_type", "last_maintenance",
+        "next_maintenance", "usage_hours", "interval_hours", "since", "projected", "due",
+    )
+
+    def __init__(self, row: Any, now: datetime):
+        self.component_id = row.component_id
+        self.robot_id = row.robot_id
+        self.name = row.name
+        self.component_type = row.component_type
+        self.last_maintenance = row.last_maintenance
+        self.next_maintenance = row.next_maintenance
+        self.usage_hours = row.usage_hours or 0.0
+        self.interval_hours = interval_hours(row.parameters)
+        self.since = row.last_maintenance or row.created_at
+        self.project(now)
+
+    def project(self, now: datetime) -> None:
+        self.projected = projected_due(self.since, self.usage_hours, self.interval_hours, now)
+        dates = [date for date in (self.next_maintenance, self.projected) if date is not None]
+        self.due = min(dates) if dates else None
+
+    def to_dict(self, now: datetime) -> Dict[str, Any]:
+        return {
+            "component_id": self.component_id,
+            "robot_id": self.robot_id,
+            "name": self.name,
+            "component_type": self.component_type,
+            "last_maintenance": self.last_maintenance.isoformat() if self.last_maintenance else None,
+            "next_maintenance": self.next_maintenance.isoformat() if self.next_maintenance else None,
+            "projected_maintenance": self.projected.isoformat() if self.projected else None,
+            "due": self.due.isoformat() if self.due else None,
+            "overdue": self.due is not None and self.due <= now,
+            "usage_hours": round(self.usage_hours, 3),
+            "interval_hours": self.interval_hours,
+        }
+
+
+class MaintenanceIndex:
+    """
+    Components of the fleet that have a due date, kept sorted by it, so
+    "due before" queries are a binary search plus the matching slice. It is
+    loaded from the database and reloaded once it is older than the refresh
+    interval; usage recorded by this process is applied in place.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, MaintenanceItem] = {}
+        self._by_robot: Dict[str, Set[str]] = {}
+        self._keys: List[Tuple[datetime, str]] = []
+        self._loaded_at: Optional[float] = None
+
+    def stale(self, max_age_seconds: float) -> bool:
+        with self._lock:
+            return self._loaded_at is None or time.monotonic() - self._loaded_at >= max_age_seconds
+
+    def invalidate(self) -> None:
+        """Reload on the next query"""
+        with self._lock:
+            self._loaded_at = None
+
+    def load(self, items: Iterable[MaintenanceItem]) -> None:
+        """Replace the indexed components"""
+        with self._lock:
+            self._items, self._by_robot, self._keys = {}, {}, []
+            for item in items:
+                self._put(item)
+            self._keys.sort()
+            self._loaded_at = time.monotonic()
+
+    def put(self, item: MaintenanceItem) -> None:
+        with self._lock:
+            self._remove(item.component_id)
+            self._put(item, keep_sorted=True)
+
+    def add_usage(self, robot_id: str, hours: float, now: datetime) -> None:
+        """Add operating hours to a robot's components and move them to their new due dates"""
+        with self._lock:
+            for component_id in list(self._by_robot.get(robot_id, ())):
+                item = self._items[component_id]
+                self._remove(component_id)
+                item.usage_hours += hours
+                item.project(now)
+                self._put(item, keep_sorted=True)
+
+    def due_before(
+        self,
+        cutoff: datetime,
+        robot_id: Optional[str] = None,
+        component_type: Optional[str] = None
+    ) -> List[MaintenanceItem]:
+        """Components due at or before cutoff, earliest first"""
+        with self._lock:
+            end = bisect_right(self._keys, (cutoff, "\uffff"))
+            items = [self._items[component_id] for _, component_id in self._keys[:end]]
+        return [
+            item for item in items
+            if (robot_id is None or item.robot_id == robot_id)
+            and (component_type is None or item.component_type == component_type)
+        ]
+
+    def _put(self, item: MaintenanceItem, keep_sorted: bool = False) -> None:
+        self._items[item.component_id] = item
+        self._by_robot.setdefault(item.robot_id, set()).add(item.component_id)
+        if item.due is None:
+            return
+        if keep_sorted:
+            insort(self._keys, (item.due, item.component_id))
+        else:
+            self._keys.append((item.due, item.component_id))
+
+    def _remove(self, component_id: str) -> None:
+        item = self._items.pop(component_id, None)
+        if item is None:
+            return
+        self._by_robot.get(item.robot_id, set()).discard(component_id)
+        if item.due is not None:
+            position = bisect_right(self._keys, (item.due, component_id)) - 1
+            if position >= 0 and self._keys[position] == (item.due, component_id):
+                del self._keys[position]
+
+
+maintenance_index = MaintenanceIndex()
+
+
+class OperatingClock:
+    """
+    Operating time of robots from their telemetry timestamps. Gaps between
+    consecutive samples count as operating time up to max_gap_seconds;
+    longer gaps mean the robot was off and count nothing.
+    """
+
+    def __init__(self, max_gap_seconds: float):
+        self.max_gap_seconds = max_gap_seconds
+        self._lock = threading.Lock()
+        self._last_sample: Dict[str, float] = {}
+
+    def hours(self, robot_id: str, timestamps: Iterable[datetime]) -> float:
+        """Operating hours between the robot's previous sample and these"""
+        seconds = sorted(telemetry_seconds(timestamp) for timestamp in timestamps)
+        if not seconds:
+            return 0.0
+        with self._lock:
+            previous = self._last_sample.get(robot_id)
+            operating = 0.0
+            for sample in seconds:
+                if previous is not None and sample > previous:
+                    gap = sample - previous
+                    if gap <= self.max_gap_seconds:
+                        operating += gap
+                if previous is None or sample > previous:
+                    previous = sample
+            self._last_sample[robot_id] = previous
+        return operating / 3600
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.api.maintenance.planner import MaintenanceItem, OperatingClock, maintenance_index
+from app.config import Config
+from app.data.maintenance.repository import MaintenanceRepository
+
+logger = logging.getLogger(__name__)
+
+operating_clock = OperatingClock(Config.MAINTENANCE_USAGE_MAX_GAP_SECONDS)
+
+
+def group_items(items: List[MaintenanceItem], now: datetime) -> List[Dict[str, Any]]:
+    """Components grouped by robot and component type, groups in order of their earliest due date"""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for item in items:
+        key = (item.robot_id, item.component_type)
+        if key not in groups:
+            groups[key] = {"robot_id": item.robot_id, "component_type": item.component_type, "components": []}
+        groups[key]["components"].append(item.to_dict(now))
+    return list(groups.values())
+
+
+class MaintenanceService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = MaintenanceRepository(db_session)
+
+    def due(
+        self,
+        days: Optional[float] = None,
+        robot_id: Optional[str] = None,
+        component_type: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Components due for maintenance within days (overdue ones included), grouped by robot and type"""
+        now = now or datetime.utcnow()
+        days = Config.MAINTENANCE_DUE_DAYS if days is None else days
+        if days < 0:
+            raise ValueError("days must not be negative")
+        return self._due_before(now + timedelta(days=days), robot_id, component_type, now)
+
+    def overdue(
+        self,
+        robot_id: Optional[str] = None,
+        component_type: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Components past their due date, grouped by robot and type"""
+        now = now or datetime.utcnow()
+        return self._due_before(now, robot_id, component_type, now)
+
+    def record_usage(self, robot_id: str, timestamps: Iterable[datetime]) -> float:
+        """Add the operating time covered by a telemetry batch to the robot's components"""
+        hours = operating_clock.hours(robot_id, timestamps)
+        if hours > 0:
+            self.repository.add_usage(robot_id, hours)
+            maintenance_index.add_usage(robot_id, hours, datetime.utcnow())
+        return hours
+
+    def record_maintenance(
+        self,
+        component_id: str,
+        performed_at: Optional[datetime] = None,
+        next_maintenance: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Mark a component maintained; returns its new schedule, or None if there is no such component"""
+        now = datetime.utcnow()
+        row = self.repository.record_maintenance(component_id, performed_at or now, next_maintenance)
+        if row is None:
+            return None
+        item = MaintenanceItem(row, now)
+        maintenance_index.put(item)
+        return item.to_dict(now)
+
+    def ensure_loaded(self) -> None:
+        """Load the schedule of every component, again once it is older than MAINTENANCE_INDEX_REFRESH_SECONDS"""
+        if maintenance_index.stale(Config.MAINTENANCE_INDEX_REFRESH_SECONDS):
+            now = datetime.utcnow()
+            maintenance_index.load(MaintenanceItem(row, now) for row in self.repository.get_schedule())
+
+    def _due_before(
+        self,
+        cutoff: datetime,
+        robot_id: Optional[str],
+        component_type: Optional[str],
+        now: datetime
+    ) -> Dict[str, Any]:
+        self.ensure_loaded()
+        items = maintenance_index.due_before(cutoff, robot_id, component_type)
+        return {
+            "cutoff": cutoff.isoformat(),
+            "count": len(items),
+            "overdue": sum(1 for item in items if item.due <= now),
+            "groups": group_items(items, now),
+        }
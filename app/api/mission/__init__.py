@@ -0,0 +1,5 @@
+from app.api.mission.dto import MissionCreate, MissionProgress
+from app.api.mission.executor import MissionExecutor, mission_executor
+from app.api.mission.service import MissionService
+
+__all__ = ["MissionCreate", "MissionProgress", "MissionExecutor", "mission_executor", "MissionService"]
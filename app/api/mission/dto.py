@@ -0,0 +1,21 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from app.api.command.dto import CreateMissionCommandParameters
+from app.data.enums import ActionStatus
+
+
+class MissionCreate(CreateMissionCommandParameters):
+    """Mission plan for a robot, executed one step at a time"""
+    robot_id: str
+
+
+class MissionProgress(BaseModel):
+    """Progress of a mission (an Action and its Steps)"""
+    action_id: str
+    status: ActionStatus
+    total_steps: int
+    completed_steps: int
+    failed_steps: int
+    current_step_id: Optional[str] = None
+    current_command_id: Optional[str] = None
@@ -0,0 +1,279 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.api.command.correlation import CommandOutcome, command_correlation, TERMINAL_COMMAND_STATUSES
+from app.api.command.service import CommandService
+from app.api.mission.dto import MissionProgress
+from app.data.action.repository import ActionRepository
+from app.data.command.repository import CommandRepository
+from app.data.database import SessionLocal
+from app.data.step.repository import StepRepository
+from app.data.enums import ActionStatus, CommandStatus, CommandType
+
+logger = logging.getLogger(__name__)
+
+# (step_id, command, parameters) as loaded when the mission starts
+PlannedStep = Tuple[str, str, Dict[str, Any]]
+
+
+class ActionProgress:
+    """In-memory state of one running mission"""
+    __slots__ = (
+        "action_id", "robot_id", "steps", "cursor", "completed", "failed",
+        "command_id", "current_command_id", "started",
+    )
+
+    def __init__(self, action_id: str, robot_id: str, steps: List[PlannedStep], cursor: int, completed: int, command_id: Optional[str]):
+        self.action_id = action_id
+        self.robot_id = robot_id
+        self.steps = steps
+        self.cursor = cursor
+        self.completed = completed
+        self.failed = 0
+        self.command_id = command_id
+        self.current_command_id: Optional[str] = None
+        self.started = time.monotonic()
+
+    @property
+    def current_step_id(self) -> Optional[str]:
+        if self.cursor < len(self.steps):
+            return self.steps[self.cursor][0]
+        return None
+
+
+class MissionExecutor:
+    """
+    Event-driven mission state machine.
+
+    A mission's steps are loaded once when it starts. Each step is sent to the
+    robot as a command, and the next one is dispatched as soon as the result of
+    the previous one arrives (through the command correlation index or a step
+    status message), so every step event costs O(1) lookups and a constant
+    number of writes.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self.messaging_service = None
+        self._lock = threading.Lock()
+        # Serializes starts without holding _lock, which step events need, during their queries
+        self._start_lock = threading.Lock()
+        self._actions: Dict[str, ActionProgress] = {}
+        self._commands: Dict[str, str] = {}  # in-flight command_id -> action_id
+        self._steps: Dict[str, str] = {}  # in-flight step_id -> action_id
+
+    def set_messaging_service(self, service):
+        """Set the messaging service used to send step commands"""
+        self.messaging_service = service
+
+    def running_count(self) -> int:
+        """Number of missions currently executing"""
+        with self._lock:
+            return len(self._actions)
+
+    def get_progress(self, action_id: str) -> Optional[MissionProgress]:
+        """Progress of a running mission, None if it is not executing"""
+        with self._lock:
+            progress = self._actions.get(action_id)
+            return self._to_progress(progress, ActionStatus.IN_PROGRESS) if progress else None
+
+    def running_by_robot(self) -> Dict[str, MissionProgress]:
+        """Progress of the mission each robot is executing"""
+        with self._lock:
+            return {
+                progress.robot_id: self._to_progress(progress, ActionStatus.IN_PROGRESS)
+                for progress in self._actions.values()
+            }
+
+    def start(self, action_id: str, command_id: Optional[str] = None) -> Optional[MissionProgress]:
+        """Start a mission, resuming after its last completed step"""
+        # Checking for a running mission and registering it is one step, so
+        # concurrent starts of the same mission cannot both dispatch it
+        with self._start_lock:
+            running = self.get_progress(action_id)
+            if running:
+                return running
+
+            with self.session_factory() as db:
+                action_repo = ActionRepository(db)
+                action = action_repo.get_by_id(action_id)
+                if not action:
+                    return None
+                robot_id = (action.parameters or {}).get("robot_id")
+                if not robot_id:
+                    raise ValueError(f"Mission {action_id} has no robot_id")
+
+                steps = StepRepository(db).get_by_action_id(action_id)
+                planned = [(step.step_id, step.command, step.parameters or {}) for step in steps]
+                completed = 0
+                for step in steps:
+                    if step.status != CommandStatus.COMPLETED:
+                        break
+                    completed += 1
+
+                # Resuming retries the first unfinished step, so only completed steps are kept
+                action_repo.update(action_id, {
+                    "status": ActionStatus.IN_PROGRESS.value,
+                    "started_at": action.started_at or datetime.utcnow(),
+                    "error": None,
+                    "total_steps": len(planned),
+                    "completed_steps": completed,
+                    "failed_steps": 0,
+                })
+
+            progress = ActionProgress(action_id, robot_id, planned, completed, completed, command_id)
+            with self._lock:
+                self._actions[action_id] = progress
+                snapshot = self._to_progress(progress, ActionStatus.IN_PROGRESS)
+
+        if progress.cursor >= len(planned):
+            self._finish(progress, ActionStatus.COMPLETED)
+        else:
+            self._dispatch(progress)
+        logger.info(f"Started mission {action_id} at step {completed + 1}/{len(planned)}")
+        return snapshot
+
+    def on_command_outcome(self, outcome: CommandOutcome) -> None:
+        """Correlation listener: advance the mission owning a finished step command"""
+        with self._lock:
+            action_id = self._commands.get(outcome.command_id)
+        if action_id:
+            self._step_finished(action_id, None, outcome.status, outcome.result, outcome.error)
+
+    def on_step_status(
+        self,
+        step_id: str,
+        status: Any,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """Handle a step status reported directly by a robot. Returns False for untracked steps."""
+        with self._lock:
+            action_id = self._steps.get(step_id)
+        if not action_id:
+            return False
+        status = CommandService.normalize_status(status)
+        if status in TERMINAL_COMMAND_STATUSES:
+            self._step_finished(action_id, step_id, status, result, error)
+        return True
+
+    def _dispatch(self, progress: ActionProgress) -> None:
+        step_id, command, parameters = progress.steps[progress.cursor]
+        try:
+            command_type = CommandType(command)
+        except (ValueError, AttributeError):
+            self._step_finished(progress.action_id, step_id, CommandStatus.FAILED, None, f"Unknown command type: {command}")
+            return
+
+        try:
+            with self.session_factory() as db:
+                db_command = CommandRepository(db).create(progress.robot_id, command_type, parameters)
+                StepRepository(db).update_status(step_id, CommandStatus.IN_PROGRESS)
+                command_id = db_command.command_id
+
+            with self._lock:
+                progress.current_command_id = command_id
+                self._commands[command_id] = progress.action_id
+                self._steps[step_id] = progress.action_id
+
+            if self.messaging_service:
+                self.messaging_service.publish(f"robots/{progress.robot_id}/commands", {
+                    "command_id": command_id,
+                    "command_type": command_type.value,
+                    "parameters": parameters,
+                    "action_id": progress.action_id,
+                    "step_id": step_id,
+                    "timestamp": datetime.now().isoformat(),
+                })
+        except Exception as e:
+            # A mission left registered here would never be dispatched again, so it
+            # fails instead; starting it again resumes at this step
+            logger.error(f"Error dispatching step {step_id} of mission {progress.action_id}: {str(e)}")
+            with self._lock:
+                self._steps.pop(step_id, None)
+                if progress.current_command_id:
+                    self._commands.pop(progress.current_command_id, None)
+                    progress.current_command_id = None
+            self._finish(progress, ActionStatus.FAILED, f"Step {step_id} could not be dispatched: {str(e)}")
+
+    def _step_finished(
+        self,
+        action_id: str,
+        step_id: Optional[str],
+        status: CommandStatus,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> None:
+        with self._lock:
+            progress = self._actions.get(action_id)
+            if not progress:
+                return
+            current_step_id = progress.current_step_id
+            if current_step_id is None or (step_id is not None and step_id != current_step_id):
+                # Stale or duplicate event
+                return
+            self._steps.pop(current_step_id, None)
+            if progress.current_command_id:
+                self._commands.pop(progress.current_command_id, None)
+                progress.current_command_id = None
+
+            succeeded = status == CommandStatus.COMPLETED
+            if succeeded:
+                progress.completed += 1
+                progress.cursor += 1
+            else:
+                progress.failed += 1
+            finished = not succeeded or progress.cursor >= len(progress.steps)
+
+        with self.session_factory() as db:
+            StepRepository(db).update_status(current_step_id, status, result, error)
+
+        if not finished:
+            self._dispatch(progress)
+        elif succeeded:
+            self._finish(progress, ActionStatus.COMPLETED)
+        else:
+            self._finish(progress, ActionStatus.FAILED, error or f"Step {current_step_id} {status.value}")
+
+    def _finish(self, progress: ActionProgress, status: ActionStatus, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._actions.pop(progress.action_id, None)
+            summary = self._to_progress(progress, status)
+
+        with self.session_factory() as db:
+            ActionRepository(db).update(progress.action_id, {
+                "status": status.value,
+                "completed_at": datetime.utcnow(),
+                "execution_time": time.monotonic() - progress.started,
+                "error": error,
+                "result": summary.dict(exclude={"current_step_id", "current_command_id"}),
+            })
+            if progress.command_id:
+                # Resolve the EXECUTE_MISSION command that started this mission
+                CommandService(db).record_result(
+                    command_id=progress.command_id,
+                    status=CommandStatus.COMPLETED if status == ActionStatus.COMPLETED else CommandStatus.FAILED,
+                    result={"action_id": progress.action_id},
+                    error=error
+                )
+        logger.info(f"Mission {progress.action_id} finished with status {status.value}")
+
+    @staticmethod
+    def _to_progress(progress: ActionProgress, status: ActionStatus) -> MissionProgress:
+        return MissionProgress(
+            action_id=progress.action_id,
+            status=status,
+            total_steps=len(progress.steps),
+            completed_steps=progress.completed,
+            failed_steps=progress.failed,
+            current_step_id=progress.current_step_id,
+            current_command_id=progress.current_command_id,
+        )
+
+
+mission_executor = MissionExecutor(SessionLocal)
+command_correlation.add_listener(mission_executor.on_command_outcome)
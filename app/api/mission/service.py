@@ -0,0 +1,76 @@
+from typing import Optional
+import logging
+import uuid
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.api.command.parameters import command_parameter_registry
+from app.api.mission.dto import MissionCreate, MissionProgress
+from app.api.mission.executor import mission_executor
+from app.data.action.model import Action
+from app.data.action.repository import ActionRepository
+from app.data.step.repository import StepRepository
+from app.data.enums import ActionStatus, ActionType, CommandStatus
+
+logger = logging.getLogger(__name__)
+
+
+class MissionService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.action_repo = ActionRepository(db_session)
+        self.step_repo = StepRepository(db_session)
+
+    def create_mission(self, mission: MissionCreate) -> Optional[Action]:
+        """Store a mission as an Action with one Step per mission step"""
+        command_parameter_registry.validate_steps(mission.steps)
+        action = self.action_repo.create({
+            "name": mission.name,
+            "action_type": ActionType.CUSTOM.value,
+            "status": ActionStatus.PENDING.value,
+            "total_steps": len(mission.steps),
+            "parameters": {
+                "robot_id": mission.robot_id,
+                "description": mission.description,
+                "priority": mission.priority,
+            },
+        })
+        if not action:
+            raise ValueError(f"Could not create mission {mission.name}")
+
+        now = datetime.utcnow()
+        self.step_repo.create_many([
+            {
+                "step_id": str(uuid.uuid4()),
+                "action_id": action.action_id,
+                "sequence": step.sequence,
+                "command": step.command_type,
+                "parameters": step.parameters,
+                "status": CommandStatus.PENDING,
+                "created_at": now,
+            }
+            for step in sorted(mission.steps, key=lambda step: step.sequence)
+        ])
+        logger.info(f"Created mission {action.action_id} with {len(mission.steps)} steps")
+        return action
+
+    def execute_mission(self, action_id: str, command_id: Optional[str] = None) -> Optional[MissionProgress]:
+        """Start (or resume) executing a mission"""
+        return mission_executor.start(action_id, command_id=command_id)
+
+    def get_progress(self, action_id: str) -> Optional[MissionProgress]:
+        """Get mission progress, from the executor while running or from the action counters otherwise"""
+        progress = mission_executor.get_progress(action_id)
+        if progress:
+            return progress
+
+        action = self.action_repo.get_by_id(action_id)
+        if not action:
+            return None
+        return MissionProgress(
+            action_id=action_id,
+            status=ActionStatus(action.status),
+            total_steps=action.total_steps or 0,
+            completed_steps=action.completed_steps or 0,
+            failed_steps=action.failed_steps or 0,
+        )
@@ -0,0 +1,4 @@
+from app.api.planner.dto import CoveragePlanRequest
+from app.api.planner.service import CoveragePlanner, PlannerService, coverage_planner
+
+__all__ = ["CoveragePlanRequest", "CoveragePlanner", "PlannerService", "coverage_planner"]
@@ -0,0 +1,206 @@
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import numpy as np
+
+# Maximum (sweep lines x edges) intersections computed in one array operation
+INTERSECTION_CHUNK = 1 << 20
+
+# (line index, start u, end u) of one sweep segment in the rotated frame
+Segment = Tuple[int, float, float]
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Monotone chain convex hull, counter-clockwise without the closing vertex"""
+    ordered = sorted(set(map(tuple, points.tolist())))
+    if len(ordered) < 3:
+        return np.asarray(ordered, dtype=np.float64)
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: List[Tuple[float, float]] = []
+    for point in ordered:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    upper: List[Tuple[float, float]] = []
+    for point in reversed(ordered):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return np.asarray(lower[:-1] + upper[:-1], dtype=np.float64)
+
+
+def best_sweep_angle(vertices: np.ndarray) -> float:
+    """
+    Pass direction (radians) that minimizes the number of passes: parallel to
+    the hull edge across which the polygon is narrowest.
+    """
+    hull = convex_hull(vertices)
+    if len(hull) < 3:
+        return 0.0
+    edges = np.roll(hull, -1, axis=0) - hull
+    angles = np.arctan2(edges[:, 1], edges[:, 0])
+    normals = np.stack((-np.sin(angles), np.cos(angles)), axis=1)
+    projections = hull @ normals.T
+    widths = projections.max(axis=0) - projections.min(axis=0)
+    return float(angles[int(np.argmin(widths))])
+
+
+def rotate(points: np.ndarray, angle: float) -> np.ndarray:
+    cos, sin = math.cos(angle), math.sin(angle)
+    return points @ np.array([[cos, sin], [-sin, cos]])
+
+
+def sweep_segments(vertices: np.ndarray, spacing: float) -> Tuple[np.ndarray, List[List[Segment]]]:
+    """
+    Intersect the polygon (already rotated so passes run along u) with sweep
+    lines v = const at most spacing apart, half a spacing in from the edges.
+    Returns the line offsets and, per line, its inside segments.
+    """
+    v_min, v_max = float(vertices[:, 1].min()), float(vertices[:, 1].max())
+    line_count = max(1, math.ceil((v_max - v_min) / spacing - 1e-9))
+    if line_count == 1:
+        offsets = np.array([(v_min + v_max) / 2])
+    else:
+        # Spread the passes evenly so the outer swaths end at the boundary
+        offsets = np.linspace(v_min + spacing / 2, v_max - spacing / 2, line_count)
+
+    following = np.roll(vertices, -1, axis=0)
+    u1, v1 = vertices[:, 0], vertices[:, 1]
+    u2, v2 = following[:, 0], following[:, 1]
+    lines: List[List[Segment]] = []
+    chunk = max(1, INTERSECTION_CHUNK // len(vertices))
+    for start in range(0, len(offsets), chunk):
+        c = offsets[start:start + chunk, None]
+        straddles = (v1 > c) != (v2 > c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_u = np.where(straddles, u1 + (c - v1) * (u2 - u1) / (v2 - v1), np.inf)
+        crossing_u.sort(axis=1)
+        counts = np.count_nonzero(straddles, axis=1)
+        for row in range(len(c)):
+            crossings = crossing_u[row, :counts[row] - counts[row] % 2].tolist()
+            lines.append([(start + row, crossings[k], crossings[k + 1]) for k in range(0, len(crossings), 2)])
+    return offsets, lines
+
+
+def decompose(lines: List[List[Segment]]) -> List[List[Segment]]:
+    """
+    Boustrophedon cell decomposition: a segment continues the cell of the one
+    segment it overlaps on the previous line when that overlap is one-to-one.
+    Splits and merges around concavities and holes start new cells, so each
+    cell can be swept back and forth without leaving the polygon.
+    """
+    cells: List[List[Segment]] = []
+    previous: List[Tuple[Segment, int]] = []
+    for segments in lines:
+        current: List[Tuple[Segment, int]] = []
+        for segment in segments:
+            overlapping = [
+                (other, cell) for other, cell in previous
+                if other[1] < segment[2] and segment[1] < other[2]
+            ]
+            cell = None
+            if len(overlapping) == 1:
+                other, candidate = overlapping[0]
+                if sum(1 for s in segments if other[1] < s[2] and s[1] < other[2]) == 1:
+                    cell = candidate
+            if cell is None:
+                cell = len(cells)
+                cells.append([])
+            cells[cell].append(segment)
+            current.append((segment, cell))
+        previous = current
+    return cells
+
+
+def serpentine(cells: List[List[Segment]], offsets: np.ndarray) -> np.ndarray:
+    """
+    Chain the passes of all cells into one route, cell by cell, flipping each
+    pass so it starts at the end nearest to where the previous one ended.
+    Returns the route's waypoints in the rotated frame.
+    """
+    waypoints: List[Tuple[float, float]] = []
+    for cell in cells:
+        for line, start, end in cell:
+            v = float(offsets[line])
+            if waypoints:
+                u, w = waypoints[-1]
+                if (start - u) ** 2 + (v - w) ** 2 > (end - u) ** 2 + (v - w) ** 2:
+                    start, end = end, start
+            waypoints.append((start, v))
+            waypoints.append((end, v))
+    return np.asarray(waypoints, dtype=np.float64).reshape(-1, 2)
+
+
+def split_route(route: np.ndarray, parts: int) -> List[np.ndarray]:
+    """Cut a polyline into parts of equal length"""
+    if parts == 1:
+        return [route]
+    if len(route) < 2:
+        return [route] + [route[:0]] * (parts - 1)
+    lengths = np.hypot(*np.diff(route, axis=0).T)
+    distance = np.concatenate(([0.0], np.cumsum(lengths)))
+    cuts = distance[-1] * np.arange(1, parts) / parts
+    # Segment each cut falls on, and the cut points interpolated along it
+    segment = np.clip(np.searchsorted(distance, cuts, side="right") - 1, 0, len(lengths) - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.nan_to_num((cuts - distance[segment]) / lengths[segment])
+    points = route[segment] + fraction[:, None] * (route[segment + 1] - route[segment])
+
+    pieces = []
+    first, head = 0, route[0]
+    for k in range(parts - 1):
+        last = int(segment[k])
+        pieces.append(np.vstack((head[None, :], route[first + 1:last + 1], points[k][None, :])))
+        first, head = last, points[k]
+    pieces.append(np.vstack((head[None, :], route[first + 1:])))
+    return [_drop_repeats(piece) for piece in pieces]
+
+
+def _drop_repeats(points: np.ndarray) -> np.ndarray:
+    if len(points) < 2:
+        return points
+    keep = np.concatenate(([True], np.any(np.diff(points, axis=0) != 0, axis=1)))
+    return points[keep]
+
+
+def plan_coverage(
+    polygon: List[List[float]],
+    spacing: float,
+    robot_count: int,
+    angle: Optional[float] = None,
+    y_scale: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Plan a boustrophedon coverage route over a polygon with passes spacing
+    apart, split into robot_count paths of equal length. Runs in a worker
+    process for large fields, so it takes and returns plain data. angle is
+    the pass direction in degrees from the x axis, chosen automatically to
+    minimize the number of passes when None.
+
+    y_scale is the length of a y unit in x units (cos(latitude) when x is
+    latitude and y longitude). Planning happens in a local frame around the
+    polygon's centroid with y scaled by it, so spacing, angle and lengths
+    are in x units along every direction; paths are returned unscaled.
+    """
+    vertices = np.asarray(polygon, dtype=np.float64)
+    origin = vertices.mean(axis=0)
+    scale = np.array([1.0, y_scale])
+    local = (vertices - origin) * scale
+    sweep = math.radians(angle) if angle is not None else best_sweep_angle(local)
+
+    offsets, lines = sweep_segments(rotate(local, sweep), spacing)
+    cells = decompose(lines)
+    route = serpentine(cells, offsets)
+    pieces = split_route(route, robot_count)
+
+    back = -sweep
+    local_paths = [rotate(piece, back) if len(piece) else piece for piece in pieces]
+    return {
+        "angle": round(math.degrees(sweep) % 180.0, 3),
+        "pass_count": sum(len(cell) for cell in cells),
+        "cell_count": len(cells),
+        "paths": [(path / scale + origin).tolist() if len(path) else path.tolist() for path in local_paths],
+        "lengths": [float(np.hypot(*np.diff(path, axis=0).T).sum()) if len(path) > 1 else 0.0 for path in local_paths],
+    }
@@ -0,0 +1,30 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field, root_validator, validator
+
+from app.api.geofence.index import validate_polygon
+
+
+class CoveragePlanRequest(BaseModel):
+    polygon: Optional[List[List[float]]] = Field(None, description="Field polygon vertices as [x, y] pairs")
+    geofence_id: Optional[str] = Field(None, description="Field geofence to plan instead of an explicit polygon")
+    swath_width: float = Field(..., gt=0, description="Implement working width in meters")
+    overlap: float = Field(0.0, ge=0, lt=1, description="Fraction of the swath overlapping the previous pass")
+    angle: Optional[float] = Field(None, description="Pass direction in degrees from the x axis, chosen automatically if omitted")
+    robot_ids: Optional[List[str]] = Field(None, description="Robots to split the field between")
+    robot_count: Optional[int] = Field(None, ge=1, description="Number of robots, when robot_ids is not given")
+    speed: Optional[float] = Field(None, description="Movement speed of the generated steps")
+    name: str = Field("Coverage", description="Mission name prefix")
+
+    @validator("polygon")
+    def check_polygon(cls, v):
+        return validate_polygon(v) if v is not None else v
+
+    @root_validator(skip_on_failure=True)
+    def check_field_and_robots(cls, values):
+        if (values.get("polygon") is None) == (values.get("geofence_id") is None):
+            raise ValueError("Provide either polygon or geofence_id")
+        if values.get("robot_ids"):
+            values["robot_count"] = len(values["robot_ids"])
+        elif not values.get("robot_count"):
+            values["robot_count"] = 1
+        return values
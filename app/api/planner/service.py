@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import math
+import threading
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.coverage.raster import longitude_scale
+from app.api.geofence.service import GeofenceService
+from app.api.planner.boustrophedon import plan_coverage
+from app.api.planner.dto import CoveragePlanRequest
+from app.config import Config
+from app.data.enums import CommandType, GeofenceType
+
+logger = logging.getLogger(__name__)
+
+
+def plan_key(polygon: List[List[float]], spacing: float, robot_count: int, angle: Optional[float], y_scale: float = 1.0) -> str:
+    """Hash identifying a plan, so identical requests share one computation"""
+    digest = hashlib.sha1(np.asarray(polygon, dtype=np.float64).tobytes())
+    digest.update(json.dumps([spacing, robot_count, angle, y_scale]).encode())
+    return digest.hexdigest()
+
+
+def estimate_passes(polygon: List[List[float]], spacing: float, y_scale: float = 1.0) -> float:
+    """Upper bound on the passes needed to cover a polygon, whatever the pass direction"""
+    xs = [vertex[0] for vertex in polygon]
+    ys = [vertex[1] for vertex in polygon]
+    return math.hypot(max(xs) - min(xs), (max(ys) - min(ys)) * y_scale) / spacing
+
+
+def field_y_scale(polygon: List[List[float]]) -> float:
+    """Length of a degree of longitude in degrees of latitude at a field's centroid (x is latitude)"""
+    return longitude_scale(sum(vertex[0] for vertex in polygon) / len(polygon))
+
+
+class CoveragePlanner:
+    """
+    Memoizes coverage plans by plan_key. Small fields are planned on the
+    calling thread; fields whose estimated work (vertices x passes) exceeds
+    pool_min_work go to a process pool, so planning a large field does not
+    hold the GIL away from the API threads. Concurrent requests for a plan
+    being computed in the pool wait for the same result.
+    """
+
+    def __init__(self, cache_size: int, workers: int, pool_min_work: int, timeout: float):
+        self.cache_size = cache_size
+        self.workers = workers
+        self.pool_min_work = pool_min_work
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def plan(
+        self,
+        polygon: List[List[float]],
+        spacing: float,
+        robot_count: int,
+        angle: Optional[float] = None,
+        y_scale: float = 1.0
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """Get a plan as (key, plan, whether it was cached)"""
+        key = plan_key(polygon, spacing, robot_count, angle, y_scale)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return key, plan, True
+            future = self._pending.get(key)
+            if future is None and len(polygon) * estimate_passes(polygon, spacing, y_scale) >= self.pool_min_work:
+                future = self._executor().submit(plan_coverage, polygon, spacing, robot_count, angle, y_scale)
+                self._pending[key] = future
+                logger.info(f"Planning large field ({len(polygon)} vertices) in worker pool")
+
+        if future is None:
+            plan = plan_coverage(polygon, spacing, robot_count, angle, y_scale)
+        else:
+            try:
+                plan = future.result(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is future and future.done():
+                        del self._pending[key]
+
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.cache_size:
+                self._plans.popitem(last=False)
+        return key, plan, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Called with the lock held
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+
+coverage_planner = CoveragePlanner(
+    Config.PLANNER_CACHE_SIZE, Config.PLANNER_WORKERS, Config.PLANNER_POOL_MIN_WORK, Config.PLANNER_TIMEOUT_SECONDS
+)
+
+
+class PlannerService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+
+    def plan_coverage(self, plan_request: CoveragePlanRequest) -> Optional[Dict[str, Any]]:
+        """
+        Plan boustrophedon coverage of a field and return one create_mission
+        command per robot, with MOVE steps through each robot's waypoints.
+        Returns None if the requested geofence does not exist.
+        """
+        polygon = plan_request.polygon
+        if polygon is None:
+            geofence = GeofenceService(self.db_session).get_geofence(plan_request.geofence_id)
+            if geofence is None:
+                return None
+            if geofence.fence_type != GeofenceType.FIELD.value:
+                raise ValueError(f"Geofence {plan_request.geofence_id} is not a field")
+            polygon = geofence.polygon
+
+        # Planned with longitude scaled to latitude degrees, so spacing and lengths are meters times units_per_meter
+        units_per_meter = Config.COVERAGE_UNITS_PER_METER
+        spacing = plan_request.swath_width * (1 - plan_request.overlap) * units_per_meter
+        y_scale = field_y_scale(polygon)
+        if estimate_passes(polygon, spacing, y_scale) > Config.PLANNER_MAX_PASSES:
+            raise ValueError(f"Field needs more than {Config.PLANNER_MAX_PASSES} passes at this swath width")
+
+        key, plan, cached = coverage_planner.plan(polygon, spacing, plan_request.robot_count, plan_request.angle, y_scale)
+        robot_ids = plan_request.robot_ids or [None] * plan_request.robot_count
+        missions = [
+            self._mission(plan_request, robot_id, index, path, length / units_per_meter)
+            for index, (robot_id, path, length) in enumerate(zip(robot_ids, plan["paths"], plan["lengths"]))
+        ]
+        return {
+            "plan_id": key,
+            "cached": cached,
+            "geofence_id": plan_request.geofence_id,
+            "angle": plan["angle"],
+            "pass_count": plan["pass_count"],
+            "cell_count": plan["cell_count"],
+            "swath_width": plan_request.swath_width,
+            "total_length_m": round(sum(plan["lengths"]) / units_per_meter, 1),
+            "missions": missions,
+        }
+
+    @staticmethod
+    def _mission(
+        plan_request: CoveragePlanRequest,
+        robot_id: Optional[str],
+        index: int,
+        path: List[List[float]],
+        length_m: float
+    ) -> Dict[str, Any]:
+        move = {"z": 0.0} if plan_request.speed is None else {"z": 0.0, "speed": plan_request.speed}
+        steps = [
+            {
+                "command_type": CommandType.MOVE.value,
+                "parameters": {"x": x, "y": y, **move},
+                "sequence": sequence,
+            }
+            for sequence, (x, y) in enumerate(path, start=1)
+        ]
+        count = plan_request.robot_count
+        name = plan_request.name if count == 1 else f"{plan_request.name} {index + 1}/{count}"
+        return {
+            "robot_id": robot_id,
+            "command_type": CommandType.CREATE_MISSION.value,
+            "parameters": {
+                "name": name,
+                "description": f"Boustrophedon coverage, {plan_request.swath_width} m swath, {length_m:.0f} m path",
+                "steps": steps,
+            },
+            "length_m": round(length_m, 1),
+        }
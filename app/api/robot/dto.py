@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
-from app.data.enums import RobotStatus, CommandStatus, AlertSeverity
+from app.data.enums import RobotStatus, CommandStatus, AlertSeverity, AlertType, ComponentType
 
 class RobotCapability(BaseModel):
     name: str
@@ -32,6 +32,15 @@ class Robot(BaseModel):
         orm_mode = True
         from_attributes = True
 
+class ComponentManifestEntry(BaseModel):
+    # Robots that do not track component ids get one derived from the robot id and name
+    component_id: Optional[str] = None
+    name: str
+    component_type: str = Field(default=ComponentType.OTHER.value)
+    capabilities: Dict[str, Any] = Field(default_factory=dict)
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
 class RegisterRequest(BaseModel):
     robot_id: str
     robot_name: str
@@ -42,6 +51,8 @@ class RegisterRequest(BaseModel):
     location: Optional[Location] = None
     software_version: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
+    # The robot's full set of components; omitted leaves stored components as they are
+    components: Optional[List[ComponentManifestEntry]] = None
 
 class RegisterResponse(BaseModel):
     success: bool
@@ -115,6 +126,7 @@ class CommandResultResponse(BaseModel):
 
 class AlertRequest(BaseModel):
     robot_id: str
+    type: AlertType = AlertType.OTHER
     severity: str
     message: str
     timestamp: datetime
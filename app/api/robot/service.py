@@ -19,6 +19,7 @@ from app.api.robot.dto import (
     CommandResultResponse,
     AlertRequest,
     AlertResponse,
+    ComponentManifestEntry,
     Command as ApiCommand,
     PollCommandsResponse
 )
@@ -26,8 +27,19 @@ from app.data.component.repository import ComponentRepository
 from app.data.action.repository import ActionRepository
 from app.data.step.repository import StepRepository
 from app.messaging.service import MessagingService
+from app.api.alert.service import AlertService
+from app.api.command.service import CommandService
+from app.api.component.status import component_states, normalize
+from app.api.coverage.service import CoverageService
+from app.api.geofence.service import GeofenceService
+from app.api.health.service import RobotHealthService
+from app.api.location.service import LocationService
+from app.api.location.table import latest_locations
+from app.api.maintenance.service import MaintenanceService
+from app.api.maintenance.planner import maintenance_index
+from app.api.telemetry.service import TelemetryRuleService
 from app.utils.logger import logger
-from app.data.enums import RobotStatus
+from app.data.enums import RobotStatus, CommandStatus, ComponentDiagnosisState, ComponentStatus, ComponentType
 from app.data.robot.dto import RobotCreateDTO, RobotUpdateDTO, RobotResponseDTO
 
 logger = logging.getLogger(__name__)
@@ -94,7 +106,10 @@ class RobotService:
     def delete_robot(self, robot_id: str) -> bool:
         """Delete a robot"""
         try:
-            return self.repository.delete(robot_id)
+            deleted = self.repository.delete(robot_id)
+            if deleted:
+                latest_locations.remove(robot_id)
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting robot: {str(e)}")
             raise
@@ -124,13 +139,10 @@ class RobotService:
 
     def get_latest_location(self, robot_id: str) -> Optional[tuple]:
         """Get the latest location for a robot"""
-        steps = self.step_repo.list_by_robot(robot_id)
-        if not steps:
+        location = LocationService(self.repository.session).get_latest(robot_id)
+        if not location:
             return None
-
-        # Return the latest step's location
-        latest_step = steps[-1]
-        return (latest_step.location_x, latest_step.location_y)
+        return (location.x, location.y)
 
     def register_robot(self, request: RegisterRequest) -> RegisterResponse:
         """Register a new robot or update an existing one"""
@@ -150,17 +162,19 @@ class RobotService:
                 "robot_metadata": request.metadata or {}
             }
             
-            # Check if robot exists
-            existing_robot = self.repository.get_by_id(request.robot_id)
-            if existing_robot:
-                # Update existing robot
-                db_robot = self.repository.update(request.robot_id, robot_data)
-                message = "Robot updated successfully"
-            else:
-                # Create new robot
-                db_robot = self.repository.create(robot_data)
-                message = "Robot registered successfully"
-            
+            components = None
+            if request.components is not None:
+                components = self._manifest_components(request.robot_id, request.components)
+
+            db_robot, created, deleted = self.repository.register(robot_data, components)
+            message = "Robot registered successfully" if created else "Robot updated successfully"
+            # Cached component states may predate the manifest
+            for component_id in [values["component_id"] for values in components or []] + deleted:
+                component_states.forget(component_id)
+            if components is not None:
+                maintenance_index.invalidate()
+            RobotHealthService(self.repository.session).recompute(db_robot.robot_id)
+
             return RegisterResponse(
                 success=True,
                 message=message,
@@ -185,6 +199,30 @@ class RobotService:
                 robot_config={}
             )
 
+    @staticmethod
+    def _manifest_components(robot_id: str, manifest: List[ComponentManifestEntry]) -> List[Dict[str, Any]]:
+        """Rows of a registration component manifest"""
+        now = datetime.utcnow()
+        components = []
+        for entry in manifest:
+            components.append({
+                "component_id": entry.component_id or str(uuid.uuid5(uuid.NAMESPACE_URL, f"{robot_id}/{entry.name}")),
+                "robot_id": robot_id,
+                "name": entry.name,
+                "component_type": normalize(ComponentType, entry.component_type),
+                "capabilities": entry.capabilities,
+                "parameters": entry.parameters,
+                "component_metadata": entry.metadata,
+                "status": ComponentStatus.OPERATIONAL.value,
+                "diagnosis_state": ComponentDiagnosisState.NORMAL.value,
+                "created_at": now,
+                "updated_at": now,
+            })
+        component_ids = [values["component_id"] for values in components]
+        if len(set(component_ids)) != len(component_ids):
+            raise ValueError("Component manifest lists a component more than once")
+        return components
+
     def process_heartbeat(self, heartbeat: HeartbeatRequest) -> HeartbeatResponse:
         """Process a robot heartbeat"""
         try:
@@ -197,6 +235,7 @@ class RobotService:
                     "last_seen": heartbeat.timestamp,
                     "health_metrics": heartbeat.quick_health
                 })
+                RobotHealthService(self.repository.session).heartbeat(robot.robot_id, heartbeat.quick_health)
                 
                 # Check for pending commands
                 has_pending = self._check_pending_commands(robot.robot_id)
@@ -246,23 +285,51 @@ class RobotService:
             telemetry = TelemetryData(
                 robot_id=request.robot_id,
                 timestamp=data.timestamp,
-                data=data.dict()
+                data=json.loads(data.json())
             )
             records.append(telemetry)
 
         self.repository.session.bulk_save_objects(records)
         self.repository.session.commit()
 
+        TelemetryRuleService(self.repository.session).evaluate(
+            request.robot_id,
+            [(record.timestamp, record.dict(exclude={"timestamp"})) for record in request.data]
+        )
+
+        MaintenanceService(self.repository.session).record_usage(
+            request.robot_id, [record.timestamp for record in request.data]
+        )
+
+        positions = self._gps_positions(request.data)
+        if positions:
+            GeofenceService(self.repository.session).check_batch(request.robot_id, positions)
+            CoverageService(self.repository.session).record_positions(request.robot_id, positions)
+
         return TelemetryBatchResponse(
             success=True,
             message="Telemetry data processed",
             records_received=len(records)
         )
 
+    @staticmethod
+    def _gps_positions(data: List[Any]) -> List[tuple]:
+        """(x, y, timestamp) of telemetry records with a GPS fix; x is latitude, as in location updates"""
+        positions = []
+        for record in data:
+            latitude = record.gps.get("latitude")
+            longitude = record.gps.get("longitude")
+            if latitude is not None and longitude is not None:
+                positions.append((float(latitude), float(longitude), record.timestamp))
+        return positions
+
     def process_command_result(self, request: CommandResultRequest) -> CommandResultResponse:
-        command = self.repository.session.query(Command).filter(
-            Command.command_id == request.command_id
-        ).first()
+        command = CommandService(self.repository.session).record_result(
+            command_id=request.command_id,
+            status=request.status,
+            result=request.result,
+            error=request.error
+        )
 
         if not command:
             return CommandResultResponse(
@@ -270,13 +337,6 @@ class RobotService:
                 message="Command not found"
             )
 
-        command.status = request.status
-        command.result = request.result
-        command.error = request.error
-        command.execution_time = request.execution_time
-        command.completed_at = datetime.utcnow()
-        self.repository.session.commit()
-
         return CommandResultResponse(
             success=True,
             message="Command result processed"
@@ -292,13 +352,13 @@ class RobotService:
 
         alert = Alert(
             robot_id=request.robot_id,
+            type=request.type.value,
             severity=request.severity,
             message=request.message,
             timestamp=request.timestamp,
             details=request.details
         )
-        self.repository.session.add(alert)
-        self.repository.session.commit()
+        AlertService(self.repository.session).record(alert)
 
         return AlertResponse(
             success=True,
@@ -0,0 +1,14 @@
+from app.api.telemetry.engine import RuleFiring, TelemetryRuleEngine, configured_rules, telemetry_rules
+from app.api.telemetry.rules import DEFAULT_RULES, TelemetryRule, compile_rules
+from app.api.telemetry.service import TelemetryRuleService
+
+__all__ = [
+    "DEFAULT_RULES",
+    "RuleFiring",
+    "TelemetryRule",
+    "TelemetryRuleEngine",
+    "TelemetryRuleService",
+    "compile_rules",
+    "configured_rules",
+    "telemetry_rules",
+]
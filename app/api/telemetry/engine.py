@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+from app.api.telemetry.rules import DEFAULT_RULES, RULE_RATE, RULE_SUSTAINED, TelemetryRule, compile_rules
+from app.api.trajectory.codec import from_millis, to_millis
+from app.config import Config
+
+
+class RuleState:
+    """What a rule remembers about one robot between batches"""
+    __slots__ = ("active", "last_time", "last_value", "since")
+
+    def __init__(self):
+        # Whether the rule held at the last sample; a firing is reported only when it starts to hold
+        self.active = False
+        self.last_time: Optional[float] = None
+        self.last_value: Optional[float] = None
+        # Start of the current run of samples meeting a sustained rule's comparison
+        self.since: Optional[float] = None
+
+
+class RuleFiring:
+    """A rule starting to hold for a robot"""
+    __slots__ = ("rule", "robot_id", "timestamp", "value", "rate")
+
+    def __init__(self, rule: TelemetryRule, robot_id: str, timestamp: datetime, value: float, rate: Optional[float]):
+        self.rule = rule
+        self.robot_id = robot_id
+        self.timestamp = timestamp
+        self.value = value
+        self.rate = rate
+
+    @property
+    def message(self) -> str:
+        return self.rule.format_message(self.robot_id, self.value, self.rate)
+
+
+class RuleEngineStats:
+    """Running totals of rule evaluation, to watch its cost per batch"""
+    __slots__ = ("batches", "samples", "firings", "seconds", "last_batch_seconds")
+
+    def __init__(self):
+        self.batches = 0
+        self.samples = 0
+        self.firings = 0
+        self.seconds = 0.0
+        self.last_batch_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "samples": self.samples,
+            "firings": self.firings,
+            "seconds": self.seconds,
+            "last_batch_seconds": self.last_batch_seconds,
+            "mean_batch_seconds": self.seconds / self.batches if self.batches else 0.0,
+        }
+
+
+def telemetry_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch of a naive UTC or aware timestamp"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return to_millis(timestamp) / 1000
+
+
+class TelemetryRuleEngine:
+    """
+    Evaluates compiled telemetry rules on each ingested batch. A batch of one
+    robot is sampled once per rule into arrays and every rule is applied
+    with numpy over the whole batch; between batches only a RuleState per
+    (robot, rule) is kept. Samples older than the last one a rule saw for a
+    robot are ignored.
+    """
+
+    def __init__(self, rules: Sequence[TelemetryRule]):
+        self._lock = threading.Lock()
+        self._rules = list(rules)
+        self._states: Dict[Tuple[str, str], RuleState] = {}
+        self.stats = RuleEngineStats()
+
+    @property
+    def rules(self) -> List[TelemetryRule]:
+        return list(self._rules)
+
+    def load(self, rules: Sequence[TelemetryRule]) -> None:
+        """Replace the rules, forgetting the state of rules that were removed"""
+        names = {rule.name for rule in rules}
+        with self._lock:
+            self._rules = list(rules)
+            self._states = {key: state for key, state in self._states.items() if key[1] in names}
+
+    def forget(self, robot_id: str) -> None:
+        with self._lock:
+            self._states = {key: state for key, state in self._states.items() if key[0] != robot_id}
+
+    def evaluate(self, robot_id: str, records: Sequence[Tuple[datetime, Dict[str, Any]]]) -> List[RuleFiring]:
+        """Evaluate every rule on a batch of (timestamp, data) records of one robot"""
+        if not records:
+            return []
+        started = time.perf_counter()
+        seconds = np.array([telemetry_seconds(timestamp) for timestamp, _ in records])
+        order = np.argsort(seconds, kind="stable")
+        times = seconds[order]
+        data = [records[i][1] for i in order.tolist()]
+
+        firings: List[RuleFiring] = []
+        with self._lock:
+            for rule in self._rules:
+                key = (robot_id, rule.name)
+                state = self._states.get(key)
+                if state is None:
+                    state = self._states[key] = RuleState()
+                firings.extend(self._evaluate_rule(rule, state, robot_id, times, data))
+
+            elapsed = time.perf_counter() - started
+            self.stats.batches += 1
+            self.stats.samples += len(records)
+            self.stats.firings += len(firings)
+            self.stats.seconds += elapsed
+            self.stats.last_batch_seconds = elapsed
+        firings.sort(key=lambda firing: firing.timestamp)
+        return firings
+
+    @staticmethod
+    def _evaluate_rule(
+        rule: TelemetryRule,
+        state: RuleState,
+        robot_id: str,
+        times: np.ndarray,
+        data: List[Dict[str, Any]]
+    ) -> List[RuleFiring]:
+        values, reported = rule.sample(data)
+        if state.last_time is not None:
+            reported &= times > state.last_time
+        if not reported.any():
+            return []
+        t, v = times[reported], values[reported]
+
+        rates = None
+        if rule.kind == RULE_RATE:
+            previous_t = np.concatenate(([np.nan if state.last_time is None else state.last_time], t[:-1]))
+            previous_v = np.concatenate(([np.nan if state.last_value is None else state.last_value], v[:-1]))
+            elapsed = t - previous_t
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rates = np.where(elapsed > 0, (v - previous_v) / elapsed, np.nan)
+            holding = np.isfinite(rates) & rule.holds(rates)
+        elif rule.kind == RULE_SUSTAINED:
+            meets = rule.holds(v)
+            was_meeting = np.concatenate(([state.since is not None], meets[:-1]))
+            starts = np.where(meets & ~was_meeting, t, -np.inf)
+            carried = -np.inf if state.since is None else state.since
+            run_start = np.maximum.accumulate(np.concatenate(([carried], starts)))[1:]
+            holding = meets & (t - run_start >= rule.duration)
+            state.since = float(run_start[-1]) if meets[-1] else None
+        else:
+            holding = rule.holds(v)
+
+        fired = np.flatnonzero(holding & ~np.concatenate(([state.active], holding[:-1])))
+        state.active = bool(holding[-1])
+        state.last_time = float(t[-1])
+        state.last_value = float(v[-1])
+        return [
+            RuleFiring(
+                rule,
+                robot_id,
+                from_millis(round(t[i] * 1000)),
+                float(v[i]),
+                float(rates[i]) if rates is not None else None
+            )
+            for i in fired.tolist()
+        ]
+
+
+def configured_rules() -> List[TelemetryRule]:
+    """Rules from TELEMETRY_RULES (a JSON array of definitions), or the default rules"""
+    definitions = json.loads(Config.TELEMETRY_RULES) if Config.TELEMETRY_RULES else DEFAULT_RULES
+    return compile_rules(definitions)
+
+
+telemetry_rules = TelemetryRuleEngine(configured_rules())
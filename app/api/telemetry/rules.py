@@ -0,0 +1,153 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import operator
+import numpy as np
+
+from app.data.enums import AlertSeverity, AlertType
+
+RULE_THRESHOLD = "threshold"
+RULE_RATE = "rate"
+RULE_SUSTAINED = "sustained"
+
+# Comparisons a rule can apply; "absent" holds when a metric is missing from a group that is reported
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "absent": None,
+}
+
+# Watched unless TELEMETRY_RULES replaces them. Metrics list alternative paths:
+# REST telemetry nests groups ("battery.level"), RabbitMQ telemetry is flat ("battery").
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "name": "low_battery",
+        "kind": RULE_THRESHOLD,
+        "metric": ["battery.level", "battery.percentage", "system.battery_level", "battery"],
+        "op": "<",
+        "value": 20,
+        "type": "battery",
+        "severity": "high",
+        "message": "Battery of robot {robot_id} at {value:.1f}%, below {threshold:g}%",
+    },
+    {
+        "name": "battery_drain",
+        "kind": RULE_RATE,
+        "metric": ["battery.level", "battery.percentage", "system.battery_level", "battery"],
+        "op": "<",
+        # Percent per second: 3% a minute
+        "value": -0.05,
+        "type": "battery",
+        "severity": "medium",
+        "message": "Battery of robot {robot_id} draining at {rate:.2f}%/s",
+    },
+    {
+        "name": "overheating",
+        "kind": RULE_SUSTAINED,
+        "metric": ["sensors.temperature", "temperature"],
+        "op": ">",
+        "value": 70,
+        "duration": 30,
+        "type": "system",
+        "severity": "high",
+        "message": "Robot {robot_id} above {threshold:g}°C for {duration:g}s ({value:.1f}°C)",
+    },
+    {
+        "name": "gps_loss",
+        "kind": RULE_SUSTAINED,
+        "metric": ["gps.latitude"],
+        "op": "absent",
+        "duration": 10,
+        "type": "location",
+        "severity": "medium",
+        "message": "Robot {robot_id} has had no GPS fix for {duration:g}s",
+    },
+]
+
+
+class TelemetryRule:
+    """
+    A rule compiled from its definition: the metric paths are split once
+    and the comparison resolved to a ufunc, so evaluating a batch is a few
+    array operations.
+
+    - threshold: the metric compares to value
+    - rate: the metric's change per second between consecutive samples compares to value
+    - sustained: the metric has compared to value for at least duration seconds
+    """
+
+    def __init__(self, definition: Dict[str, Any]):
+        try:
+            self.name = str(definition["name"])
+            self.kind = definition.get("kind", RULE_THRESHOLD)
+            metric = definition["metric"]
+            self.op = definition.get("op", ">")
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid telemetry rule {definition!r}: missing {e}")
+        if self.kind not in (RULE_THRESHOLD, RULE_RATE, RULE_SUSTAINED):
+            raise ValueError(f"Rule {self.name}: unknown kind {self.kind}")
+        if self.op not in OPERATORS:
+            raise ValueError(f"Rule {self.name}: unknown operator {self.op}")
+        if self.op == "absent" and self.kind == RULE_RATE:
+            raise ValueError(f"Rule {self.name}: a rate rule needs a numeric comparison")
+
+        paths = [metric] if isinstance(metric, str) else list(metric)
+        self.paths: List[Tuple[str, ...]] = [tuple(path.split(".")) for path in paths]
+        self.metric = paths[0]
+        self.threshold = float(definition.get("value", 0))
+        self.duration = float(definition.get("duration", 0))
+        self.alert_type = AlertType(definition.get("type", AlertType.OTHER.value))
+        self.severity = AlertSeverity(definition.get("severity", AlertSeverity.MEDIUM.value))
+        self.message = definition.get("message", "Rule {rule} fired for robot {robot_id}")
+        self._compare = OPERATORS[self.op]
+
+    def sample(self, records: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (values, reported) of the metric in each record. A record reports the
+        metric when it holds a number at one of its paths; for an "absent"
+        rule, when it holds the group the metric belongs to, and the value is
+        1 if the metric itself is missing.
+        """
+        values = np.full(len(records), np.nan)
+        for i, record in enumerate(records):
+            for path in self.paths:
+                parent = record
+                for key in path[:-1]:
+                    parent = parent.get(key) if isinstance(parent, dict) else None
+                if not isinstance(parent, dict):
+                    continue
+                value = parent.get(path[-1])
+                if self.op == "absent":
+                    values[i] = 1.0 if value is None else 0.0
+                    break
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[i] = value
+                    break
+        return values, ~np.isnan(values)
+
+    def holds(self, values: np.ndarray) -> np.ndarray:
+        """Whether the comparison holds for each value"""
+        if self._compare is None:
+            return values > 0.5
+        return self._compare(values, self.threshold)
+
+    def format_message(self, robot_id: str, value: float, rate: Optional[float]) -> str:
+        return self.message.format(
+            rule=self.name,
+            robot_id=robot_id,
+            metric=self.metric,
+            value=value,
+            rate=rate if rate is not None else float("nan"),
+            threshold=self.threshold,
+            duration=self.duration,
+        )
+
+
+def compile_rules(definitions: Sequence[Dict[str, Any]]) -> List[TelemetryRule]:
+    """Compile rule definitions, rejecting duplicate names"""
+    rules = [TelemetryRule(definition) for definition in definitions]
+    names = [rule.name for rule in rules]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate telemetry rule names: {', '.join(duplicates)}")
+    return rules
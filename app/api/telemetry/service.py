@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import logging
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+from app.api.alert.service import AlertService
+from app.api.telemetry.engine import RuleFiring, telemetry_rules
+from app.data.models import Alert
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryRuleService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.alert_service = AlertService(db_session)
+
+    def evaluate(self, robot_id: str, records: Sequence[Tuple[datetime, Dict[str, Any]]]) -> List[Alert]:
+        """Run the telemetry rules on a batch of one robot and store an alert per firing"""
+        firings = telemetry_rules.evaluate(robot_id, records)
+        logger.debug(
+            f"Evaluated {len(telemetry_rules.rules)} telemetry rules on {len(records)} records "
+            f"of robot {robot_id} in {telemetry_rules.stats.last_batch_seconds * 1000:.2f} ms"
+        )
+        if not firings:
+            return []
+        return self.alert_service.record_many([self._alert(firing) for firing in firings])
+
+    @staticmethod
+    def _alert(firing: RuleFiring) -> Alert:
+        rule = firing.rule
+        details = {
+            "rule": rule.name,
+            "kind": rule.kind,
+            "metric": rule.metric,
+            "value": firing.value,
+            "threshold": rule.threshold,
+            # Every firing of a rule for a robot is one alert while it keeps repeating
+            "dedup_key": f"rule:{rule.name}",
+        }
+        if firing.rate is not None:
+            details["rate"] = firing.rate
+        if rule.duration:
+            details["duration"] = rule.duration
+        return Alert(
+            robot_id=firing.robot_id,
+            type=rule.alert_type.value,
+            severity=rule.severity.value,
+            message=firing.message,
+            timestamp=firing.timestamp,
+            details=details,
+        )
@@ -0,0 +1,3 @@
+from app.api.trajectory.service import TrajectoryService, trajectory_buffer, track_cache
+
+__all__ = ["TrajectoryService", "trajectory_buffer", "track_cache"]
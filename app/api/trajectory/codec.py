@@ -0,0 +1,39 @@
+from typing import Tuple
+import zlib
+from datetime import datetime, timedelta
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_millis(timestamp: datetime) -> int:
+    """Naive UTC datetime to milliseconds since the epoch"""
+    return (timestamp - EPOCH) // timedelta(milliseconds=1)
+
+
+def from_millis(millis: int) -> datetime:
+    """Milliseconds since the epoch to a naive UTC datetime"""
+    return EPOCH + timedelta(milliseconds=int(millis))
+
+
+def encode_points(times: np.ndarray, xs: np.ndarray, ys: np.ndarray, scale: float) -> bytes:
+    """
+    Encode a run of positions. Coordinates are quantized to multiples of
+    scale, then every column is stored as deltas from the previous point.
+    Consecutive positions are close together, so the deltas are small
+    integers that zlib compresses well.
+    """
+    columns = np.vstack([
+        times.astype(np.int64),
+        np.rint(xs / scale).astype(np.int64),
+        np.rint(ys / scale).astype(np.int64),
+    ])
+    deltas = np.diff(columns, axis=1, prepend=0)
+    return zlib.compress(deltas.astype("<i8").tobytes(), 6)
+
+
+def decode_points(data: bytes, count: int, scale: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decode a chunk into (times in ms, xs, ys)"""
+    deltas = np.frombuffer(zlib.decompress(data), dtype="<i8").reshape(3, count)
+    columns = np.cumsum(deltas, axis=1)
+    return columns[0], columns[1] * scale, columns[2] * scale
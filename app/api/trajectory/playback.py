@@ -0,0 +1,173 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+import heapq
+import itertools
+import time
+from datetime import datetime
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.trajectory.codec import decode_points, from_millis, to_millis
+from app.api.trajectory.service import trajectory_buffer
+from app.config import Config
+from app.data.robot.repository import RobotRepository
+from app.data.trajectory.repository import TrajectoryRepository
+
+# (timestamp in ms, robot_id, x, y)
+PlaybackPoint = Tuple[int, str, float, float]
+
+
+class ChunkCursor:
+    """
+    Server-side cursor over one robot's chunks in a time window, in start
+    time order. Chunks are fetched page_size rows at a time by keyset, so
+    only one page is held however long the window is. Each page is read in
+    its own short-lived session, so a paced playback does not hold a pooled
+    connection (or a snapshot) between pages.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], robot_id: str, start: datetime, end: datetime, page_size: int):
+        self.session_factory = session_factory
+        self.robot_id = robot_id
+        self.start = start
+        self.end = end
+        self.page_size = page_size
+        self._page: Deque[Any] = deque()
+        self._after: Optional[Tuple[datetime, int]] = None
+        self._exhausted = False
+
+    def peek(self) -> Optional[Any]:
+        if not self._page and not self._exhausted:
+            with self.session_factory() as db:
+                rows = TrajectoryRepository(db).get_chunk_page(self.robot_id, self.start, self.end, self._after, self.page_size)
+            self._page.extend(rows)
+            self._exhausted = len(rows) < self.page_size
+            if rows:
+                self._after = (rows[-1].start_time, rows[-1].id)
+        return self._page[0] if self._page else None
+
+    def pop(self) -> Any:
+        row = self.peek()
+        self._page.popleft()
+        return row
+
+
+class PlaybackStream:
+    """
+    Time-ordered positions of several robots over a window. Each robot has
+    a ChunkCursor; a heap of cursors keyed by their next chunk's start time
+    decides which chunk to decode next, and a heap of decoded chunks keyed
+    by their next point merges the points. A chunk is only decoded once the
+    playback clock reaches its start, so memory holds the chunks in play,
+    not the window. Chunks of one robot may overlap when reports arrived out
+    of order; the point heap merges them like any other stream.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], robot_ids: Sequence[str], start: datetime, end: datetime, page_size: int):
+        self.robot_ids = list(robot_ids)
+        self.start = start
+        self.end = end
+        self.page_size = page_size
+        self.session_factory = session_factory
+
+    def __iter__(self) -> Iterator[PlaybackPoint]:
+        start_ms, end_ms = to_millis(self.start), to_millis(self.end)
+        sequence = itertools.count()
+        cursors: List[Tuple[int, int, ChunkCursor]] = []
+        points: List[Tuple[int, int, str, np.ndarray, np.ndarray, np.ndarray, int]] = []
+
+        def push_points(robot_id: str, times: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+            first = int(np.searchsorted(times, start_ms, side="left"))
+            last = int(np.searchsorted(times, end_ms, side="right"))
+            if first < last:
+                heapq.heappush(points, (int(times[first]), next(sequence), robot_id, times[:last], xs[:last], ys[:last], first))
+
+        for robot_id in self.robot_ids:
+            cursor = ChunkCursor(self.session_factory, robot_id, self.start, self.end, self.page_size)
+            row = cursor.peek()
+            if row is not None:
+                heapq.heappush(cursors, (to_millis(row.start_time), next(sequence), cursor))
+            # Points not flushed to a chunk yet
+            buffered = sorted(trajectory_buffer.snapshot(robot_id, start_ms, end_ms))
+            if buffered:
+                columns = np.array(buffered, dtype=np.float64).T
+                push_points(robot_id, columns[0].astype(np.int64), columns[1], columns[2])
+
+        while cursors or points:
+            # Decode every chunk that starts before the next point to emit
+            while cursors and (not points or cursors[0][0] <= points[0][0]):
+                _, _, cursor = heapq.heappop(cursors)
+                row = cursor.pop()
+                push_points(cursor.robot_id, *decode_points(row.data, row.point_count, row.scale))
+                following = cursor.peek()
+                if following is not None:
+                    heapq.heappush(cursors, (to_millis(following.start_time), next(sequence), cursor))
+            if not points:
+                break
+
+            millis, order, robot_id, times, xs, ys, position = points[0]
+            yield millis, robot_id, float(xs[position]), float(ys[position])
+            position += 1
+            if position < len(times):
+                heapq.heapreplace(points, (int(times[position]), order, robot_id, times, xs, ys, position))
+            else:
+                heapq.heappop(points)
+
+
+class PlaybackService:
+    """
+    Playback outlives the request that starts it (and may be paced for
+    hours), so it opens a short-lived session per read instead of holding one
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+
+    def select_robots(self, robot_ids: Optional[Sequence[str]]) -> List[str]:
+        """The existing robots among robot_ids, or every robot if none are given"""
+        with self.session_factory() as db:
+            return RobotRepository(db).select_ids(robot_ids=list(robot_ids) if robot_ids else None)
+
+    def frames(
+        self,
+        robot_ids: Sequence[str],
+        start: datetime,
+        end: datetime,
+        speed: float
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Replay positions of robots over a window as frames of positions.
+        With a positive speed, frames are released when the playback clock
+        (window time / speed) reaches them, with idle gaps longer than
+        PLAYBACK_MAX_IDLE_SECONDS shortened; speed 0 streams as fast as the
+        client reads. Frames hold at most PLAYBACK_FRAME_POINTS positions.
+        """
+        stream = PlaybackStream(self.session_factory, robot_ids, start, end, Config.PLAYBACK_CHUNK_PAGE)
+        start_ms = to_millis(start)
+        frame_seconds = Config.PLAYBACK_FRAME_MS / 1000
+        began = time.monotonic()
+        skipped = 0.0
+        frame: List[Dict[str, Any]] = []
+        frame_due = 0.0
+
+        for millis, robot_id, x, y in stream:
+            if speed > 0:
+                due = (millis - start_ms) / 1000 / speed - skipped
+                if frame and (due - frame_due > frame_seconds or len(frame) >= Config.PLAYBACK_FRAME_POINTS):
+                    yield frame
+                    frame = []
+                if not frame:
+                    wait = due - (time.monotonic() - began)
+                    if wait > Config.PLAYBACK_MAX_IDLE_SECONDS:
+                        skipped += wait - Config.PLAYBACK_MAX_IDLE_SECONDS
+                        due -= wait - Config.PLAYBACK_MAX_IDLE_SECONDS
+                        wait = Config.PLAYBACK_MAX_IDLE_SECONDS
+                    if wait > 0:
+                        time.sleep(wait)
+                    frame_due = due
+            elif len(frame) >= Config.PLAYBACK_FRAME_POINTS:
+                yield frame
+                frame = []
+            frame.append({"robot_id": robot_id, "location": [x, y], "timestamp": from_millis(millis).isoformat()})
+        if frame:
+            yield frame
@@ -0,0 +1,175 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.api.trajectory.codec import decode_points, encode_points, from_millis, to_millis
+from app.api.trajectory.simplify import simplify
+from app.api.trajectory.store import TrackCache, TrackPoint, TrajectoryBuffer
+from app.config import Config
+from app.data.trajectory.repository import TrajectoryRepository
+
+logger = logging.getLogger(__name__)
+
+trajectory_buffer = TrajectoryBuffer(Config.TRAJECTORY_CHUNK_POINTS, int(Config.TRAJECTORY_FLUSH_SECONDS * 1000))
+track_cache = TrackCache(Config.TRAJECTORY_CACHE_SIZE)
+
+
+class TrajectoryService:
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+        self.repository = TrajectoryRepository(db_session)
+
+    def record_point(self, robot_id: str, x: float, y: float, timestamp: datetime) -> None:
+        """Append a position to a robot's track"""
+        point = (to_millis(timestamp), x, y)
+        due = trajectory_buffer.append(robot_id, point, int(time.time() * 1000))
+        track_cache.invalidate(robot_id, timestamp)
+        if due:
+            self._flush(robot_id, due)
+
+    def record_batch(self, tracks: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> int:
+        """
+        Store complete runs of positions, {robot_id: (times in ms, xs, ys)}
+        sorted by time, as chunks of every robot in one INSERT. Used for
+        replayed history, which does not need to wait in the buffer.
+        Returns the number of chunks stored.
+        """
+        size = Config.TRAJECTORY_CHUNK_POINTS
+        scale = Config.TRAJECTORY_PRECISION
+        chunks = []
+        for robot_id, (times, xs, ys) in tracks.items():
+            for start in range(0, len(times), size):
+                chunk_times = times[start:start + size]
+                chunks.append({
+                    "robot_id": robot_id,
+                    "start_time": from_millis(chunk_times[0]),
+                    "end_time": from_millis(chunk_times[-1]),
+                    "point_count": len(chunk_times),
+                    "scale": scale,
+                    "data": encode_points(chunk_times, xs[start:start + size], ys[start:start + size], scale),
+                })
+        stored = self.repository.insert_chunks(chunks)
+        for robot_id, (times, _, _) in tracks.items():
+            track_cache.invalidate(robot_id, from_millis(times[0]), from_millis(times[-1]))
+        return stored
+
+    def flush_all(self) -> int:
+        """Write every buffered point, returning the number of chunks stored"""
+        return self._flush_drained(trajectory_buffer.drain())
+
+    def flush_due(self) -> int:
+        """Write the points of robots buffered for TRAJECTORY_FLUSH_SECONDS, returning the number of chunks stored"""
+        return self._flush_drained(trajectory_buffer.drain_due(int(time.time() * 1000)))
+
+    def _flush_drained(self, drained: Dict[str, List[TrackPoint]]) -> int:
+        chunks = 0
+        for robot_id, points in drained.items():
+            if points:
+                self._flush(robot_id, points)
+                chunks += 1
+        return chunks
+
+    def get_track(
+        self,
+        robot_id: str,
+        start: datetime,
+        end: Optional[datetime],
+        tolerance: float = 0.0,
+        algorithm: str = "dp"
+    ) -> Dict[str, Any]:
+        """Track of a robot in a time window, simplified to a tolerance in location units"""
+        key = (robot_id, start, end, tolerance, algorithm)
+        cached = track_cache.get(key)
+        if cached is not None:
+            return cached
+
+        times, points = self._load(robot_id, start, end or datetime.utcnow())
+        kept = simplify(points, tolerance, algorithm) if len(points) else np.arange(0)
+        track = {
+            "robot_id": robot_id,
+            "start": start.isoformat(),
+            "end": end.isoformat() if end else None,
+            "tolerance": tolerance,
+            "algorithm": algorithm,
+            "original_count": len(points),
+            "count": len(kept),
+            "points": points[kept].tolist(),
+            "timestamps": [from_millis(millis).isoformat() for millis in times[kept].tolist()],
+        }
+        track_cache.put(key, robot_id, start, end, track)
+        return track
+
+    def _load(self, robot_id: str, start: datetime, end: datetime):
+        start_ms, end_ms = to_millis(start), to_millis(end)
+        times: List[np.ndarray] = []
+        xs: List[np.ndarray] = []
+        ys: List[np.ndarray] = []
+        for chunk in self.repository.get_chunks(robot_id, start, end):
+            chunk_times, chunk_xs, chunk_ys = decode_points(chunk.data, chunk.point_count, chunk.scale)
+            times.append(chunk_times)
+            xs.append(chunk_xs)
+            ys.append(chunk_ys)
+
+        buffered = trajectory_buffer.snapshot(robot_id, start_ms, end_ms)
+        if buffered:
+            columns = np.array(buffered, dtype=np.float64).T
+            times.append(columns[0].astype(np.int64))
+            xs.append(columns[1])
+            ys.append(columns[2])
+
+        if not times:
+            return np.empty(0, dtype=np.int64), np.empty((0, 2))
+
+        all_times = np.concatenate(times)
+        in_window = (all_times >= start_ms) & (all_times <= end_ms)
+        # Chunks may overlap when reports arrive out of order
+        order = np.argsort(all_times[in_window], kind="stable")
+        points = np.column_stack([np.concatenate(xs)[in_window], np.concatenate(ys)[in_window]])
+        return all_times[in_window][order], points[order]
+
+    def _flush(self, robot_id: str, points: List[TrackPoint]) -> None:
+        points.sort(key=lambda point: point[0])
+        columns = np.array(points, dtype=np.float64).T
+        times = np.array([point[0] for point in points], dtype=np.int64)
+        scale = Config.TRAJECTORY_PRECISION
+        try:
+            self.repository.insert_chunks([{
+                "robot_id": robot_id,
+                "start_time": from_millis(times[0]),
+                "end_time": from_millis(times[-1]),
+                "point_count": len(points),
+                "scale": scale,
+                "data": encode_points(times, columns[1], columns[2], scale),
+            }])
+        except Exception as e:
+            logger.error(f"Error flushing trajectory of robot {robot_id}: {str(e)}")
+            trajectory_buffer.restore(robot_id, points, int(time.time() * 1000))
+
+
+class TrajectoryFlusher(threading.Thread):
+    """
+    Flushes the buffered points of robots that stopped reporting, which
+    would otherwise wait for their next point (or shutdown) to be stored
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], interval: float):
+        super().__init__(name="trajectory-flusher", daemon=True)
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop sweeping"""
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                with self.session_factory() as db:
+                    TrajectoryService(db).flush_due()
+            except Exception as e:
+                logger.error(f"Error flushing buffered trajectories: {str(e)}")
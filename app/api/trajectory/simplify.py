@@ -0,0 +1,94 @@
+import heapq
+import math
+import numpy as np
+
+SIMPLIFY_ALGORITHMS = ("dp", "vw")
+
+
+def tolerance_for_zoom(zoom: int, tile_size: int = 256) -> float:
+    """Width of one screen pixel in degrees at a web map zoom level"""
+    return 360.0 / (tile_size * 2 ** zoom)
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Indices of the points kept by Douglas-Peucker simplification: a point is
+    dropped when it is within tolerance of the segment that replaces it.
+    """
+    count = len(points)
+    if count < 3 or tolerance <= 0:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        dx, dy = end - start
+        length = math.hypot(dx, dy)
+        if length == 0:
+            distances = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        else:
+            distances = np.abs(dx * (inner[:, 1] - start[1]) - dy * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+def visvalingam_whyatt(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Indices of the points kept by Visvalingam-Whyatt simplification: the point
+    forming the smallest triangle with its neighbours is removed until every
+    remaining triangle is larger than tolerance squared.
+    """
+    count = len(points)
+    if count < 3 or tolerance <= 0:
+        return np.arange(count)
+
+    min_area = tolerance * tolerance
+    xs = points[:, 0].tolist()
+    ys = points[:, 1].tolist()
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    removed = [False] * count
+
+    def area(index: int) -> float:
+        a, c = previous[index], following[index]
+        return abs((xs[a] - xs[index]) * (ys[c] - ys[index]) - (xs[c] - xs[index]) * (ys[a] - ys[index])) / 2
+
+    heap = [(area(index), index) for index in range(1, count - 1)]
+    heapq.heapify(heap)
+    areas = {index: value for value, index in heap}
+    while heap:
+        value, index = heapq.heappop(heap)
+        if removed[index] or areas.get(index) != value:
+            continue  # Stale heap entry
+        if value > min_area:
+            break
+        removed[index] = True
+        a, c = previous[index], following[index]
+        following[a], previous[c] = c, a
+        for neighbor in (a, c):
+            if 0 < neighbor < count - 1:
+                # A neighbour's area never drops below the removed one, so
+                # points are removed in non-decreasing area order
+                areas[neighbor] = max(area(neighbor), value)
+                heapq.heappush(heap, (areas[neighbor], neighbor))
+    return np.flatnonzero(~np.array(removed))
+
+
+def simplify(points: np.ndarray, tolerance: float, algorithm: str = "dp") -> np.ndarray:
+    """Indices of the points kept by the requested algorithm"""
+    if algorithm == "dp":
+        return douglas_peucker(points, tolerance)
+    if algorithm == "vw":
+        return visvalingam_whyatt(points, tolerance)
+    raise ValueError(f"Unknown simplification algorithm: {algorithm}. Must be one of: {list(SIMPLIFY_ALGORITHMS)}")
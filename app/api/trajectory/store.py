@@ -0,0 +1,118 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# (timestamp in ms, x, y)
+TrackPoint = Tuple[int, float, float]
+
+
+class TrajectoryBuffer:
+    """
+    Positions received since the last flush, per robot. Points are encoded
+    into a chunk once a robot has chunk_points of them or its oldest buffered
+    point is older than max_age_ms; the age is checked on every append and
+    by a periodic sweep (drain_due), so robots that stopped reporting are
+    flushed too. Reads merge the buffer with stored chunks.
+    """
+
+    def __init__(self, chunk_points: int, max_age_ms: int):
+        self.chunk_points = chunk_points
+        self.max_age_ms = max_age_ms
+        self._lock = threading.Lock()
+        self._points: Dict[str, List[TrackPoint]] = {}
+        self._first_received: Dict[str, int] = {}
+
+    def append(self, robot_id: str, point: TrackPoint, received_ms: int) -> Optional[List[TrackPoint]]:
+        """Buffer a point. Returns the robot's points when they are due to be flushed."""
+        with self._lock:
+            points = self._points.setdefault(robot_id, [])
+            if not points:
+                self._first_received[robot_id] = received_ms
+            points.append(point)
+            if len(points) >= self.chunk_points or received_ms - self._first_received[robot_id] >= self.max_age_ms:
+                return self._take(robot_id)
+        return None
+
+    def drain_due(self, now_ms: int) -> Dict[str, List[TrackPoint]]:
+        """Take the points of every robot whose oldest buffered point is max_age_ms old"""
+        with self._lock:
+            due = [
+                robot_id for robot_id, first_received in self._first_received.items()
+                if now_ms - first_received >= self.max_age_ms
+            ]
+            return {robot_id: self._take(robot_id) for robot_id in due}
+
+    def drain(self) -> Dict[str, List[TrackPoint]]:
+        """Take every buffered point, e.g. on shutdown"""
+        with self._lock:
+            return {robot_id: self._take(robot_id) for robot_id in list(self._points)}
+
+    def restore(self, robot_id: str, points: List[TrackPoint], received_ms: int) -> None:
+        """Put back points whose flush failed so they are retried with the next point or sweep"""
+        with self._lock:
+            self._points[robot_id] = points + self._points.get(robot_id, [])
+            self._first_received.setdefault(robot_id, received_ms)
+
+    def snapshot(self, robot_id: str, start_ms: int, end_ms: int) -> List[TrackPoint]:
+        """Buffered points of a robot inside a time window"""
+        with self._lock:
+            return [point for point in self._points.get(robot_id, ()) if start_ms <= point[0] <= end_ms]
+
+    def _take(self, robot_id: str) -> List[TrackPoint]:
+        self._first_received.pop(robot_id, None)
+        return self._points.pop(robot_id, [])
+
+
+class TrackCache:
+    """
+    LRU cache of simplified tracks keyed by (robot, window, tolerance, algorithm).
+    A new point only evicts the cached windows of its robot that contain it,
+    so tracks of past windows stay cached while a robot keeps reporting.
+    Keys are tuples starting with the robot_id.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        # robot_id -> {key: (start, end)}; end None means "until now"
+        self._windows: Dict[str, Dict[Hashable, Tuple[datetime, Optional[datetime]]]] = {}
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            track = self._entries.get(key)
+            if track is not None:
+                self._entries.move_to_end(key)
+            return track
+
+    def put(self, key: Hashable, robot_id: str, start: datetime, end: Optional[datetime], track: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = track
+            self._entries.move_to_end(key)
+            self._windows.setdefault(robot_id, {})[key] = (start, end)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+
+    def invalidate(self, robot_id: str, timestamp: datetime, until: Optional[datetime] = None) -> None:
+        """Drop cached tracks of a robot whose window contains timestamp, or overlaps [timestamp, until]"""
+        until = until or timestamp
+        with self._lock:
+            windows = self._windows.get(robot_id)
+            if not windows:
+                return
+            stale = [
+                key for key, (start, end) in windows.items()
+                if start <= until and (end is None or timestamp <= end)
+            ]
+            for key in stale:
+                self._entries.pop(key, None)
+                del windows[key]
+
+    def _forget(self, key: Hashable) -> None:
+        windows = self._windows.get(key[0])
+        if windows is not None:
+            windows.pop(key, None)
+            if not windows:
+                del self._windows[key[0]]
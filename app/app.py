@@ -17,16 +17,32 @@ else:
     rprint("[bold blue]Running in local environment[/bold blue]")
 
 # Database
-from app.data.database import init_db, SessionLocal
+from app.data.database import init_db, SessionLocal, engine
+from app.data.command.notifier import CommandResultListener
+from app.data.notifier import NotificationListener
+from app.data.version_sync import ENTITY_VERSION_CHANNEL, VersionPublisher, apply_version_notification
+from app.data.versions import entity_versions
+from app.api.command.correlation import command_correlation
+from app.api.mission.executor import mission_executor
+from app.api.trajectory.service import TrajectoryFlusher, TrajectoryService
+from app.api.coverage.service import CoverageService
+from app.api.planner.service import coverage_planner
 
 # Messaging service
 from app.messaging.service import MessagingService
 
 # Routers (Blueprints)
-from app.router.command import command_router
+from app.router.alert import alert_router
+from app.router.command import command_router, set_messaging_service as set_command_messaging_service
 from app.router.component import component_router
 from app.router.health import health_router
+from app.router.coverage import coverage_router
+from app.router.fleet import fleet_router
+from app.router.geofence import geofence_router
 from app.router.location import location_router
+from app.router.logs import log_router
+from app.router.maintenance import maintenance_router
+from app.router.mission import mission_router
 from app.router.robot import robot_router
 
 # App
@@ -39,6 +55,13 @@ app.register_blueprint(robot_router)
 app.register_blueprint(location_router)
 app.register_blueprint(command_router)
 app.register_blueprint(component_router)
+app.register_blueprint(mission_router)
+app.register_blueprint(geofence_router)
+app.register_blueprint(coverage_router)
+app.register_blueprint(alert_router)
+app.register_blueprint(log_router)
+app.register_blueprint(maintenance_router)
+app.register_blueprint(fleet_router)
 
 # Messaging service global
 messaging_service = None
@@ -58,16 +81,56 @@ def main():
     db_session = SessionLocal()
     messaging_service = MessagingService(db_session)
     messaging_service.start()
+    set_command_messaging_service(messaging_service)
+    mission_executor.set_messaging_service(messaging_service)
+
+    # Resolve command waiters from results stored by other processes
+    command_result_listener = CommandResultListener(engine, command_correlation.resolve_remote)
+    command_result_listener.start()
 
     # Stop messaging on exit
     import atexit
     atexit.register(lambda: messaging_service.stop())
+    atexit.register(command_result_listener.stop)
+
+    # Share entity versions with the other API processes, so none serves a cached response older than a write.
+    # Versions reset whenever listening (re)starts, since bumps sent meanwhile are lost
+    version_publisher = VersionPublisher(engine, Config.ENTITY_VERSION_SYNC_SECONDS)
+    entity_versions.add_listener(version_publisher.publish)
+    version_publisher.start()
+    version_listener = NotificationListener(
+        engine, ENTITY_VERSION_CHANNEL, apply_version_notification, on_listen=entity_versions.reset
+    )
+    version_listener.start()
+    atexit.register(version_publisher.stop)
+    atexit.register(version_listener.stop)
+
+    # Store buffered positions of robots that stopped reporting once they are due
+    trajectory_flusher = TrajectoryFlusher(SessionLocal, Config.TRAJECTORY_SWEEP_SECONDS)
+    trajectory_flusher.start()
+    atexit.register(trajectory_flusher.stop)
+
+    # Store positions still buffered for trajectory chunks and unsaved coverage
+    def flush_tracks():
+        with SessionLocal() as db:
+            TrajectoryService(db).flush_all()
+            CoverageService(db).flush()
+    atexit.register(flush_tracks)
+    atexit.register(coverage_planner.shutdown)
+
+    # Socket.IO channel for fleet playback
+    from flask_socketio import SocketIO
+    from app.router.playback_socket import register_playback_events
+    socketio = SocketIO(app, cors_allowed_origins="*")
+    register_playback_events(socketio)
 
     # Run the application
-    app.run(
+    socketio.run(
+        app,
         host=Config.HOST,
         port=Config.PORT,
-        debug=Config.DEBUG
+        debug=Config.DEBUG,
+        allow_unsafe_werkzeug=True
     )
 
 
@@ -37,6 +37,117 @@ class Config:
     PORT = int(os.getenv("PORT", "5000"))
     HOST = os.getenv("HOST", "0.0.0.0")
 
+    # Command Configuration
+    COMMAND_WAIT_MAX_SECONDS = float(os.getenv("COMMAND_WAIT_MAX_SECONDS", "60"))
+
+    # Location Configuration
+    # Grid cell edge of the fleet spatial index, in location units
+    SPATIAL_INDEX_CELL_SIZE = float(os.getenv("SPATIAL_INDEX_CELL_SIZE", "0.001"))
+    LOCATION_BATCH_MAX_FIXES = int(os.getenv("LOCATION_BATCH_MAX_FIXES", "10000"))
+
+    # Fleet Map Tile Configuration
+    TILE_MAX_ZOOM = int(os.getenv("TILE_MAX_ZOOM", "18"))
+    # Robots are clustered below this zoom level, and shown with trails from TILE_TRAIL_MIN_ZOOM
+    TILE_CLUSTER_MAX_ZOOM = int(os.getenv("TILE_CLUSTER_MAX_ZOOM", "15"))
+    TILE_CLUSTER_RADIUS_PX = int(os.getenv("TILE_CLUSTER_RADIUS_PX", "64"))
+    TILE_TRAIL_MIN_ZOOM = int(os.getenv("TILE_TRAIL_MIN_ZOOM", "13"))
+    TILE_TRAIL_POINTS = int(os.getenv("TILE_TRAIL_POINTS", "60"))
+    TILE_TRAIL_SECONDS = float(os.getenv("TILE_TRAIL_SECONDS", "300"))
+    TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "2048"))
+
+    # Trajectory Configuration
+    TRAJECTORY_CHUNK_POINTS = int(os.getenv("TRAJECTORY_CHUNK_POINTS", "256"))
+    TRAJECTORY_FLUSH_SECONDS = float(os.getenv("TRAJECTORY_FLUSH_SECONDS", "300"))
+    # How often buffers are checked for points older than TRAJECTORY_FLUSH_SECONDS
+    TRAJECTORY_SWEEP_SECONDS = float(os.getenv("TRAJECTORY_SWEEP_SECONDS", "30"))
+    # Coordinates are stored as integer multiples of this (1e-7 degrees is about 1 cm)
+    TRAJECTORY_PRECISION = float(os.getenv("TRAJECTORY_PRECISION", "1e-7"))
+    TRAJECTORY_CACHE_SIZE = int(os.getenv("TRAJECTORY_CACHE_SIZE", "512"))
+
+    # Playback Configuration
+    # Chunks fetched per robot cursor round trip
+    PLAYBACK_CHUNK_PAGE = int(os.getenv("PLAYBACK_CHUNK_PAGE", "8"))
+    PLAYBACK_FRAME_MS = float(os.getenv("PLAYBACK_FRAME_MS", "100"))
+    PLAYBACK_FRAME_POINTS = int(os.getenv("PLAYBACK_FRAME_POINTS", "1000"))
+    PLAYBACK_MAX_IDLE_SECONDS = float(os.getenv("PLAYBACK_MAX_IDLE_SECONDS", "2"))
+    PLAYBACK_MAX_SPEED = float(os.getenv("PLAYBACK_MAX_SPEED", "10000"))
+
+    # Geofence Configuration
+    GEOFENCE_CELL_SIZE = float(os.getenv("GEOFENCE_CELL_SIZE", "0.005"))
+    GEOFENCE_ALERT_COOLDOWN_SECONDS = float(os.getenv("GEOFENCE_ALERT_COOLDOWN_SECONDS", "60"))
+
+    # Coverage Configuration
+    # Location units per meter (degrees of latitude by default)
+    COVERAGE_UNITS_PER_METER = float(os.getenv("COVERAGE_UNITS_PER_METER", str(1 / 111320)))
+    COVERAGE_RESOLUTION_METERS = float(os.getenv("COVERAGE_RESOLUTION_METERS", "1.0"))
+    COVERAGE_MAX_CELLS = int(os.getenv("COVERAGE_MAX_CELLS", "16000000"))
+    COVERAGE_DEFAULT_IMPLEMENT_WIDTH = float(os.getenv("COVERAGE_DEFAULT_IMPLEMENT_WIDTH", "2.0"))
+    COVERAGE_IMPLEMENT_REFRESH_SECONDS = float(os.getenv("COVERAGE_IMPLEMENT_REFRESH_SECONDS", "300"))
+    COVERAGE_MAX_GAP_SECONDS = float(os.getenv("COVERAGE_MAX_GAP_SECONDS", "30"))
+    COVERAGE_FLUSH_SECONDS = float(os.getenv("COVERAGE_FLUSH_SECONDS", "60"))
+
+    # Coverage Planner Configuration
+    PLANNER_CACHE_SIZE = int(os.getenv("PLANNER_CACHE_SIZE", "128"))
+    PLANNER_WORKERS = int(os.getenv("PLANNER_WORKERS", "2"))
+    # Fields whose estimated vertices x passes reach this are planned in the worker pool
+    PLANNER_POOL_MIN_WORK = int(os.getenv("PLANNER_POOL_MIN_WORK", "200000"))
+    PLANNER_MAX_PASSES = int(os.getenv("PLANNER_MAX_PASSES", "20000"))
+    PLANNER_TIMEOUT_SECONDS = float(os.getenv("PLANNER_TIMEOUT_SECONDS", "60"))
+
+    # Alert Configuration
+    # Repeats of an alert seen within this many seconds of its last occurrence are folded into it
+    ALERT_AGGREGATION_WINDOW_SECONDS = float(os.getenv("ALERT_AGGREGATION_WINDOW_SECONDS", "300"))
+    ALERT_FINGERPRINT_CACHE_SIZE = int(os.getenv("ALERT_FINGERPRINT_CACHE_SIZE", "10000"))
+    ALERT_SEARCH_PAGE_SIZE = int(os.getenv("ALERT_SEARCH_PAGE_SIZE", "50"))
+    ALERT_SEARCH_MAX_PAGE_SIZE = int(os.getenv("ALERT_SEARCH_MAX_PAGE_SIZE", "500"))
+
+    # Robot Log Configuration
+    # Uploads are read and decompressed this many bytes at a time
+    LOG_READ_CHUNK_BYTES = int(os.getenv("LOG_READ_CHUNK_BYTES", "65536"))
+    # Largest uncompressed upload accepted
+    LOG_UPLOAD_MAX_BYTES = int(os.getenv("LOG_UPLOAD_MAX_BYTES", str(1024 ** 3)))
+    LOG_MAX_LINE_BYTES = int(os.getenv("LOG_MAX_LINE_BYTES", "8192"))
+    # A segment is rotated at this many lines or bytes, and at the end of each UTC day
+    LOG_SEGMENT_MAX_LINES = int(os.getenv("LOG_SEGMENT_MAX_LINES", "5000"))
+    LOG_SEGMENT_MAX_BYTES = int(os.getenv("LOG_SEGMENT_MAX_BYTES", "1048576"))
+    LOG_INSERT_SEGMENTS = int(os.getenv("LOG_INSERT_SEGMENTS", "8"))
+    LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "30"))
+    LOG_RETENTION_CHECK_SECONDS = float(os.getenv("LOG_RETENTION_CHECK_SECONDS", "3600"))
+    LOG_QUERY_PAGE_LINES = int(os.getenv("LOG_QUERY_PAGE_LINES", "1000"))
+    LOG_QUERY_MAX_LINES = int(os.getenv("LOG_QUERY_MAX_LINES", "10000"))
+    # Segments fetched per query round trip
+    LOG_QUERY_SEGMENT_PAGE = int(os.getenv("LOG_QUERY_SEGMENT_PAGE", "16"))
+
+    # Component Status Configuration
+    # Last known states of this many components are kept to diff status reports against
+    COMPONENT_STATE_CACHE_SIZE = int(os.getenv("COMPONENT_STATE_CACHE_SIZE", "10000"))
+
+    # Maintenance Configuration
+    MAINTENANCE_DUE_DAYS = float(os.getenv("MAINTENANCE_DUE_DAYS", "7"))
+    MAINTENANCE_INDEX_REFRESH_SECONDS = float(os.getenv("MAINTENANCE_INDEX_REFRESH_SECONDS", "300"))
+    # Telemetry gaps longer than this mean the robot was off and add no usage hours
+    MAINTENANCE_USAGE_MAX_GAP_SECONDS = float(os.getenv("MAINTENANCE_USAGE_MAX_GAP_SECONDS", "300"))
+
+    # Robot Health Configuration
+    # JSON object of weights merged over the defaults (see app/api/health/score.py)
+    HEALTH_WEIGHTS = os.getenv("HEALTH_WEIGHTS", "")
+    # Robots without a heartbeat for this long are scored as stale
+    HEALTH_STALE_SECONDS = float(os.getenv("HEALTH_STALE_SECONDS", "120"))
+    HEALTH_SWEEP_SECONDS = float(os.getenv("HEALTH_SWEEP_SECONDS", "30"))
+    HEALTH_PAGE_SIZE = int(os.getenv("HEALTH_PAGE_SIZE", "50"))
+    HEALTH_MAX_PAGE_SIZE = int(os.getenv("HEALTH_MAX_PAGE_SIZE", "500"))
+
+    # Response Cache Configuration
+    # Serialized GET responses kept for conditional polling of robots, components and locations
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+    # Writes are shared with the other API processes through PostgreSQL NOTIFY, batched over this interval;
+    # on other databases the cache is only correct with a single API process
+    ENTITY_VERSION_SYNC_SECONDS = float(os.getenv("ENTITY_VERSION_SYNC_SECONDS", "0.05"))
+
+    # Telemetry Rule Configuration
+    # JSON array of rule definitions replacing the default rules (see app/api/telemetry/rules.py)
+    TELEMETRY_RULES = os.getenv("TELEMETRY_RULES", "")
+
     @classmethod
     def get_mqtt_config(cls):
         return {
@@ -23,6 +23,9 @@ class Action(Base):
     result = Column(JSON)
     error = Column(String)
     execution_time = Column(Float)
+    total_steps = Column(Integer, nullable=False, default=0)
+    completed_steps = Column(Integer, nullable=False, default=0)
+    failed_steps = Column(Integer, nullable=False, default=0)
 
     # Relationships with fully qualified paths
     component = relationship("app.data.component.model.Component", back_populates="actions")
@@ -41,7 +44,10 @@ class Action(Base):
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "result": self.result,
             "error": self.error,
-            "execution_time": self.execution_time
+            "execution_time": self.execution_time,
+            "total_steps": self.total_steps,
+            "completed_steps": self.completed_steps,
+            "failed_steps": self.failed_steps
         }
 
     @property
@@ -1,12 +1,21 @@
 from typing import List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy import case, func, or_, select, update
 from sqlalchemy.orm import Session
 import logging
 
 from app.data.action.model import Action
-from app.data.enums import ActionStatus
+from app.data.enums import ActionStatus, CommandStatus
+from app.data.step.model import Step
 
 logger = logging.getLogger(__name__)
 
+FINISHED_ACTION_STATUSES = (
+    ActionStatus.COMPLETED.value,
+    ActionStatus.FAILED.value,
+    ActionStatus.CANCELLED.value,
+)
+
 class ActionRepository:
     def __init__(self, db_session: Session):
         self.db = db_session
@@ -58,6 +67,71 @@ class ActionRepository:
             logger.error(f"Error updating action {action_id}: {str(e)}")
             return None
 
+    def finish_if_done(self, action_id: str) -> Optional[ActionStatus]:
+        """
+        Mark an action completed (or failed, if any step failed) once its step
+        counters show every step finished. Returns the new status, or None if
+        the action is still running or was already finished.
+        """
+        try:
+            row = self.db.execute(
+                update(Action)
+                .where(
+                    Action.action_id == action_id,
+                    Action.total_steps > 0,
+                    Action.completed_steps + Action.failed_steps >= Action.total_steps,
+                    Action.status.notin_(FINISHED_ACTION_STATUSES)
+                )
+                .values(
+                    status=case(
+                        (Action.failed_steps > 0, ActionStatus.FAILED.value),
+                        else_=ActionStatus.COMPLETED.value
+                    ),
+                    completed_at=datetime.utcnow()
+                )
+                .returning(Action.status)
+            ).first()
+            self.db.commit()
+            return ActionStatus(row.status) if row else None
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error finishing action {action_id}: {str(e)}")
+            return None
+
+    def backfill_step_counters(self) -> int:
+        """
+        Count the steps of actions created before they had step counters
+        (total_steps still 0 or NULL) from the steps table. Returns the
+        number of actions updated.
+        """
+        def counted(*statuses: CommandStatus):
+            query = select(func.count()).where(Step.action_id == Action.action_id)
+            if statuses:
+                query = query.where(Step.status.in_(statuses))
+            return query.scalar_subquery()
+
+        try:
+            result = self.db.execute(
+                update(Action)
+                .where(
+                    or_(Action.total_steps.is_(None), Action.total_steps == 0),
+                    select(Step.step_id).where(Step.action_id == Action.action_id).exists()
+                )
+                .values(
+                    total_steps=counted(),
+                    completed_steps=counted(CommandStatus.COMPLETED),
+                    # Cancelled steps count as failed, as in StepRepository.update_status
+                    failed_steps=counted(CommandStatus.FAILED, CommandStatus.CANCELLED)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error backfilling action step counters: {str(e)}")
+            raise
+
     def delete(self, action_id: str) -> bool:
         """Delete an action"""
         try:
@@ -1,9 +1,44 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import re
+from sqlalchemy import and_, func, literal_column, or_, update
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
 
 from app.data.models import Alert
-from app.data.enums import AlertSeverity, AlertType
+from app.data.enums import AlertSeverity, AlertStatus, AlertType
+
+logger = logging.getLogger(__name__)
+
+WORD = re.compile(r"\w+")
+
+# Details that only serve deduplication are not searchable
+UNSEARCHED_DETAILS = {"dedup_key"}
+
+
+def search_words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+def alert_search_text(message: Optional[str], details: Optional[Dict[str, Any]]) -> str:
+    """The words of an alert's message and of its details' keys and values"""
+    parts = [message or ""]
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key not in UNSEARCHED_DETAILS:
+                    parts.append(str(key))
+                    collect(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                collect(item)
+        elif value is not None:
+            parts.append(str(value))
+
+    collect(details)
+    return " ".join(search_words(" ".join(parts)))
 
 class AlertRepository:
     def __init__(self, db: Session):
@@ -11,11 +46,43 @@ class AlertRepository:
 
     def create(self, alert: Alert) -> Alert:
         """Create a new alert."""
+        alert.search_text = alert_search_text(alert.message, alert.details)
         self.db.add(alert)
         self.db.commit()
         self.db.refresh(alert)
         return alert
 
+    def create_many(self, alerts: List[Alert]) -> List[Alert]:
+        """Create several alerts in one transaction."""
+        if not alerts:
+            return alerts
+        for alert in alerts:
+            alert.search_text = alert_search_text(alert.message, alert.details)
+        self.db.add_all(alerts)
+        self.db.commit()
+        return alerts
+
+    def find_recent_by_fingerprint(self, fingerprint: str, since: datetime) -> Optional[Tuple[int, datetime]]:
+        """(id, last_seen) of the latest alert with a fingerprint seen since a time"""
+        row = self.db.query(Alert.id, Alert.last_seen).filter(
+            Alert.fingerprint == fingerprint,
+            Alert.last_seen >= since,
+            Alert.status != AlertStatus.RESOLVED.value
+        ).order_by(Alert.last_seen.desc()).first()
+        return (row.id, row.last_seen) if row else None
+
+    def add_occurrences(self, occurrences: Dict[int, Tuple[int, datetime]]) -> None:
+        """Fold repeats into existing alerts: {alert_id: (repeats, last_seen)}, one UPDATE per alert by primary key"""
+        if not occurrences:
+            return
+        for alert_id, (repeats, last_seen) in occurrences.items():
+            self.db.execute(
+                update(Alert)
+                .where(Alert.id == alert_id)
+                .values(count=Alert.count + repeats, last_seen=last_seen)
+            )
+        self.db.commit()
+
     def get_by_id(self, alert_id: int) -> Optional[Alert]:
         """Get alert by ID."""
         return self.db.query(Alert).filter(Alert.id == alert_id).first()
@@ -51,7 +118,85 @@ class AlertRepository:
             return True
         return False
 
-    def get_active_alerts(self) -> List[Alert]:
-        """Get all active alerts (not older than 24 hours)."""
-        cutoff_time = datetime.utcnow() - datetime.timedelta(hours=24)
-        return self.db.query(Alert).filter(Alert.timestamp >= cutoff_time).all() 
\ No newline at end of file
+    def get_active_alerts(self, severity: Optional[AlertSeverity] = None) -> List[Alert]:
+        """Get all unresolved alerts, latest first. Served by the partial index on active alerts."""
+        query = self.db.query(Alert).filter(Alert.status != AlertStatus.RESOLVED.value)
+        if severity is not None:
+            query = query.filter(Alert.severity == severity.value)
+        return query.order_by(Alert.last_seen.desc()).all()
+
+    def transition(self, alert_id: int, from_statuses: List[AlertStatus], values: dict) -> Optional[Alert]:
+        """
+        Move an alert to a new state if it is in one of from_statuses, in one
+        conditional UPDATE so concurrent transitions cannot both apply.
+        Returns the updated alert, or None if it was not in those states.
+        """
+        try:
+            result = self.db.execute(
+                update(Alert)
+                .where(Alert.id == alert_id, Alert.status.in_([status.value for status in from_statuses]))
+                .values(**values)
+            )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error updating alert {alert_id}: {str(e)}")
+            raise
+        if result.rowcount == 0:
+            return None
+        alert = self.get_by_id(alert_id)
+        self.db.refresh(alert)
+        return alert 
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        robot_id: Optional[str] = None,
+        severity: Optional[AlertSeverity] = None,
+        alert_type: Optional[AlertType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Alert]:
+        """
+        Alerts whose message or details contain every word of query (as a
+        word prefix), newest first. after is the (timestamp, id) of the last
+        alert of the previous page. On PostgreSQL the words are matched
+        through the full-text index.
+        """
+        words = search_words(query or "")
+        filters = []
+        if words:
+            if self.db.get_bind().dialect.name == "postgresql":
+                tsquery = " & ".join(f"{word}:*" for word in words)
+                filters.append(
+                    func.to_tsvector(literal_column("'simple'"), Alert.search_text)
+                    .op("@@")(func.to_tsquery(literal_column("'simple'"), tsquery))
+                )
+            else:
+                filters.extend(Alert.search_text.contains(word, autoescape=True) for word in words)
+        if robot_id:
+            filters.append(Alert.robot_id == robot_id)
+        if severity is not None:
+            filters.append(Alert.severity == severity.value)
+        if alert_type is not None:
+            filters.append(Alert.type == alert_type.value)
+        if since is not None:
+            filters.append(Alert.timestamp >= since)
+        if until is not None:
+            filters.append(Alert.timestamp < until)
+        if after is not None:
+            timestamp, alert_id = after
+            filters.append(or_(Alert.timestamp < timestamp, and_(Alert.timestamp == timestamp, Alert.id < alert_id)))
+        try:
+            return (
+                self.db.query(Alert)
+                .filter(*filters)
+                .order_by(Alert.timestamp.desc(), Alert.id.desc())
+                .limit(limit)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Error searching alerts: {str(e)}")
+            raise
@@ -1,7 +1,7 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
-from app.data.enums import CommandStatus, CommandType
+from app.data.enums import CommandStatus, CommandType, RobotStatus
 
 class CommandBaseDTO(BaseModel):
     """Base DTO for command data"""
@@ -29,8 +29,47 @@ class CommandResponseDTO(CommandBaseDTO):
     status: CommandStatus
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    batch_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class RobotSelectorDTO(BaseModel):
+    """DTO selecting the robots targeted by a broadcast command"""
+    robot_ids: Optional[List[str]] = None
+    status: Optional[RobotStatus] = None
+    capability: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not (self.robot_ids or self.status or self.capability)
+
+class CommandBroadcastDTO(BaseModel):
+    """DTO for sending one command to a selection of robots"""
+    selector: RobotSelectorDTO
+    command_type: CommandType
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+
+class CommandBatchEntryDTO(BaseModel):
+    """DTO for the per-robot state of a broadcast command"""
+    command_id: str
+    robot_id: str
+    status: CommandStatus
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class CommandBatchResponseDTO(BaseModel):
+    """DTO for the aggregate state of a broadcast command"""
+    batch_id: str
+    command_type: Optional[CommandType] = None
+    total: int
+    status_counts: Dict[str, int] = Field(default_factory=dict)
+    commands: List[CommandBatchEntryDTO] = Field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        pending = (CommandStatus.PENDING.value, CommandStatus.IN_PROGRESS.value)
+        return not any(self.status_counts.get(status) for status in pending)
@@ -0,0 +1,25 @@
+from typing import Any, Callable, Dict
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.data.notifier import NotificationListener, notify, supports_notify
+
+COMMAND_RESULT_CHANNEL = "command_results"
+
+
+def notify_command_result(session: Session, payload: Dict[str, Any]) -> None:
+    """Queue a command result notification, delivered to listeners when the session commits"""
+    if not supports_notify(session.get_bind()):
+        return
+    notify(session, COMMAND_RESULT_CHANNEL, payload)
+
+
+class CommandResultListener(NotificationListener):
+    """
+    Listens for command result notifications published by other API processes
+    and hands each decoded payload to a callback.
+    """
+
+    def __init__(self, engine: Engine, on_notify: Callable[[Dict[str, Any]], None], **kwargs):
+        super().__init__(engine, COMMAND_RESULT_CHANNEL, on_notify, **kwargs)
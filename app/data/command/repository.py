@@ -2,11 +2,13 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 import logging
+from sqlalchemy import insert, func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.data.models import Command
 from app.data.enums import CommandStatus, CommandType
+from app.data.command.notifier import notify_command_result
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +71,52 @@ class CommandRepository:
             logger.error(f"Error creating command: {str(e)}")
             raise
 
+    def create_many(self, robot_ids: List[str], command_type: CommandType, parameters: Dict[str, Any], batch_id: str) -> List[Dict[str, Any]]:
+        """Create the same command for many robots in a single multi-row INSERT"""
+        if not robot_ids:
+            return []
+        try:
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "command_id": str(uuid.uuid4()),
+                    "robot_id": robot_id,
+                    "command_type": command_type,
+                    "status": CommandStatus.PENDING,
+                    "parameters": parameters,
+                    "batch_id": batch_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for robot_id in robot_ids
+            ]
+            self.db.execute(insert(Command).values(rows))
+            self.db.commit()
+            return rows
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error creating batch {batch_id}: {str(e)}")
+            raise
+
+    def get_by_batch(self, batch_id: str) -> List[Command]:
+        """Get all commands belonging to a broadcast batch"""
+        try:
+            return self.db.query(Command).filter(Command.batch_id == batch_id).order_by(Command.robot_id).all()
+        except Exception as e:
+            logger.error(f"Error getting commands for batch {batch_id}: {str(e)}")
+            raise
+
+    def count_by_batch_status(self, batch_id: str) -> Dict[CommandStatus, int]:
+        """Count the commands of a broadcast batch grouped by status"""
+        try:
+            rows = self.db.query(Command.status, func.count(Command.command_id)).filter(
+                Command.batch_id == batch_id
+            ).group_by(Command.status).all()
+            return {status: count for status, count in rows}
+        except Exception as e:
+            logger.error(f"Error counting commands for batch {batch_id}: {str(e)}")
+            raise
+
     def update(self, command_id: str, parameters: Dict[str, Any]) -> Optional[Command]:
         """Update a command"""
         try:
@@ -101,6 +149,20 @@ class CommandRepository:
             logger.error(f"Error updating command status: {str(e)}")
             raise
 
+    def notify_result(self, command_id: str, status: CommandStatus, origin: str, error: Optional[str] = None) -> None:
+        """Notify other processes that a command reached a final status"""
+        try:
+            notify_command_result(self.db, {
+                "command_id": command_id,
+                "status": status.value,
+                "error": error,
+                "origin": origin
+            })
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error notifying result of command {command_id}: {str(e)}")
+
     def delete(self, command_id: str) -> bool:
         """Delete a command"""
         try:
@@ -21,6 +21,7 @@ class Component(Base):
     parameters = Column(JSON)
     last_maintenance = Column(DateTime)
     next_maintenance = Column(DateTime)
+    usage_hours = Column(Float, default=0.0)
     health_metrics = Column(JSON)
     component_metadata = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,7 +1,15 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import logging
+from datetime import datetime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.data.component.model import Component
+from app.data.models import ComponentHistory
+from app.data.versions import entity_versions
+
+logger = logging.getLogger(__name__)
 
 
 class ComponentRepository:
@@ -24,10 +32,60 @@ class ComponentRepository:
             .all()
         )
 
+    def get_state(self, component_id: str) -> Optional[Any]:
+        """(robot_id, status, diagnosis_state, parameters) of a component, as a plain row"""
+        return (
+            self.db_session.query(
+                Component.robot_id, Component.status, Component.diagnosis_state, Component.parameters
+            )
+            .filter(Component.component_id == component_id)
+            .first()
+        )
+
+    def apply_changes(
+        self,
+        robot_id: str,
+        component_id: str,
+        values: Dict[str, Any],
+        transition: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Write only the given fields of a component and, for a status or
+        diagnosis transition, append it to the history, in one transaction
+        """
+        try:
+            if values:
+                self.db_session.execute(
+                    update(Component).where(Component.component_id == component_id).values(**values)
+                )
+            if transition:
+                self.db_session.execute(insert(ComponentHistory).values(component_id=component_id, **transition))
+            self.db_session.commit()
+            entity_versions.bump_components(robot_id)
+        except SQLAlchemyError as e:
+            self.db_session.rollback()
+            logger.error(f"Error updating component {component_id}: {str(e)}")
+            raise
+
+    def get_history(
+        self,
+        component_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[ComponentHistory]:
+        """Transitions of a component, oldest first"""
+        query = self.db_session.query(ComponentHistory).filter(ComponentHistory.component_id == component_id)
+        if since is not None:
+            query = query.filter(ComponentHistory.changed_at >= since)
+        if until is not None:
+            query = query.filter(ComponentHistory.changed_at < until)
+        return query.order_by(ComponentHistory.changed_at, ComponentHistory.id).all()
+
     def create(self, component: Component) -> Component:
         """Create a new component"""
         self.db_session.add(component)
         self.db_session.commit()
+        entity_versions.bump_components(component.robot_id)
         self.db_session.refresh(component)
         return component
 
@@ -35,6 +93,7 @@ class ComponentRepository:
         """Update an existing component"""
         self.db_session.add(component)
         self.db_session.commit()
+        entity_versions.bump_components(component.robot_id)
         self.db_session.refresh(component)
         return component
 
@@ -43,6 +102,8 @@ class ComponentRepository:
         component = self.get_by_id(component_id)
         if not component:
             return False
+        robot_id = component.robot_id
         self.db_session.delete(component)
         self.db_session.commit()
+        entity_versions.bump_components(robot_id)
         return True
@@ -0,0 +1,3 @@
+from app.data.coverage.repository import CoverageRepository
+
+__all__ = ["CoverageRepository"]
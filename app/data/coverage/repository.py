@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.models import FieldCoverage
+
+logger = logging.getLogger(__name__)
+
+
+class CoverageRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, geofence_id: str) -> Optional[FieldCoverage]:
+        """Get the stored coverage raster of a field"""
+        try:
+            return self.db.get(FieldCoverage, geofence_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting coverage for field {geofence_id}: {str(e)}")
+            raise
+
+    def save_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or replace coverage rasters in one transaction"""
+        if not rows:
+            return
+        try:
+            for row in rows:
+                self.db.merge(FieldCoverage(**row))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error saving coverage rasters: {str(e)}")
+            raise
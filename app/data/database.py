@@ -19,6 +19,14 @@ def init_db():
     """Initialize the database by creating all tables."""
     Base.metadata.create_all(bind=engine)
 
+    # Actions created before step counters existed start at 0; count their steps once
+    from app.data.action.repository import ActionRepository
+    db = SessionLocal()
+    try:
+        ActionRepository(db).backfill_step_counters()
+    finally:
+        db.close()
+
 def get_db():
     """Get a database session."""
     db = SessionLocal()
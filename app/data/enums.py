@@ -122,4 +122,15 @@ class AlertType(CaseInsensitiveEnum):
     LOCATION = "location"
     STEP_FAILURE = "step_failure"
     COMMAND_FAILURE = "command_failure"
-    OTHER = "other" 
\ No newline at end of file
+    OTHER = "other" 
+
+class AlertStatus(CaseInsensitiveEnum):
+    """Enum for alert lifecycle states"""
+    OPEN = "open"
+    ACKNOWLEDGED = "acknowledged"
+    RESOLVED = "resolved"
+
+class GeofenceType(CaseInsensitiveEnum):
+    """Enum for geofence types"""
+    FIELD = "field"
+    EXCLUSION = "exclusion"
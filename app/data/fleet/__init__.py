@@ -0,0 +1,3 @@
+from app.data.fleet.repository import FleetRepository
+
+__all__ = ["FleetRepository"]
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.enums import AlertSeverity, AlertStatus
+from app.data.models import Alert, Robot, TelemetryData
+
+logger = logging.getLogger(__name__)
+
+
+class FleetRepository:
+    """Fleet-wide reads that load every robot's data in a fixed number of queries"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_robots(
+        self,
+        robot_ids: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        with_components: bool = False,
+        with_location: bool = False
+    ) -> List[Robot]:
+        """
+        Robots with only the given columns loaded, their location joined in
+        and their components loaded by one extra SELECT ... IN query
+        """
+        try:
+            query = self.db.query(Robot)
+            if columns is not None:
+                query = query.options(load_only(*[getattr(Robot, column) for column in columns]))
+            if with_location:
+                query = query.options(joinedload(Robot.location))
+            if with_components:
+                query = query.options(selectinload(Robot.components))
+            if robot_ids is not None:
+                query = query.filter(Robot.robot_id.in_(robot_ids))
+            return query.order_by(Robot.robot_id).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error loading fleet robots: {str(e)}")
+            raise
+
+    def get_latest_telemetry(self, robot_ids: Optional[Sequence[str]] = None) -> Dict[str, TelemetryData]:
+        """Latest telemetry record of each robot, in one query"""
+        try:
+            latest = select(TelemetryData.robot_id, func.max(TelemetryData.timestamp).label("timestamp"))
+            if robot_ids is not None:
+                latest = latest.where(TelemetryData.robot_id.in_(robot_ids))
+            latest = latest.group_by(TelemetryData.robot_id).subquery()
+            rows = self.db.scalars(
+                select(TelemetryData)
+                .join(latest, and_(
+                    TelemetryData.robot_id == latest.c.robot_id,
+                    TelemetryData.timestamp == latest.c.timestamp
+                ))
+                .order_by(TelemetryData.id)
+            )
+            # Of records sharing the latest timestamp, the last stored wins
+            return {row.robot_id: row for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error loading latest telemetry: {str(e)}")
+            raise
+
+    def get_open_alert_counts(self, robot_ids: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, int]]:
+        """Unresolved alerts per robot and severity, in one grouped query"""
+        try:
+            query = (
+                select(Alert.robot_id, Alert.severity, func.count())
+                .where(Alert.status != AlertStatus.RESOLVED.value)
+            )
+            if robot_ids is not None:
+                query = query.where(Alert.robot_id.in_(robot_ids))
+            counts: Dict[str, Dict[str, int]] = {}
+            for robot_id, severity, count in self.db.execute(query.group_by(Alert.robot_id, Alert.severity)):
+                # Robots may omit a severity; the column default applies to those
+                severity = severity or AlertSeverity.LOW.value
+                robot_counts = counts.setdefault(robot_id, {})
+                robot_counts[severity] = robot_counts.get(severity, 0) + count
+            return counts
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting open alerts: {str(e)}")
+            raise
@@ -0,0 +1,3 @@
+from app.data.geofence.repository import GeofenceRepository
+
+__all__ = ["GeofenceRepository"]
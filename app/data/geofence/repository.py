@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Optional
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.models import Geofence
+
+logger = logging.getLogger(__name__)
+
+
+class GeofenceRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self, active_only: bool = False) -> List[Geofence]:
+        """Get all geofences"""
+        try:
+            query = self.db.query(Geofence)
+            if active_only:
+                query = query.filter(Geofence.active.is_(True))
+            return query.all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting geofences: {str(e)}")
+            raise
+
+    def get_by_id(self, geofence_id: str) -> Optional[Geofence]:
+        """Get a geofence by ID"""
+        try:
+            return self.db.get(Geofence, geofence_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting geofence {geofence_id}: {str(e)}")
+            raise
+
+    def create(self, geofence_data: Dict[str, Any]) -> Geofence:
+        """Create a geofence"""
+        try:
+            geofence = Geofence(**geofence_data)
+            self.db.add(geofence)
+            self.db.commit()
+            self.db.refresh(geofence)
+            return geofence
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error creating geofence: {str(e)}")
+            raise
+
+    def update(self, geofence_id: str, geofence_data: Dict[str, Any]) -> Optional[Geofence]:
+        """Update a geofence"""
+        try:
+            geofence = self.get_by_id(geofence_id)
+            if not geofence:
+                return None
+            for key, value in geofence_data.items():
+                setattr(geofence, key, value)
+            self.db.commit()
+            self.db.refresh(geofence)
+            return geofence
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error updating geofence {geofence_id}: {str(e)}")
+            raise
+
+    def delete(self, geofence_id: str) -> bool:
+        """Delete a geofence"""
+        try:
+            geofence = self.get_by_id(geofence_id)
+            if not geofence:
+                return False
+            self.db.delete(geofence)
+            self.db.commit()
+            return True
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error deleting geofence {geofence_id}: {str(e)}")
+            raise
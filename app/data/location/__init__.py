@@ -0,0 +1,3 @@
+from app.data.location.repository import LocationRepository
+
+__all__ = ["LocationRepository"]
@@ -0,0 +1,73 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.data.models import RobotLocation
+
+logger = logging.getLogger(__name__)
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class LocationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, robot_id: str) -> Optional[RobotLocation]:
+        """Get the latest location of a robot"""
+        try:
+            return self.db.get(RobotLocation, robot_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting location for robot {robot_id}: {str(e)}")
+            raise
+
+    def get_all(self) -> List[RobotLocation]:
+        """Get the latest location of every robot"""
+        try:
+            return self.db.query(RobotLocation).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting robot locations: {str(e)}")
+            raise
+
+    def upsert(self, robot_id: str, x: float, y: float, heading: Optional[float], timestamp: datetime) -> None:
+        """
+        Store the latest location of a robot. A location older than the stored
+        one is ignored, so out-of-order reports never move a robot back.
+        """
+        self.upsert_many([{"robot_id": robot_id, "x": x, "y": y, "heading": heading, "timestamp": timestamp}])
+
+    def upsert_many(self, locations: List[Dict[str, Any]]) -> None:
+        """Store the latest location of several robots in one statement, one row per robot"""
+        if not locations:
+            return
+        try:
+            insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+            if insert is not None:
+                statement = insert(RobotLocation).values(locations)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[RobotLocation.robot_id],
+                    set_={key: statement.excluded[key] for key in ("x", "y", "heading", "timestamp")},
+                    where=RobotLocation.timestamp <= statement.excluded.timestamp
+                )
+                self.db.execute(statement)
+            else:
+                for values in locations:
+                    location = self.db.get(RobotLocation, values["robot_id"])
+                    if location is None:
+                        self.db.add(RobotLocation(**values))
+                    elif location.timestamp is None or location.timestamp <= values["timestamp"]:
+                        location.x, location.y = values["x"], values["y"]
+                        location.heading, location.timestamp = values["heading"], values["timestamp"]
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            robot_ids = ", ".join(values["robot_id"] for values in locations)
+            logger.error(f"Error storing location for robot {robot_ids}: {str(e)}")
+            raise
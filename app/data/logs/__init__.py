@@ -0,0 +1,3 @@
+from app.data.logs.repository import LogRepository
+
+__all__ = ["LogRepository"]
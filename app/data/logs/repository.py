@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+import logging
+from sqlalchemy import and_, delete, func, insert, literal_column, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.models import RobotLogSegment
+
+logger = logging.getLogger(__name__)
+
+
+class LogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert_segments(self, segments: List[Dict[str, Any]]) -> int:
+        """Store encoded segments in a single multi-row INSERT"""
+        if not segments:
+            return 0
+        try:
+            self.db.execute(insert(RobotLogSegment).values(segments))
+            self.db.commit()
+            return len(segments)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error storing log segments: {str(e)}")
+            raise
+
+    def get_segment_page(
+        self,
+        robot_id: str,
+        start: datetime,
+        end: datetime,
+        words: List[str],
+        from_key: Optional[Tuple[datetime, int]],
+        limit: int
+    ) -> List[Any]:
+        """
+        Segments of a robot overlapping a time window and holding every word
+        (as a word prefix), ordered by (start_time, id) from the given key
+        on. Rows are plain tuples, so nothing is kept in the session.
+        """
+        try:
+            query = self.db.query(
+                RobotLogSegment.id, RobotLogSegment.start_time, RobotLogSegment.source, RobotLogSegment.data
+            ).filter(
+                RobotLogSegment.robot_id == robot_id,
+                RobotLogSegment.day >= start.date(),
+                RobotLogSegment.day <= end.date(),
+                RobotLogSegment.start_time <= end,
+                RobotLogSegment.end_time >= start
+            )
+            if words:
+                if self.db.get_bind().dialect.name == "postgresql":
+                    tsquery = " & ".join(f"{word}:*" for word in words)
+                    query = query.filter(
+                        func.to_tsvector(literal_column("'simple'"), RobotLogSegment.words)
+                        .op("@@")(func.to_tsquery(literal_column("'simple'"), tsquery))
+                    )
+                else:
+                    query = query.filter(*(RobotLogSegment.words.contains(word, autoescape=True) for word in words))
+            if from_key is not None:
+                query = query.filter(or_(
+                    RobotLogSegment.start_time > from_key[0],
+                    and_(RobotLogSegment.start_time == from_key[0], RobotLogSegment.id >= from_key[1])
+                ))
+            return query.order_by(RobotLogSegment.start_time, RobotLogSegment.id).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error paging log segments for robot {robot_id}: {str(e)}")
+            raise
+
+    def delete_upload(self, robot_id: str, upload_id: str) -> int:
+        """Delete the segments of one upload, e.g. when it failed part way"""
+        try:
+            result = self.db.execute(delete(RobotLogSegment).where(
+                RobotLogSegment.robot_id == robot_id,
+                RobotLogSegment.upload_id == upload_id
+            ))
+            self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error deleting log upload {upload_id}: {str(e)}")
+            raise
+
+    def delete_before(self, day: date) -> int:
+        """Delete every segment of days before the given one"""
+        try:
+            result = self.db.execute(delete(RobotLogSegment).where(RobotLogSegment.day < day))
+            self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error deleting log segments before {day}: {str(e)}")
+            raise
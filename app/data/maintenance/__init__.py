@@ -0,0 +1,3 @@
+from app.data.maintenance.repository import MaintenanceRepository
+
+__all__ = ["MaintenanceRepository"]
@@ -0,0 +1,84 @@
+from typing import Any, List, Optional
+from datetime import datetime
+import logging
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.models import Component
+from app.data.versions import entity_versions
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_schedule(self, robot_id: Optional[str] = None, component_id: Optional[str] = None) -> List[Any]:
+        """Maintenance fields of components, as plain rows"""
+        try:
+            query = self.db.query(
+                Component.component_id,
+                Component.robot_id,
+                Component.name,
+                Component.component_type,
+                Component.parameters,
+                Component.last_maintenance,
+                Component.next_maintenance,
+                Component.usage_hours,
+                Component.created_at,
+            )
+            if robot_id is not None:
+                query = query.filter(Component.robot_id == robot_id)
+            if component_id is not None:
+                query = query.filter(Component.component_id == component_id)
+            return query.all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting maintenance schedule: {str(e)}")
+            raise
+
+    def add_usage(self, robot_id: str, hours: float) -> int:
+        """Add operating hours to every component of a robot in one UPDATE"""
+        try:
+            result = self.db.execute(
+                update(Component)
+                .where(Component.robot_id == robot_id)
+                .values(usage_hours=func.coalesce(Component.usage_hours, 0.0) + hours)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            if result.rowcount:
+                entity_versions.bump_components(robot_id)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error adding usage of robot {robot_id}: {str(e)}")
+            raise
+
+    def record_maintenance(
+        self,
+        component_id: str,
+        performed_at: datetime,
+        next_maintenance: Optional[datetime]
+    ) -> Optional[Any]:
+        """Mark a component maintained, resetting its usage hours; returns its schedule row"""
+        try:
+            result = self.db.execute(
+                update(Component)
+                .where(Component.component_id == component_id)
+                .values(last_maintenance=performed_at, next_maintenance=next_maintenance, usage_hours=0.0)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error recording maintenance of component {component_id}: {str(e)}")
+            raise
+        if not result.rowcount:
+            return None
+        rows = self.get_schedule(component_id=component_id)
+        if not rows:
+            return None
+        entity_versions.bump_components(rows[0].robot_id)
+        return rows[0]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, JSON, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, Boolean, JSON, ForeignKey, Enum, LargeBinary, Index, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -6,16 +6,20 @@ import uuid
 
 from app.data.database import Base
 from app.data.enums import (
-    RobotStatus, CommandStatus, AlertSeverity, AlertType, CommandType,
+    RobotStatus, CommandStatus, AlertSeverity, AlertStatus, AlertType, CommandType,
     ComponentStatus, ComponentDiagnosisState, ComponentType,
-    ActionType, ActionStatus
+    ActionType, ActionStatus, GeofenceType
 )
 
 Base = declarative_base()
 
 class Robot(Base):
     __tablename__ = "robots"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Fleet list ordered and filtered by health, with robot_id as the keyset tie-breaker
+        Index("ix_robots_health_score", "health_score", "robot_id"),
+        {'extend_existing': True},
+    )
 
     robot_id = Column(String, primary_key=True)
     name = Column(String)
@@ -29,12 +33,17 @@ class Robot(Base):
     health_metrics = Column(JSON, nullable=True)
     current_location = Column(JSON, nullable=True)
     robot_metadata = Column(JSON, nullable=True)
+    # Composite health from 0 to 100, kept current from health_factors as its inputs change
+    health_score = Column(Float, default=100.0)
+    health_factors = Column(JSON, nullable=True)
+    heartbeat_stale = Column(Boolean, nullable=False, default=False)
 
     # Relationships
     commands = relationship("Command", back_populates="robot", cascade="all, delete-orphan")
     telemetry_data = relationship("TelemetryData", back_populates="robot", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="robot", cascade="all, delete-orphan")
     components = relationship("Component", back_populates="robot", cascade="all, delete-orphan")
+    location = relationship("RobotLocation", back_populates="robot", uselist=False, cascade="all, delete-orphan")
 
     def to_dict(self):
         return {
@@ -49,7 +58,9 @@ class Robot(Base):
             "last_seen": self.last_seen.isoformat() if self.last_seen else None,
             "health_metrics": self.health_metrics,
             "current_location": self.current_location,
-            "metadata": self.robot_metadata
+            "metadata": self.robot_metadata,
+            "health_score": self.health_score,
+            "health_factors": self.health_factors
         }
 
     @property
@@ -62,7 +73,10 @@ class Robot(Base):
 
 class Component(Base):
     __tablename__ = "components"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_components_next_maintenance", "next_maintenance"),
+        {'extend_existing': True},
+    )
 
     component_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     robot_id = Column(String, ForeignKey("robots.robot_id"))
@@ -74,6 +88,8 @@ class Component(Base):
     parameters = Column(JSON)
     last_maintenance = Column(DateTime)
     next_maintenance = Column(DateTime)
+    # Hours the robot has operated since the component's last maintenance
+    usage_hours = Column(Float, default=0.0)
     health_metrics = Column(JSON)
     component_metadata = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -95,6 +111,7 @@ class Component(Base):
             "parameters": self.parameters,
             "last_maintenance": self.last_maintenance.isoformat() if self.last_maintenance else None,
             "next_maintenance": self.next_maintenance.isoformat() if self.next_maintenance else None,
+            "usage_hours": self.usage_hours,
             "health_metrics": self.health_metrics,
             "metadata": self.component_metadata,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -125,6 +142,38 @@ class Component(Base):
     def diagnosis_state_enum(self, value: ComponentDiagnosisState):
         self.diagnosis_state = value.value
 
+class ComponentHistory(Base):
+    """
+    A status or diagnosis transition of a component. Only real changes are
+    recorded, so a component's rows are its diagnosis timeline.
+    """
+    __tablename__ = "component_history"
+    __table_args__ = (
+        Index("ix_component_history_component_time", "component_id", "changed_at"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    component_id = Column(String, ForeignKey("components.component_id", ondelete="CASCADE"), nullable=False)
+    robot_id = Column(String, nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    previous_status = Column(String)
+    status = Column(String)
+    previous_diagnosis_state = Column(String)
+    diagnosis_state = Column(String)
+
+    def to_dict(self):
+        return {
+            "component_id": self.component_id,
+            "robot_id": self.robot_id,
+            "changed_at": self.changed_at.isoformat() if self.changed_at else None,
+            "previous_status": self.previous_status,
+            "status": self.status,
+            "previous_diagnosis_state": self.previous_diagnosis_state,
+            "diagnosis_state": self.diagnosis_state,
+        }
+
+
 class Action(Base):
     __tablename__ = "actions"
     __table_args__ = {'extend_existing': True}
@@ -141,6 +190,9 @@ class Action(Base):
     result = Column(JSON)
     error = Column(String)
     execution_time = Column(Float)
+    total_steps = Column(Integer, nullable=False, default=0)
+    completed_steps = Column(Integer, nullable=False, default=0)
+    failed_steps = Column(Integer, nullable=False, default=0)
 
     # Relationships
     component = relationship("Component", back_populates="actions")
@@ -159,7 +211,10 @@ class Action(Base):
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "result": self.result,
             "error": self.error,
-            "execution_time": self.execution_time
+            "execution_time": self.execution_time,
+            "total_steps": self.total_steps,
+            "completed_steps": self.completed_steps,
+            "failed_steps": self.failed_steps
         }
 
     @property
@@ -225,6 +280,7 @@ class Command(Base):
     parameters = Column(JSON, nullable=False, default=dict)
     result = Column(JSON, nullable=True)
     error = Column(String, nullable=True)
+    batch_id = Column(String(36), nullable=True, index=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -239,6 +295,7 @@ class Command(Base):
             "parameters": self.parameters,
             "result": self.result,
             "error": self.error,
+            "batch_id": self.batch_id,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
@@ -253,7 +310,11 @@ class Command(Base):
 
 class TelemetryData(Base):
     __tablename__ = "telemetry_data"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Latest record per robot for fleet snapshots
+        Index("ix_telemetry_data_robot_timestamp", "robot_id", "timestamp"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True)
     robot_id = Column(String, ForeignKey("robots.robot_id", ondelete="CASCADE"))
@@ -262,9 +323,149 @@ class TelemetryData(Base):
 
     robot = relationship("Robot", back_populates="telemetry_data")
 
+class RobotLocation(Base):
+    """Latest known position of a robot, one row per robot"""
+    __tablename__ = "robot_locations"
+    __table_args__ = {'extend_existing': True}
+
+    robot_id = Column(String, ForeignKey("robots.robot_id", ondelete="CASCADE"), primary_key=True)
+    x = Column(Float, nullable=False)
+    y = Column(Float, nullable=False)
+    heading = Column(Float, nullable=True)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    robot = relationship("Robot", back_populates="location")
+
+    def to_dict(self):
+        return {
+            "robot_id": self.robot_id,
+            "location": [self.x, self.y],
+            "heading": self.heading,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None
+        }
+
+class TrajectoryChunk(Base):
+    """
+    A run of consecutive positions of one robot. Timestamps and coordinates
+    are delta-encoded integers, compressed into data (see app.api.trajectory.codec).
+    """
+    __tablename__ = "trajectory_chunks"
+    __table_args__ = (
+        Index("ix_trajectory_chunks_robot_time", "robot_id", "start_time", "end_time"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    robot_id = Column(String, ForeignKey("robots.robot_id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    point_count = Column(Integer, nullable=False)
+    scale = Column(Float, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+class RobotLogSegment(Base):
+    """
+    Consecutive lines of an uploaded robot log, all from one robot and one
+    UTC day. Lines are compressed into data (see app.api.logs.codec);
+    segments are written once and deleted a whole day at a time.
+    """
+    __tablename__ = "robot_log_segments"
+    __table_args__ = (
+        # A day of the fleet's logs is one range of this index, for retention
+        Index("ix_robot_log_segments_day_robot", "day", "robot_id"),
+        Index("ix_robot_log_segments_robot_time", "robot_id", "start_time", "end_time"),
+        # Keyword search; other databases fall back to scanning words
+        Index(
+            "ix_robot_log_segments_words",
+            text("to_tsvector('simple', words)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    robot_id = Column(String, ForeignKey("robots.robot_id", ondelete="CASCADE"), nullable=False)
+    upload_id = Column(String, nullable=False)
+    source = Column(String)
+    day = Column(Date, nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    line_count = Column(Integer, nullable=False)
+    # Distinct lowercased words of the lines
+    words = Column(Text, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+class Geofence(Base):
+    """Field boundary or exclusion zone polygon"""
+    __tablename__ = "geofences"
+    __table_args__ = {'extend_existing': True}
+
+    geofence_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = Column(String, nullable=False)
+    fence_type = Column(String, nullable=False, default=GeofenceType.FIELD.value)
+    polygon = Column(JSON, nullable=False)
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "geofence_id": self.geofence_id,
+            "name": self.name,
+            "fence_type": self.fence_type,
+            "polygon": self.polygon,
+            "active": self.active,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class FieldCoverage(Base):
+    """Coverage raster of a field geofence, stored as bit-packed, compressed grids"""
+    __tablename__ = "field_coverage"
+    __table_args__ = {'extend_existing': True}
+
+    geofence_id = Column(String, ForeignKey("geofences.geofence_id", ondelete="CASCADE"), primary_key=True)
+    polygon_hash = Column(String(40), nullable=False)
+    origin_x = Column(Float, nullable=False)
+    origin_y = Column(Float, nullable=False)
+    resolution = Column(Float, nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    field_cells = Column(Integer, nullable=False)
+    covered_cells = Column(Integer, nullable=False, default=0)
+    mask = Column(LargeBinary, nullable=False)
+    covered = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class Alert(Base):
+    """
+    An alert raised for a robot. Repeats of the same alert (same fingerprint)
+    within the aggregation window are folded into one row: count is the
+    number of occurrences, timestamp the first and last_seen the latest.
+    An alert is open until it is acknowledged, and active until resolved.
+    """
     __tablename__ = "alerts"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_alerts_fingerprint_last_seen", "fingerprint", "last_seen"),
+        # Only unresolved alerts are indexed, so the index stays small however long history grows
+        Index(
+            "ix_alerts_active_severity",
+            "severity",
+            "last_seen",
+            postgresql_where=text("status <> 'resolved'"),
+            sqlite_where=text("status <> 'resolved'"),
+        ),
+        # Keyset pagination of alert history, overall and per robot
+        Index("ix_alerts_timestamp_id", "timestamp", "id"),
+        Index("ix_alerts_robot_timestamp_id", "robot_id", "timestamp", "id"),
+        # Full-text search; other databases fall back to scanning search_text
+        Index(
+            "ix_alerts_search_text",
+            text("to_tsvector('simple', search_text)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True)
     robot_id = Column(String, ForeignKey("robots.robot_id", ondelete="CASCADE"))
@@ -273,9 +474,37 @@ class Alert(Base):
     message = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
     details = Column(JSON)
+    fingerprint = Column(String)
+    count = Column(Integer, nullable=False, default=1)
+    last_seen = Column(DateTime, default=datetime.utcnow)
+    status = Column(String, nullable=False, default=AlertStatus.OPEN.value)
+    acknowledged_at = Column(DateTime)
+    acknowledged_by = Column(String)
+    resolved_at = Column(DateTime)
+    resolved_by = Column(String)
+    # Lowercased words of the message and details, set when the alert is stored
+    search_text = Column(String)
 
     robot = relationship("Robot", back_populates="alerts")
 
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "robot_id": self.robot_id,
+            "type": self.type,
+            "severity": self.severity,
+            "message": self.message,
+            "details": self.details,
+            "status": self.status,
+            "count": self.count,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "acknowledged_at": self.acknowledged_at.isoformat() if self.acknowledged_at else None,
+            "acknowledged_by": self.acknowledged_by,
+            "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
+            "resolved_by": self.resolved_by,
+        }
+
     @property
     def severity_enum(self) -> AlertSeverity:
         return AlertSeverity(self.severity)
@@ -0,0 +1,98 @@
+import json
+import logging
+import select
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def supports_notify(bind: Engine) -> bool:
+    """LISTEN/NOTIFY is only available on PostgreSQL"""
+    return bind.dialect.name == "postgresql"
+
+
+def notify(connection: Union[Session, Connection], channel: str, payload: Dict[str, Any]) -> None:
+    """Queue a notification on channel, delivered to listeners when the transaction commits"""
+    connection.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": json.dumps(payload, default=str)}
+    )
+
+
+class NotificationListener(threading.Thread):
+    """
+    Listens on a notification channel for payloads published by other API
+    processes and hands each decoded payload to a callback. on_listen is
+    called whenever listening (re)starts, since notifications sent while
+    disconnected are lost.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        channel: str,
+        on_notify: Callable[[Dict[str, Any]], None],
+        on_listen: Optional[Callable[[], None]] = None,
+        poll_interval: float = 5.0,
+        reconnect_delay: float = 5.0
+    ):
+        super().__init__(name=f"{channel}-listener", daemon=True)
+        self.engine = engine
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_listen = on_listen
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop listening"""
+        self._stopped.set()
+
+    def run(self):
+        if not supports_notify(self.engine):
+            logger.info(f"Database does not support LISTEN/NOTIFY, {self.channel} listener disabled")
+            return
+
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+                logger.info(f"Listening for notifications on {self.channel}")
+                if self.on_listen:
+                    self.on_listen()
+
+                while not self._stopped.is_set():
+                    ready, _, _ = select.select([dbapi_connection], [], [], self.poll_interval)
+                    if not ready:
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notification = dbapi_connection.notifies.pop(0)
+                        self._dispatch(notification.payload)
+            except Exception as e:
+                logger.error(f"{self.channel} listener error: {str(e)}")
+                self._stopped.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _dispatch(self, raw_payload: str) -> None:
+        try:
+            payload: Optional[Dict[str, Any]] = json.loads(raw_payload)
+        except ValueError:
+            logger.error(f"Invalid {self.channel} notification: {raw_payload}")
+            return
+        try:
+            self.on_notify(payload)
+        except Exception as e:
+            logger.error(f"Error handling {self.channel} notification: {str(e)}")
@@ -1,10 +1,17 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+import json
 import logging
 from datetime import datetime
+from sqlalchemy import and_, delete, exists, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from app.data.models import Robot
-from app.data.enums import RobotStatus
+from app.data.location.repository import UPSERT_INSERTS
+from app.data.models import Action, Alert, Component, Robot
+from app.data.enums import AlertSeverity, AlertStatus, ComponentDiagnosisState, RobotStatus
+from app.data.versions import entity_versions
+
+# Component columns a registration manifest sets; status, diagnosis and maintenance are left alone
+MANIFEST_COLUMNS = ("name", "component_type", "capabilities", "parameters", "component_metadata")
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +45,7 @@ class RobotRepository:
             robot = Robot(**robot_data)
             self.session.add(robot)
             self.session.commit()
+            entity_versions.bump_robot(robot.robot_id)
             self.session.refresh(robot)
             return robot
         except Exception as e:
@@ -61,6 +69,7 @@ class RobotRepository:
                         setattr(robot, key, value)
                 robot.last_seen = datetime.utcnow()
                 self.session.commit()
+                entity_versions.bump_robot(robot_id)
                 self.session.refresh(robot)
             return robot
         except Exception as e:
@@ -68,6 +77,185 @@ class RobotRepository:
             logger.error(f"Error updating robot: {str(e)}")
             raise
 
+    def register(
+        self,
+        robot_data: Dict[str, Any],
+        components: Optional[List[Dict[str, Any]]] = None
+    ) -> Tuple[Robot, bool, List[str]]:
+        """
+        Create or update a robot and, if a component manifest is given,
+        reconcile its components with it: manifest components are upserted
+        in one statement and components missing from it are deleted, in the
+        same transaction. Components that actions refer to are kept.
+        Returns the robot, whether it was created, and the IDs of deleted components.
+        """
+        robot_id = robot_data["robot_id"]
+        try:
+            robot = self.get_by_id(robot_id)
+            created = robot is None
+            if created:
+                robot = Robot(**robot_data)
+                self.session.add(robot)
+            else:
+                for key, value in robot_data.items():
+                    setattr(robot, key, value)
+                robot.last_seen = datetime.utcnow()
+            deleted: List[str] = []
+            if components is not None:
+                # The robot row must exist before its components refer to it
+                self.session.flush()
+                self._upsert_components(components)
+                deleted = self._delete_components_except(robot_id, [values["component_id"] for values in components])
+            self.session.commit()
+            entity_versions.bump_robot(robot_id)
+            if components is not None:
+                entity_versions.bump_components(robot_id)
+            self.session.refresh(robot)
+            return robot, created, deleted
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error registering robot {robot_id}: {str(e)}")
+            raise
+
+    def _upsert_components(self, components: List[Dict[str, Any]]) -> None:
+        if not components:
+            return
+        insert = UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if insert is None:
+            for values in components:
+                component = self.session.get(Component, values["component_id"])
+                if component is None:
+                    self.session.add(Component(**values))
+                elif component.robot_id == values["robot_id"]:
+                    for key in MANIFEST_COLUMNS + ("updated_at",):
+                        setattr(component, key, values[key])
+            return
+        statement = insert(Component).values(components)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Component.component_id],
+            set_={key: statement.excluded[key] for key in MANIFEST_COLUMNS + ("updated_at",)},
+            # A robot cannot take over another robot's component
+            where=Component.robot_id == statement.excluded.robot_id
+        )
+        self.session.execute(statement)
+
+    def _delete_components_except(self, robot_id: str, component_ids: List[str]) -> List[str]:
+        condition = and_(
+            Component.robot_id == robot_id,
+            Component.component_id.not_in(component_ids),
+            ~exists().where(Action.component_id == Component.component_id)
+        )
+        statement = delete(Component).where(condition).execution_options(synchronize_session=False)
+        if self.session.get_bind().dialect.delete_returning:
+            return list(self.session.scalars(statement.returning(Component.component_id)))
+        deleted = list(self.session.scalars(select(Component.component_id).where(condition)))
+        if deleted:
+            self.session.execute(statement)
+        return deleted
+
+    def get_health(self, robot_id: str) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+        """Stored health factors ({} if never computed) and score of a robot, None if there is no such robot"""
+        row = self.session.query(Robot.health_factors, Robot.health_score).filter(Robot.robot_id == robot_id).first()
+        if row is None:
+            return None
+        return row.health_factors or {}, row.health_score
+
+    def set_health(self, robot_id: str, values: Dict[str, Any]) -> None:
+        """Write health columns of a robot in one UPDATE"""
+        try:
+            self.session.execute(
+                update(Robot).where(Robot.robot_id == robot_id).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            entity_versions.bump_robot(robot_id)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error updating health of robot {robot_id}: {str(e)}")
+            raise
+
+    def count_component_states(self, robot_id: str) -> Dict[str, int]:
+        """Components of a robot per diagnosis state"""
+        rows = (
+            self.session.query(Component.diagnosis_state, func.count())
+            .filter(Component.robot_id == robot_id)
+            .group_by(Component.diagnosis_state)
+        )
+        counts: Dict[str, int] = {}
+        for state, count in rows:
+            state = state or ComponentDiagnosisState.NORMAL.value
+            counts[state] = counts.get(state, 0) + count
+        return counts
+
+    def count_open_alerts(self, robot_id: str) -> Dict[str, int]:
+        """Unresolved alerts of a robot per severity"""
+        rows = (
+            self.session.query(Alert.severity, func.count())
+            .filter(Alert.robot_id == robot_id, Alert.status != AlertStatus.RESOLVED.value)
+            .group_by(Alert.severity)
+        )
+        counts: Dict[str, int] = {}
+        for severity, count in rows:
+            severity = severity or AlertSeverity.LOW.value
+            counts[severity] = counts.get(severity, 0) + count
+        return counts
+
+    def find_health_outdated(self, stale_before: datetime) -> List[Any]:
+        """
+        Robots whose health needs recomputing without any input changing:
+        heartbeat newly older than stale_before, or never scored
+        """
+        return (
+            self.session.query(Robot.robot_id, Robot.health_factors, Robot.health_score)
+            .filter(or_(
+                and_(Robot.last_seen < stale_before, Robot.heartbeat_stale.is_not(True)),
+                Robot.health_score.is_(None)
+            ))
+            .all()
+        )
+
+    def list_by_health(
+        self,
+        descending: bool = False,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        status: Optional[str] = None,
+        after: Optional[Tuple[float, str]] = None,
+        limit: int = 50
+    ) -> List[Robot]:
+        """
+        Robots ordered by health score (worst first unless descending),
+        keyset-paginated after (score, robot_id), through ix_robots_health_score
+        """
+        try:
+            query = self.session.query(Robot).filter(Robot.health_score.is_not(None))
+            if min_score is not None:
+                query = query.filter(Robot.health_score >= min_score)
+            if max_score is not None:
+                query = query.filter(Robot.health_score <= max_score)
+            if status:
+                query = query.filter(Robot.status == status)
+            if after is not None:
+                score, robot_id = after
+                if descending:
+                    query = query.filter(or_(
+                        Robot.health_score < score,
+                        and_(Robot.health_score == score, Robot.robot_id < robot_id)
+                    ))
+                else:
+                    query = query.filter(or_(
+                        Robot.health_score > score,
+                        and_(Robot.health_score == score, Robot.robot_id > robot_id)
+                    ))
+            if descending:
+                query = query.order_by(Robot.health_score.desc(), Robot.robot_id.desc())
+            else:
+                query = query.order_by(Robot.health_score, Robot.robot_id)
+            return query.limit(limit).all()
+        except Exception as e:
+            logger.error(f"Error listing robots by health: {str(e)}")
+            raise
+
     def delete(self, robot_id: str) -> bool:
         """Delete a robot"""
         try:
@@ -75,6 +263,8 @@ class RobotRepository:
             if robot:
                 self.session.delete(robot)
                 self.session.commit()
+                entity_versions.bump_robot(robot_id)
+                entity_versions.bump_components(robot_id)
                 return True
             return False
         except Exception as e:
@@ -90,6 +280,7 @@ class RobotRepository:
                 robot.status = status.value
                 robot.last_seen = datetime.utcnow()
                 self.session.commit()
+                entity_versions.bump_robot(robot_id)
                 self.session.refresh(robot)
             return robot
         except Exception as e:
@@ -100,3 +291,40 @@ class RobotRepository:
     def get_by_ip(self, ip_address: str) -> Optional[Robot]:
         """Get a robot by IP address"""
         return self.session.query(Robot).filter(Robot.ip_address == ip_address).first()
+
+    def select_ids(
+        self,
+        robot_ids: Optional[List[str]] = None,
+        status: Optional[RobotStatus] = None,
+        capability: Optional[str] = None
+    ) -> List[str]:
+        """Get the IDs of robots matching an explicit ID list, status and/or capability"""
+        try:
+            query = self.session.query(Robot.robot_id, Robot.capabilities)
+            if robot_ids:
+                query = query.filter(Robot.robot_id.in_(robot_ids))
+            if status:
+                query = query.filter(Robot.status == status.value)
+            rows = query.order_by(Robot.robot_id).all()
+            if capability:
+                rows = [row for row in rows if self._has_capability(row.capabilities, capability)]
+            return [row.robot_id for row in rows]
+        except Exception as e:
+            logger.error(f"Error selecting robots: {str(e)}")
+            raise
+
+    @staticmethod
+    def _has_capability(capabilities: Any, name: str) -> bool:
+        """Check a stored capability list (JSON string or list) for a supported capability"""
+        if isinstance(capabilities, str):
+            try:
+                capabilities = json.loads(capabilities)
+            except ValueError:
+                return False
+        for capability in capabilities or []:
+            if isinstance(capability, dict):
+                if capability.get("name", "").lower() == name.lower() and capability.get("supported", True):
+                    return True
+            elif isinstance(capability, str) and capability.lower() == name.lower():
+                return True
+        return False
@@ -1,4 +1,6 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, NamedTuple
+from datetime import datetime
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 import logging
 
@@ -7,6 +9,20 @@ from app.data.enums import CommandStatus
 
 logger = logging.getLogger(__name__)
 
+FINAL_STEP_STATUSES = (CommandStatus.COMPLETED, CommandStatus.FAILED, CommandStatus.CANCELLED)
+
+
+class ActionStepCounters(NamedTuple):
+    """Step counters of an action right after one of its steps finished"""
+    action_id: str
+    total_steps: int
+    completed_steps: int
+    failed_steps: int
+
+    @property
+    def finished(self) -> bool:
+        return self.total_steps > 0 and self.completed_steps + self.failed_steps >= self.total_steps
+
 class StepRepository:
     def __init__(self, db_session: Session):
         self.db = db_session
@@ -36,10 +52,19 @@ class StepRepository:
             return []
 
     def create(self, step_data: Dict[str, Any]) -> Optional[Step]:
-        """Create a new step"""
+        """Create a new step, counting it in its action's total_steps in the same transaction"""
+        from app.data.action.model import Action
+
         try:
             step = Step(**step_data)
             self.db.add(step)
+            if step.action_id:
+                self.db.execute(
+                    update(Action)
+                    .where(Action.action_id == step.action_id)
+                    .values(total_steps=Action.total_steps + 1)
+                    .execution_options(synchronize_session=False)
+                )
             self.db.commit()
             self.db.refresh(step)
             return step
@@ -48,6 +73,22 @@ class StepRepository:
             logger.error(f"Error creating step: {str(e)}")
             return None
 
+    def create_many(self, steps_data: List[Dict[str, Any]]) -> int:
+        """
+        Create several steps in a single multi-row INSERT. Callers create the
+        action with total_steps already set to the number of its steps.
+        """
+        if not steps_data:
+            return 0
+        try:
+            self.db.execute(insert(Step).values(steps_data))
+            self.db.commit()
+            return len(steps_data)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error creating steps: {str(e)}")
+            raise
+
     def update(self, step_id: str, step_data: Dict[str, Any]) -> Optional[Step]:
         """Update an existing step"""
         try:
@@ -66,6 +107,69 @@ class StepRepository:
             logger.error(f"Error updating step {step_id}: {str(e)}")
             return None
 
+    def update_status(
+        self,
+        step_id: str,
+        status: CommandStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> Optional[ActionStepCounters]:
+        """
+        Update a step status. When the step reaches a final status for the first
+        time, the counters of its action are incremented atomically with it and
+        returned; otherwise None is returned.
+        """
+        from app.data.action.model import Action
+
+        now = datetime.utcnow()
+        try:
+            if status not in FINAL_STEP_STATUSES:
+                self.db.execute(
+                    update(Step)
+                    .where(Step.step_id == step_id)
+                    .values(status=status, result=result, error=error, started_at=now)
+                )
+                self.db.commit()
+                return None
+
+            step_update = (
+                update(Step)
+                .where(Step.step_id == step_id, Step.status.notin_(FINAL_STEP_STATUSES))
+                .values(status=status, result=result, error=error, completed_at=now)
+            )
+            completed = 1 if status == CommandStatus.COMPLETED else 0
+            counter_values = {
+                "completed_steps": Action.completed_steps + completed,
+                "failed_steps": Action.failed_steps + (1 - completed),
+            }
+            counter_columns = (Action.action_id, Action.total_steps, Action.completed_steps, Action.failed_steps)
+
+            if self.db.get_bind().dialect.name == "postgresql":
+                # One statement: WITH s AS (UPDATE steps ... RETURNING action_id) UPDATE actions ...
+                updated_step = step_update.returning(Step.action_id).cte("updated_step")
+                row = self.db.execute(
+                    update(Action)
+                    .where(Action.action_id == updated_step.c.action_id)
+                    .values(**counter_values)
+                    .returning(*counter_columns)
+                ).first()
+            else:
+                row = None
+                if self.db.execute(step_update).rowcount:
+                    action_id = self.db.query(Step.action_id).filter(Step.step_id == step_id).scalar()
+                    row = self.db.execute(
+                        update(Action)
+                        .where(Action.action_id == action_id)
+                        .values(**counter_values)
+                        .returning(*counter_columns)
+                    ).first()
+            self.db.commit()
+            return ActionStepCounters(*row) if row else None
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error updating status of step {step_id}: {str(e)}")
+            raise
+
     def delete(self, step_id: str) -> bool:
         """Delete a step"""
         try:
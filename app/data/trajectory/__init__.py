@@ -0,0 +1,3 @@
+from app.data.trajectory.repository import TrajectoryRepository
+
+__all__ = ["TrajectoryRepository"]
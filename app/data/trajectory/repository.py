@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import logging
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.data.models import TrajectoryChunk
+
+logger = logging.getLogger(__name__)
+
+
+class TrajectoryRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def insert_chunks(self, chunks: List[Dict[str, Any]]) -> int:
+        """Store encoded chunks in a single multi-row INSERT"""
+        if not chunks:
+            return 0
+        try:
+            self.db.execute(insert(TrajectoryChunk).values(chunks))
+            self.db.commit()
+            return len(chunks)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error storing trajectory chunks: {str(e)}")
+            raise
+
+    def get_chunks(self, robot_id: str, start: datetime, end: datetime) -> List[TrajectoryChunk]:
+        """Chunks of a robot overlapping a time window, oldest first"""
+        try:
+            return self.db.query(TrajectoryChunk).filter(
+                TrajectoryChunk.robot_id == robot_id,
+                TrajectoryChunk.start_time <= end,
+                TrajectoryChunk.end_time >= start
+            ).order_by(TrajectoryChunk.start_time).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting trajectory chunks for robot {robot_id}: {str(e)}")
+            raise
+
+    def get_chunk_page(
+        self,
+        robot_id: str,
+        start: datetime,
+        end: datetime,
+        after: Optional[Tuple[datetime, int]],
+        limit: int
+    ) -> List[Any]:
+        """
+        Next chunks of a robot overlapping a time window, ordered by
+        (start_time, id) and resuming after the given key. Rows are plain
+        tuples, so paging through a long window keeps nothing in the session.
+        """
+        try:
+            query = self.db.query(
+                TrajectoryChunk.id, TrajectoryChunk.start_time, TrajectoryChunk.point_count,
+                TrajectoryChunk.scale, TrajectoryChunk.data
+            ).filter(
+                TrajectoryChunk.robot_id == robot_id,
+                TrajectoryChunk.start_time <= end,
+                TrajectoryChunk.end_time >= start
+            )
+            if after is not None:
+                query = query.filter(or_(
+                    TrajectoryChunk.start_time > after[0],
+                    and_(TrajectoryChunk.start_time == after[0], TrajectoryChunk.id > after[1])
+                ))
+            return query.order_by(TrajectoryChunk.start_time, TrajectoryChunk.id).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error paging trajectory chunks for robot {robot_id}: {str(e)}")
+            raise
@@ -0,0 +1,97 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy.engine import Engine
+
+from app.data.notifier import notify, supports_notify
+from app.data.versions import VERSION_EPOCH, EntityKey, entity_versions
+
+logger = logging.getLogger(__name__)
+
+ENTITY_VERSION_CHANNEL = "entity_versions"
+
+# pg_notify rejects payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7000
+
+
+def version_payloads(keys: Iterable[EntityKey]) -> List[Dict[str, Any]]:
+    """Notification payloads carrying keys, each small enough for pg_notify"""
+    payloads: List[Dict[str, Any]] = []
+    batch: List[List[Any]] = []
+    size = 0
+    for key in sorted(keys, key=lambda key: (key[0], key[1] or "")):
+        entry = list(key)
+        entry_size = len(json.dumps(entry)) + len(", ")
+        if batch and size + entry_size > MAX_PAYLOAD_BYTES:
+            payloads.append({"origin": VERSION_EPOCH, "keys": batch})
+            batch, size = [], 0
+        batch.append(entry)
+        size += entry_size
+    if batch:
+        payloads.append({"origin": VERSION_EPOCH, "keys": batch})
+    return payloads
+
+
+def apply_version_notification(payload: Dict[str, Any]) -> None:
+    """Bump the entities another process wrote; this process's own notifications are skipped"""
+    if payload.get("origin") == VERSION_EPOCH:
+        return
+    entity_versions.apply_remote(tuple(key) for key in payload.get("keys") or [])
+
+
+class VersionPublisher(threading.Thread):
+    """
+    Publishes this process's entity version bumps to the other API
+    processes. Bumps are collected for interval seconds and sent together,
+    so a write never waits on the notification.
+    """
+
+    def __init__(self, engine: Engine, interval: float, retry_delay: float = 5.0):
+        super().__init__(name="entity-version-publisher", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self.enabled = supports_notify(engine)
+        self._lock = threading.Lock()
+        self._pending: Set[EntityKey] = set()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+    def publish(self, keys: Iterable[EntityKey]) -> None:
+        """Queue bumped keys for the next notification (an entity_versions listener)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.update(keys)
+        self._wake.set()
+
+    def stop(self):
+        """Send what is queued and stop"""
+        self._stopped.set()
+        self._wake.set()
+
+    def run(self):
+        if not self.enabled:
+            logger.info("Database does not support LISTEN/NOTIFY, entity versions are not shared between processes")
+            return
+
+        while not self._stopped.is_set():
+            self._wake.wait()
+            self._stopped.wait(self.interval)
+            with self._lock:
+                keys, self._pending = self._pending, set()
+                self._wake.clear()
+            if not keys:
+                continue
+            try:
+                with self.engine.begin() as connection:
+                    for payload in version_payloads(keys):
+                        notify(connection, ENTITY_VERSION_CHANNEL, payload)
+            except Exception as e:
+                logger.error(f"Error publishing entity versions: {str(e)}")
+                with self._lock:
+                    self._pending.update(keys)
+                self._wake.set()
+                self._stopped.wait(self.retry_delay)
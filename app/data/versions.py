@@ -0,0 +1,73 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import uuid
+
+# Distinguishes ETags of different processes, whose entity versions are counted independently
+VERSION_EPOCH = uuid.uuid4().hex[:8]
+
+# (kind, id) of a versioned entity; id is None for a collection such as the robot list
+EntityKey = Tuple[str, Optional[str]]
+
+ROBOTS: EntityKey = ("robots", None)
+
+
+class EntityVersions:
+    """
+    Version counters of the entities cached API responses are built from.
+    Repositories bump an entity after every committed write, so a response
+    is unchanged for as long as the versions of its entities are. Counters
+    are per process; listeners forward local bumps to the other processes,
+    which apply them with apply_remote.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[EntityKey, int] = {}
+        self._generation = 0
+        self._listeners: List[Callable[[Tuple[EntityKey, ...]], None]] = []
+
+    def add_listener(self, listener: Callable[[Tuple[EntityKey, ...]], None]) -> None:
+        """Call listener with the keys of every bump made in this process"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def bump(self, *keys: EntityKey) -> None:
+        with self._lock:
+            self._increment(keys)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(keys)
+
+    def apply_remote(self, keys: Iterable[EntityKey]) -> None:
+        """Bump entities written by another process"""
+        with self._lock:
+            self._increment(keys)
+
+    def bump_robot(self, robot_id: str) -> None:
+        """A robot row changed, which also changes the robot list"""
+        self.bump(("robot", robot_id), ROBOTS)
+
+    def bump_components(self, robot_id: str) -> None:
+        self.bump(("components", robot_id))
+
+    def bump_location(self, robot_id: str) -> None:
+        self.bump(("location", robot_id))
+
+    def reset(self) -> None:
+        """Change every entity's version, e.g. after state was loaded wholesale"""
+        with self._lock:
+            self._versions.clear()
+            self._generation += 1
+
+    def tag(self, keys: Iterable[EntityKey]) -> str:
+        """ETag of a response built from the given entities, at their current versions"""
+        with self._lock:
+            versions = [str(self._versions.get(key, 0)) for key in keys]
+            return f"{VERSION_EPOCH}-{self._generation}-{'.'.join(versions)}"
+
+    def _increment(self, keys: Iterable[EntityKey]) -> None:
+        for key in keys:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+
+entity_versions = EntityVersions()
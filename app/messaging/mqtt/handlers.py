@@ -8,11 +8,10 @@ import logging
 from app.data.robot.repository import RobotRepository
 from app.data.component.repository import ComponentRepository
 from app.data.action.repository import ActionRepository
-from app.data.step.repository import StepRepository
+from app.data.step.repository import StepRepository, ActionStepCounters
 from app.data.step.model import Step
 from app.data.models import Alert
 from app.data.enums import (
-    ComponentDiagnosisState,
     ActionStatus,
     CommandStatus,
     StepStatus,
@@ -20,6 +19,12 @@ from app.data.enums import (
     AlertSeverity
 )
 from app.data.database import get_db
+from app.api.alert.service import AlertService
+from app.api.component.status import ComponentStatusService
+from app.api.health.service import RobotHealthService
+from app.api.command.service import CommandService
+from app.api.location.service import LocationService
+from app.api.mission.executor import mission_executor
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +49,7 @@ class MQTTMessageHandler:
     def handle_location_update(self, payload: Dict[str, Any]):
         """
         Handle location update messages from robots
-        Expected payload: {"robot_id": "...", "location": [x, y], "timestamp": "..."}
+        Expected payload: {"robot_id": "...", "location": [x, y], "heading": 90.0, "timestamp": "..."}
         """
         try:
             robot_id = payload.get("robot_id")
@@ -61,9 +66,6 @@ class MQTTMessageHandler:
                         f"[yellow]Invalid timestamp format: {timestamp_str}, using current time instead[/yellow]"
                     )
 
-            if timestamp is None:
-                timestamp = datetime.now()
-
             if not robot_id:
                 rprint("[bold red]Missing robot_id in location update[/bold red]")
                 return
@@ -76,20 +78,12 @@ class MQTTMessageHandler:
                 )
                 return
 
-            # Create a new step entry for this location
-            from app.api.step.model import RobotStep
-            from app.data.step.model import Step
-
-            step = RobotStep(location=(location[0], location[1]), timestamp=timestamp)
-            db_step = Step.from_api_model(step, robot_id)
-
-            if self.step_repo:
-            self.step_repo.create(db_step)
+            latest = LocationService(self.robot_repo.session).record_location(
+                robot_id, location[0], location[1], heading=payload.get("heading"), timestamp=timestamp
+            )
             rprint(
-                f"[green]Updated location for robot {robot_id}: {location} at {timestamp}[/green]"
+                f"[green]Updated location for robot {robot_id}: {location} at {latest.timestamp}[/green]"
             )
-            else:
-                rprint("Step repository not available, skipping location update")
 
         except Exception as e:
             rprint(f"[bold red]Error handling location update: {str(e)}[/bold red]")
@@ -105,6 +99,7 @@ class MQTTMessageHandler:
             }
             
             self.robot_repo.update(robot_id, status_data)
+            RobotHealthService(self.robot_repo.session).heartbeat(robot_id, status_data["health_metrics"])
             logger.info(f"Updated status for robot {robot_id}")
             
         except Exception as e:
@@ -122,16 +117,19 @@ class MQTTMessageHandler:
                 logger.error("No component_id in message")
                 return
 
-            status_data = {
-                "status": message.get("status"),
-                "diagnosis_state": message.get("diagnosis_state", ComponentDiagnosisState.UNKNOWN),
-                "parameters": message.get("parameters", {}),
-                "last_updated": datetime.utcnow()
-            }
+            # Only fields present in the report are compared and written
+            changed = ComponentStatusService(self.robot_repo.session).apply_status(
+                robot_id,
+                component_id,
+                status=message.get("status"),
+                diagnosis_state=message.get("diagnosis_state"),
+                parameters=message.get("parameters"),
+            )
+            if changed is None:
+                logger.warning(f"Robot {robot_id} has no component {component_id}")
+            elif changed:
+                logger.info(f"Updated {', '.join(changed)} of component {component_id}")
 
-            self.component_repo.update(component_id, status_data)
-            logger.info(f"Updated status for component {component_id}")
-            
         except Exception as e:
             logger.error(f"Error handling component status: {str(e)}")
 
@@ -168,15 +166,21 @@ class MQTTMessageHandler:
                 logger.error("No step_id in message")
                 return
 
-            status_data = {
-                "status": message.get("status", CommandStatus.PENDING),
-                "result": message.get("result"),
-                "error": message.get("error"),
-                "completed_at": datetime.utcnow() if message.get("status") == CommandStatus.COMPLETED else None
-            }
+            # Steps of a running mission are persisted and advanced by the executor
+            if mission_executor.on_step_status(
+                step_id, message.get("status"), message.get("result"), message.get("error")
+            ):
+                return
 
-            self.step_repo.update(step_id, status_data)
+            counters = self.step_repo.update_status(
+                step_id,
+                CommandService.normalize_status(message.get("status", CommandStatus.PENDING.value)),
+                message.get("result"),
+                message.get("error")
+            )
             logger.info(f"Updated status for step {step_id}")
+            if counters:
+                self._check_action_completion(counters)
             
         except Exception as e:
             logger.error(f"Error handling step status: {str(e)}")
@@ -265,15 +269,13 @@ class MQTTMessageHandler:
                 logger.error("Command result message missing command_id")
                 return
 
-            # Update command status
-            with get_db() as db:
-                self.action_repo.update_command_status(
-                    db,
-                    command_id,
-                    message.get("status"),
-                    message.get("result"),
-                    message.get("error"),
-                )
+            # Store the result and wake any caller awaiting this command
+            CommandService(self.robot_repo.session).record_result(
+                command_id=command_id,
+                status=message.get("status"),
+                result=message.get("result"),
+                error=message.get("error"),
+            )
 
         except Exception as e:
             logger.error(f"Error handling command result: {str(e)}")
@@ -288,16 +290,14 @@ class MQTTMessageHandler:
                 logger.error("Alert message missing robot_id")
                 return
 
-            # Store alert
-            with get_db() as db:
-                self.robot_repo.add_alert(
-                    db,
-                    robot_id,
-                    message.get("alert_type"),
-                    message.get("message"),
-                    message.get("severity"),
-                    message.get("data", {}),
-                )
+            # Store alert, folding repeats into the open one
+            AlertService(self.robot_repo.session).record(Alert(
+                robot_id=robot_id,
+                type=message.get("alert_type") or AlertType.OTHER.value,
+                severity=message.get("severity") or AlertSeverity.LOW.value,
+                message=message.get("message"),
+                details=message.get("data", {}),
+            ))
 
         except Exception as e:
             logger.error(f"Error handling alert: {str(e)}")
@@ -313,26 +313,23 @@ class MQTTMessageHandler:
                 logger.error("Missing required fields in step completion message")
                 return
 
-            # Get the step from database
-            db_step = self.step_repo.get_by_id(step_id)
-            if not db_step:
-                logger.error(f"Step {step_id} not found")
+            # Steps of a running mission are persisted and advanced by the executor
+            if mission_executor.on_step_status(step_id, status, result, message.get("error")):
+                return
+
+            # Update the step and its action counters in one statement
+            status = CommandService.normalize_status(status)
+            counters = self.step_repo.update_status(step_id, status, result, message.get("error"))
+            if not counters:
+                logger.info(f"Step {step_id} not found or already finished")
                 return
 
-            # Update step status
-            db_step.status = status
-            db_step.result = result
-            db_step.completed_at = datetime.utcnow()
-            
-            # Save changes
-            self.step_repo.update(db_step)
-            
             # If step failed, create alert
-            if status == StepStatus.FAILED.value:
-                self._create_step_failure_alert(db_step, result)
-            
-            # Check if all steps are completed
-            self._check_action_completion(db_step.action_id)
+            if status == CommandStatus.FAILED:
+                self._create_step_failure_alert(self.step_repo.get_by_id(step_id), result)
+
+            # Derive action completion from the counters
+            self._check_action_completion(counters)
 
         except Exception as e:
             logger.error(f"Error handling step completion: {str(e)}")
@@ -350,32 +347,27 @@ class MQTTMessageHandler:
                     "step_id": step.id,
                     "action_id": step.action_id,
                     "error": result.get("error"),
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": datetime.utcnow().isoformat(),
+                    # Retries of a step failing the same way are one alert
+                    "dedup_key": f"step:{step.id}:{result.get('error')}"
                 }
             )
-            self.alert_repo.create(alert)
+            AlertService(self.robot_repo.session).record(alert)
         except Exception as e:
             logger.error(f"Error creating step failure alert: {str(e)}")
             raise
 
-    def _check_action_completion(self, action_id: str) -> None:
-        """Check if all steps in an action are completed."""
+    def _check_action_completion(self, counters: ActionStepCounters) -> None:
+        """Finish the action once its counters show every step is done."""
         try:
-            # Get all steps for this action
-            steps = self.step_repo.get_by_action_id(action_id)
-            if not steps:
-                logger.warning(f"No steps found for action {action_id}")
+            if not counters.finished:
                 return
-                
-            # Check if all steps are completed
-            all_completed = all(step.status == StepStatus.COMPLETED.value for step in steps)
-            if all_completed:
-                # Update action status
-                self.action_repo.update(action_id, {
-                    "status": ActionStatus.COMPLETED.value,
-                    "completed_at": datetime.utcnow()
-                })
-                logger.info(f"Action {action_id} completed successfully")
+            status = self.action_repo.finish_if_done(counters.action_id)
+            if status:
+                logger.info(
+                    f"Action {counters.action_id} {status.value}: "
+                    f"{counters.completed_steps}/{counters.total_steps} steps completed"
+                )
 
         except Exception as e:
             logger.error(f"Error checking action completion: {str(e)}")
@@ -6,6 +6,8 @@ from rich import print as rprint
 from app.data.robot.repository import RobotRepository
 from app.data.action.repository import ActionRepository
 from app.data.action.model import ActionStatus
+from app.api.command.service import CommandService
+from app.api.telemetry.service import TelemetryRuleService
 
 
 class RabbitMQMessageHandler:
@@ -17,6 +19,7 @@ class RabbitMQMessageHandler:
         self.db_session = db_session
         self.robot_repo = RobotRepository(db_session)
         self.action_repo = ActionRepository(db_session)
+        self.command_service = CommandService(db_session)
 
     def handle_command_response(self, payload: Dict[str, Any]):
         """
@@ -46,6 +49,14 @@ class RabbitMQMessageHandler:
             )
             rprint(f"[blue]Message: {message}[/blue]")
 
+            # Store the result and wake any caller awaiting this command
+            self.command_service.record_result(
+                command_id=command_id,
+                status=status,
+                result=payload.get("data"),
+                error=message if status != "SUCCESS" else None
+            )
+
             # If the command was related to an action, update the action status
             action = self.action_repo.get_by_id(command_id)
             if action:
@@ -79,7 +90,7 @@ class RabbitMQMessageHandler:
         }
         """
         # This would store telemetry data in a time-series database like InfluxDB
-        # For now, we'll just log it
+        # For now, we'll just log it and run the telemetry rules on it
         try:
             robot_id = payload.get("robot_id")
             timestamp = payload.get("timestamp")
@@ -92,5 +103,13 @@ class RabbitMQMessageHandler:
             rprint(f"[green]Received telemetry data from robot {robot_id}[/green]")
             rprint(f"[blue]Data: {data}[/blue]")
 
+            try:
+                recorded_at = datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
+            except ValueError:
+                recorded_at = datetime.utcnow()
+            alerts = TelemetryRuleService(self.db_session).evaluate(robot_id, [(recorded_at, data)])
+            for alert in alerts:
+                rprint(f"[yellow]Telemetry alert for robot {robot_id}: {alert.message}[/yellow]")
+
         except Exception as e:
             rprint(f"[bold red]Error handling telemetry data: {str(e)}[/bold red]")
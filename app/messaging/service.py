@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
 from paho.mqtt.client import Client
 from app.config import Config
@@ -74,10 +75,36 @@ class MessagingService:
     def publish(self, topic: str, payload: str, qos: int = 0):
         """Publish a message to a topic"""
         try:
-            result = self.client.publish(topic, payload, qos=qos)
+            result = self.client.publish(topic, self._encode(payload), qos=qos)
             if result.rc != 0:
                 logger.error(f"Failed to publish message to {topic}: {result.rc}")
             else:
                 logger.debug(f"Published message to {topic}: {payload}")
         except Exception as e:
             logger.error(f"Error publishing message: {str(e)}")
+
+    def publish_many(self, messages: List[Tuple[str, Any]], qos: int = 0) -> int:
+        """
+        Publish a batch of messages without waiting between them.
+        The network loop drains the outgoing queue, so the whole batch is pipelined.
+        Returns the number of messages queued successfully.
+        """
+        queued = 0
+        for topic, payload in messages:
+            try:
+                result = self.client.publish(topic, self._encode(payload), qos=qos)
+                if result.rc != 0:
+                    logger.error(f"Failed to publish message to {topic}: {result.rc}")
+                else:
+                    queued += 1
+            except Exception as e:
+                logger.error(f"Error publishing message to {topic}: {str(e)}")
+        logger.debug(f"Published {queued}/{len(messages)} messages")
+        return queued
+
+    @staticmethod
+    def _encode(payload: Any) -> str:
+        """Serialize dict/list payloads to JSON"""
+        if isinstance(payload, (dict, list)):
+            return json.dumps(payload, default=str)
+        return payload
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional, Sequence, Tuple
+import threading
+from flask import Response, make_response, request
+from http import HTTPStatus
+
+from app.config import Config
+from app.data.versions import EntityKey, entity_versions
+
+# (etag, body, mimetype) of a cached response
+CachedResponse = Tuple[str, bytes, str]
+
+
+class ResponseCache:
+    """LRU of serialized GET responses, each valid only for the ETag it was built under"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+
+    def get(self, key: tuple, etag: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(Config.RESPONSE_CACHE_SIZE)
+
+
+def _tagged(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate it on every poll
+    response.cache_control.no_cache = True
+    return response
+
+
+def cached_response(entities: Callable[..., Sequence[EntityKey]]):
+    """
+    Serve a GET route conditionally. Its ETag is made from the versions of
+    the entities its response is built from (entities is called with the
+    route's arguments), so a client presenting the current ETag gets 304
+    and an unchanged body is served from the cache, neither touching the
+    database. Successful responses are cached per route and query string.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Taken before the view reads, so a cached body is never older than its ETag
+            etag = entity_versions.tag(entities(**kwargs))
+            if request.if_none_match.contains(etag):
+                return _tagged(Response(status=HTTPStatus.NOT_MODIFIED), etag)
+
+            key = (request.endpoint, tuple(sorted(kwargs.items())), tuple(sorted(request.args.items(multi=True))))
+            entry = response_cache.get(key, etag)
+            if entry is not None:
+                return _tagged(Response(entry[1], mimetype=entry[2]), etag)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != HTTPStatus.OK:
+                return response
+            response_cache.put(key, (etag, response.get_data(), response.mimetype))
+            return _tagged(response, etag)
+        return wrapper
+    return decorator
@@ -5,6 +5,9 @@ from app.router.robot import robot_router
 from app.router.component import component_router
 from app.router.location import location_router
 from app.router.command import command_router
+from app.router.mission import mission_router
+from app.router.geofence import geofence_router
+from app.router.coverage import coverage_router
 
 __all__ = [
     "health_router",
@@ -12,4 +15,7 @@ __all__ = [
     "component_router",
     "location_router",
     "command_router",
+    "mission_router",
+    "geofence_router",
+    "coverage_router",
 ]
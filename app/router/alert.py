@@ -0,0 +1,224 @@
+"""Alert routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.data.enums import AlertSeverity, AlertStatus, AlertType
+from app.api.alert.service import AlertService
+from app.router.location import parse_timestamp
+
+alert_router = Blueprint("alert", __name__, url_prefix="/api/alerts")
+
+
+@alert_router.route("/active", methods=["GET"])
+def list_active_alerts():
+    """
+    List unresolved alerts
+    ---
+    tags:
+      - Alerts
+    parameters:
+      - name: severity
+        in: query
+        schema:
+          type: string
+          enum: [info, low, medium, high, critical]
+      - name: status
+        in: query
+        schema:
+          type: string
+          enum: [open, acknowledged]
+      - name: limit
+        in: query
+        schema:
+          type: integer
+    responses:
+      200:
+        description: Counts per severity and the active alerts, most severe and latest first
+      400:
+        description: Invalid filter
+    """
+    try:
+        severity = request.args.get("severity")
+        severity = AlertSeverity(severity) if severity else None
+        status = request.args.get("status")
+        status = AlertStatus(status) if status else None
+        limit = request.args.get("limit", type=int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    with SessionLocal() as db:
+        service = AlertService(db)
+        return jsonify({
+            "counts": service.active_counts(),
+            "alerts": service.list_active(severity, status, limit),
+        }), HTTPStatus.OK
+
+
+@alert_router.route("/active/counts", methods=["GET"])
+def count_active_alerts():
+    """
+    Count unresolved alerts
+    ---
+    tags:
+      - Alerts
+    responses:
+      200:
+        description: Open, acknowledged and total unresolved alerts per severity
+    """
+    with SessionLocal() as db:
+        return jsonify(AlertService(db).active_counts()), HTTPStatus.OK
+
+
+@alert_router.route("/search", methods=["GET"])
+def search_alerts():
+    """
+    Search alert history
+    ---
+    tags:
+      - Alerts
+    parameters:
+      - name: q
+        in: query
+        description: Words that must all appear in the message or details, as word prefixes
+        schema:
+          type: string
+      - name: robot_id
+        in: query
+        schema:
+          type: string
+      - name: severity
+        in: query
+        schema:
+          type: string
+      - name: type
+        in: query
+        schema:
+          type: string
+      - name: since
+        in: query
+        schema:
+          type: string
+          format: date-time
+      - name: until
+        in: query
+        schema:
+          type: string
+          format: date-time
+      - name: cursor
+        in: query
+        description: next_cursor of the previous page
+        schema:
+          type: string
+      - name: limit
+        in: query
+        schema:
+          type: integer
+    responses:
+      200:
+        description: Matching alerts, newest first, and the cursor of the next page
+      400:
+        description: Invalid filter or cursor
+    """
+    try:
+        severity = request.args.get("severity")
+        alert_type = request.args.get("type")
+        with SessionLocal() as db:
+            alerts, next_cursor = AlertService(db).search(
+                query=request.args.get("q"),
+                robot_id=request.args.get("robot_id"),
+                severity=AlertSeverity(severity) if severity else None,
+                alert_type=AlertType(alert_type) if alert_type else None,
+                since=parse_timestamp(request.args.get("since")),
+                until=parse_timestamp(request.args.get("until")),
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit", type=int),
+            )
+            return jsonify({
+                "alerts": [alert.to_dict() for alert in alerts],
+                "next_cursor": next_cursor,
+            }), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error searching alerts: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@alert_router.route("/<int:alert_id>/acknowledge", methods=["POST"])
+def acknowledge_alert(alert_id: int):
+    """
+    Acknowledge an open alert
+    ---
+    tags:
+      - Alerts
+    parameters:
+      - name: alert_id
+        in: path
+        schema:
+          type: integer
+        required: true
+    requestBody:
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              by:
+                type: string
+    responses:
+      200:
+        description: Alert acknowledged
+      404:
+        description: Alert not found
+      409:
+        description: Alert is not open
+    """
+    return _transition(alert_id, AlertService.acknowledge, "acknowledging")
+
+
+@alert_router.route("/<int:alert_id>/resolve", methods=["POST"])
+def resolve_alert(alert_id: int):
+    """
+    Resolve an alert
+    ---
+    tags:
+      - Alerts
+    parameters:
+      - name: alert_id
+        in: path
+        schema:
+          type: integer
+        required: true
+    requestBody:
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              by:
+                type: string
+    responses:
+      200:
+        description: Alert resolved
+      404:
+        description: Alert not found
+      409:
+        description: Alert is already resolved
+    """
+    return _transition(alert_id, AlertService.resolve, "resolving")
+
+
+def _transition(alert_id: int, action, verb: str):
+    by = (request.get_json(silent=True) or {}).get("by")
+    try:
+        with SessionLocal() as db:
+            alert = action(AlertService(db), alert_id, by)
+            if alert is None:
+                return jsonify({"error": "Alert not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(alert.to_dict()), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.CONFLICT
+    except Exception as e:
+        current_app.logger.error(f"Error {verb} alert {alert_id}: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
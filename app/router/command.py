@@ -1,6 +1,8 @@
 """Robot command routes."""
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, request, current_app, Response, stream_with_context
+import json
+import time
 import uuid
 from datetime import datetime
 from app.data.database import SessionLocal
@@ -9,11 +11,15 @@ from http import HTTPStatus
 from flasgger import swag_from
 
 from app.api.command.service import CommandService
+from app.api.command.correlation import TERMINAL_COMMAND_STATUSES
+from app.api.command.parameters import command_parameter_registry
+from app.config import Config
 from app.data.command.repository import CommandRepository
 from app.data.command.dto import (
     CommandCreateDTO,
     CommandUpdateDTO,
-    CommandStatusUpdateDTO
+    CommandStatusUpdateDTO,
+    CommandBroadcastDTO
 )
 from app.data.enums import CommandStatus, CommandType
 
@@ -83,11 +89,18 @@ def send_robot_command(robot_id: str):
         if not robot:
             return jsonify({"error": "Robot not found"}), 404
 
+        # Reject malformed commands before they reach the robot
+        try:
+            command_type = CommandType(command_data.get("command_type"))
+            parameters = command_parameter_registry.validate(command_type, command_data.get("parameters", {}))
+        except (ValueError, AttributeError) as e:
+            return jsonify({"error": str(e) or "Invalid command type"}), 400
+
         # Send command
         command = {
             "command_id": command_data.get("command_id", str(uuid.uuid4())),
-            "command_type": command_data.get("command_type"),
-            "parameters": command_data.get("parameters", {}),
+            "command_type": command_type.value,
+            "parameters": parameters,
             "timestamp": datetime.now().isoformat(),
         }
 
@@ -110,13 +123,24 @@ def get_command_service():
     finally:
         db.close()
 
+def get_wait_timeout() -> Optional[float]:
+    """Read the ?wait=<seconds> query argument, capped at the configured maximum"""
+    wait = request.args.get("wait", type=float)
+    if not wait or wait <= 0:
+        return None
+    return min(wait, Config.COMMAND_WAIT_MAX_SECONDS)
+
 @command_router.route("/<command_id>", methods=["GET"])
 def get_command(command_id: str):
-    """Get a command by ID"""
+    """Get a command by ID, optionally waiting up to ?wait=<seconds> for it to finish"""
     try:
+        wait = get_wait_timeout()
         with SessionLocal() as db:
             service = CommandService(db)
-            command = service.get_command(command_id)
+            if wait:
+                command = service.await_result(command_id, wait)
+            else:
+                command = service.get_command(command_id)
             if not command:
                 return jsonify({"error": "Command not found"}), HTTPStatus.NOT_FOUND
             return jsonify(command.dict()), HTTPStatus.OK
@@ -138,15 +162,40 @@ def get_pending_commands(robot_id: str):
 
 @command_router.route("/", methods=["POST"])
 def create_command():
-    """Create a new command"""
+    """
+    Create a new command
+    ---
+    tags:
+      - Commands
+    parameters:
+      - name: wait
+        in: query
+        type: number
+        required: false
+        description: Seconds to wait for the command result before responding
+    responses:
+      201:
+        description: Command created (and finished, when waiting)
+      202:
+        description: Command created but still running after the wait expired
+    """
     try:
         data = request.get_json()
         command_data = CommandCreateDTO(**data)
-        
+        wait = get_wait_timeout()
+
         with SessionLocal() as db:
             service = CommandService(db)
             command = service.create_command(command_data)
+            if wait:
+                command = service.await_result(command.command_id, wait)
+                if not command:
+                    return jsonify({"error": "Command was deleted while waiting for its result"}), HTTPStatus.NOT_FOUND
+                if command.status not in TERMINAL_COMMAND_STATUSES:
+                    return jsonify(command.dict()), HTTPStatus.ACCEPTED
             return jsonify(command.dict()), HTTPStatus.CREATED
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
     except Exception as e:
         current_app.logger.error(f"Error creating command: {str(e)}")
         return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -197,3 +246,134 @@ def delete_command(command_id: str):
     except Exception as e:
         current_app.logger.error(f"Error deleting command: {str(e)}")
         return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@command_router.route("/broadcast", methods=["POST"])
+def broadcast_command():
+    """
+    Send one command to every robot matching a selector
+    ---
+    tags:
+      - Commands
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              selector:
+                type: object
+                properties:
+                  robot_ids:
+                    type: array
+                    items:
+                      type: string
+                  status:
+                    type: string
+                  capability:
+                    type: string
+              command_type:
+                type: string
+              parameters:
+                type: object
+    responses:
+      202:
+        description: Commands created and published, returns the batch
+      400:
+        description: Invalid input
+    """
+    try:
+        broadcast_data = CommandBroadcastDTO(**(request.get_json() or {}))
+
+        with SessionLocal() as db:
+            service = CommandService(db)
+            service.set_messaging_service(messaging_service)
+            batch = service.broadcast_command(broadcast_data)
+            return jsonify(batch.dict()), HTTPStatus.ACCEPTED
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error broadcasting command: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@command_router.route("/batches/<batch_id>", methods=["GET"])
+def get_command_batch(batch_id: str):
+    """
+    Get the aggregate and per-robot status of a broadcast batch
+    ---
+    tags:
+      - Commands
+    parameters:
+      - name: batch_id
+        in: path
+        type: string
+        required: true
+      - name: summary
+        in: query
+        type: boolean
+        required: false
+        description: Only return the status counts
+    responses:
+      200:
+        description: Batch status
+      404:
+        description: Batch not found
+    """
+    try:
+        include_commands = request.args.get("summary", "false").lower() != "true"
+        with SessionLocal() as db:
+            service = CommandService(db)
+            batch = service.get_batch(batch_id, include_commands=include_commands)
+            if not batch:
+                return jsonify({"error": "Batch not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(batch.dict()), HTTPStatus.OK
+    except Exception as e:
+        current_app.logger.error(f"Error getting command batch: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@command_router.route("/batches/<batch_id>/stream", methods=["GET"])
+def stream_command_batch(batch_id: str):
+    """
+    Stream the status counts of a broadcast batch as NDJSON until every command finished
+    ---
+    tags:
+      - Commands
+    parameters:
+      - name: batch_id
+        in: path
+        type: string
+        required: true
+      - name: interval
+        in: query
+        type: number
+        required: false
+        description: Seconds between status checks (default 1)
+      - name: timeout
+        in: query
+        type: number
+        required: false
+        description: Seconds before the stream is closed (default 300)
+    responses:
+      200:
+        description: One JSON object per line, emitted whenever the counts change
+    """
+    interval = max(request.args.get("interval", 1.0, type=float), 0.1)
+    timeout = request.args.get("timeout", 300.0, type=float)
+
+    def generate():
+        deadline = time.monotonic() + timeout
+        last_counts = None
+        while True:
+            with SessionLocal() as db:
+                batch = CommandService(db).get_batch(batch_id, include_commands=False)
+            if not batch:
+                yield json.dumps({"error": "Batch not found"}) + "\n"
+                return
+            if batch.status_counts != last_counts:
+                last_counts = batch.status_counts
+                yield json.dumps(batch.dict(exclude={"commands"}), default=str) + "\n"
+            if batch.finished or time.monotonic() >= deadline:
+                return
+            time.sleep(interval)
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
@@ -4,7 +4,10 @@ from flask import Blueprint, jsonify, request
 from app.data.database import SessionLocal
 from app.api.robot.service import RobotService
 from app.api.component.service import ComponentService
+from app.api.component.status import ComponentStatusService
 from app.data.component.model import ComponentDiagnosisState
+from app.router.location import parse_timestamp
+from app.middleware.response_cache import cached_response
 
 component_router = Blueprint("component", __name__)
 
@@ -90,6 +93,7 @@ def update_component_status(robot_id: str, component_uuid: str):
 
 
 @component_router.route("/robots/<robot_id>/components", methods=["GET"])
+@cached_response(lambda robot_id: [("robot", robot_id), ("components", robot_id)])
 def list_components(robot_id):
     """
     List components for a robot
@@ -275,3 +279,52 @@ def delete_component(robot_id: str, component_uuid: str):
         return jsonify({"error": f"Error deleting component: {str(e)}"}), 400
     finally:
         db.close()
+
+
+@component_router.route(
+    "/robots/<robot_id>/components/<component_id>/history", methods=["GET"]
+)
+def get_component_history(robot_id: str, component_id: str):
+    """
+    Get a component's status and diagnosis transitions
+    ---
+    parameters:
+      - name: robot_id
+        in: path
+        type: string
+        required: true
+        description: ID of the robot
+      - name: component_id
+        in: path
+        type: string
+        required: true
+        description: ID of the component
+      - name: start
+        in: query
+        type: string
+        format: date-time
+        description: Only transitions at or after this time
+      - name: end
+        in: query
+        type: string
+        format: date-time
+        description: Only transitions before this time
+    responses:
+      200:
+        description: Transitions of the component, oldest first
+      400:
+        description: Invalid parameters
+    """
+    db = SessionLocal()
+    try:
+        history = ComponentStatusService(db).get_history(
+            component_id,
+            since=parse_timestamp(request.args.get("start")),
+            until=parse_timestamp(request.args.get("end")),
+        )
+        history = [entry for entry in history if entry["robot_id"] == robot_id]
+        return jsonify({"component_id": component_id, "history": history}), 200
+    except Exception as e:
+        return jsonify({"error": f"Error fetching component history: {str(e)}"}), 400
+    finally:
+        db.close()
@@ -0,0 +1,137 @@
+"""Field coverage routes."""
+
+from flask import Blueprint, jsonify, request, Response
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.api.coverage.service import CoverageService
+
+coverage_router = Blueprint("coverage", __name__, url_prefix="/api/coverage")
+
+
+@coverage_router.route("/<geofence_id>", methods=["GET"])
+def get_coverage(geofence_id: str):
+    """
+    Get the coverage of a field
+    ---
+    tags:
+      - Coverage
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+        description: ID of a field geofence
+    responses:
+      200:
+        description: Coverage percentage and areas
+      404:
+        description: Field not found
+    """
+    with SessionLocal() as db:
+        coverage = CoverageService(db).get_coverage(geofence_id)
+    if coverage is None:
+        return jsonify({"error": "Field not found"}), HTTPStatus.NOT_FOUND
+    return jsonify(coverage), HTTPStatus.OK
+
+
+@coverage_router.route("/<geofence_id>/geojson", methods=["GET"])
+def get_coverage_geojson(geofence_id: str):
+    """
+    Get the covered area of a field as GeoJSON
+    ---
+    tags:
+      - Coverage
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: max_cells
+        in: query
+        schema:
+          type: integer
+          default: 40000
+        description: Upper bound on raster cells, the grid is downsampled above it
+    responses:
+      200:
+        description: GeoJSON Feature with a MultiPolygon of covered cells
+      404:
+        description: Field not found
+    """
+    max_cells = max(1, request.args.get("max_cells", default=40000, type=int))
+    with SessionLocal() as db:
+        feature = CoverageService(db).covered_geojson(geofence_id, max_cells)
+    if feature is None:
+        return jsonify({"error": "Field not found"}), HTTPStatus.NOT_FOUND
+    return jsonify(feature), HTTPStatus.OK
+
+
+@coverage_router.route("/<geofence_id>/tiles/<int:z>/<int:x>/<int:y>.png", methods=["GET"])
+def get_coverage_tile(geofence_id: str, z: int, x: int, y: int):
+    """
+    Get a PNG map tile of a field's coverage
+    ---
+    tags:
+      - Coverage
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: z
+        in: path
+        schema:
+          type: integer
+        required: true
+      - name: x
+        in: path
+        schema:
+          type: integer
+        required: true
+      - name: y
+        in: path
+        schema:
+          type: integer
+        required: true
+    responses:
+      200:
+        description: 256x256 RGBA PNG, covered cells in green
+      404:
+        description: Field or tile not found
+    """
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({"error": "Tile not found"}), HTTPStatus.NOT_FOUND
+    with SessionLocal() as db:
+        tile = CoverageService(db).render_tile(geofence_id, z, x, y)
+    if tile is None:
+        return jsonify({"error": "Field not found"}), HTTPStatus.NOT_FOUND
+    return Response(tile, mimetype="image/png")
+
+
+@coverage_router.route("/<geofence_id>/reset", methods=["POST"])
+def reset_coverage(geofence_id: str):
+    """
+    Clear the coverage of a field
+    ---
+    tags:
+      - Coverage
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+    responses:
+      200:
+        description: Coverage cleared
+      404:
+        description: Field not found
+    """
+    with SessionLocal() as db:
+        if not CoverageService(db).reset(geofence_id):
+            return jsonify({"error": "Field not found"}), HTTPStatus.NOT_FOUND
+    return jsonify({"message": "Coverage reset"}), HTTPStatus.OK
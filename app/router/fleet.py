@@ -0,0 +1,151 @@
+"""Fleet snapshot and health routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.api.fleet.service import FleetSnapshotService, parse_fields
+from app.api.health.service import RobotHealthService
+
+fleet_router = Blueprint("fleet", __name__, url_prefix="/api/fleet")
+
+
+@fleet_router.route("/snapshot", methods=["GET"])
+def get_fleet_snapshot():
+    """
+    Get robots with their health score, components, location, latest telemetry, open alerts and running mission
+    ---
+    tags:
+      - Fleet
+    parameters:
+      - name: robot_id
+        in: query
+        description: Comma separated robot IDs; the whole fleet if omitted
+        schema:
+          type: string
+      - name: fields
+        in: query
+        description: >
+          Comma separated fields to return besides robot_id: name, ip_address, port, version,
+          software_version, capabilities, status, last_seen, health_metrics, health_score, metadata,
+          components, location, telemetry, alerts, mission. All of them if omitted
+        schema:
+          type: string
+    responses:
+      200:
+        description: One snapshot per robot, ordered by robot ID
+      400:
+        description: Unknown field
+    """
+    try:
+        fields = parse_fields(request.args.get("fields"))
+        robot_ids = request.args.get("robot_id")
+        robot_ids = [robot_id for robot_id in robot_ids.split(",") if robot_id] if robot_ids else None
+        with SessionLocal() as db:
+            robots = FleetSnapshotService(db).snapshot(robot_ids, fields)
+        return jsonify({"robots": robots, "count": len(robots)}), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error building fleet snapshot: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@fleet_router.route("/snapshot/<robot_id>", methods=["GET"])
+def get_robot_snapshot(robot_id: str):
+    """
+    Get one robot with its health score, components, location, latest telemetry, open alerts and running mission
+    ---
+    tags:
+      - Fleet
+    parameters:
+      - name: robot_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: fields
+        in: query
+        description: Comma separated fields, as for the fleet snapshot
+        schema:
+          type: string
+    responses:
+      200:
+        description: The robot's snapshot
+      400:
+        description: Unknown field
+      404:
+        description: Robot not found
+    """
+    try:
+        fields = parse_fields(request.args.get("fields"))
+        with SessionLocal() as db:
+            robots = FleetSnapshotService(db).snapshot([robot_id], fields)
+        if not robots:
+            return jsonify({"error": "Robot not found"}), HTTPStatus.NOT_FOUND
+        return jsonify(robots[0]), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error building snapshot of robot {robot_id}: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@fleet_router.route("/health", methods=["GET"])
+def list_robots_by_health():
+    """
+    List robots by health score, worst first
+    ---
+    tags:
+      - Fleet
+    parameters:
+      - name: order
+        in: query
+        schema:
+          type: string
+          enum: [worst, best]
+      - name: min_score
+        in: query
+        schema:
+          type: number
+      - name: max_score
+        in: query
+        schema:
+          type: number
+      - name: status
+        in: query
+        schema:
+          type: string
+      - name: cursor
+        in: query
+        schema:
+          type: string
+      - name: limit
+        in: query
+        schema:
+          type: integer
+    responses:
+      200:
+        description: Robots with their health score and its factors, and the cursor of the next page
+      400:
+        description: Invalid parameters
+    """
+    try:
+        order = request.args.get("order", "worst")
+        if order not in ("worst", "best"):
+            raise ValueError("order must be worst or best")
+        with SessionLocal() as db:
+            robots, next_cursor = RobotHealthService(db).list_robots(
+                descending=order == "best",
+                min_score=request.args.get("min_score", type=float),
+                max_score=request.args.get("max_score", type=float),
+                status=request.args.get("status"),
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit", type=int),
+            )
+        return jsonify({"robots": robots, "next_cursor": next_cursor}), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error listing robots by health: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
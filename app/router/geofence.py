@@ -0,0 +1,163 @@
+"""Geofence routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.api.geofence.dto import GeofenceCreate, GeofenceUpdate
+from app.api.geofence.service import GeofenceService
+
+geofence_router = Blueprint("geofence", __name__, url_prefix="/api/geofences")
+
+
+@geofence_router.route("/", methods=["GET"])
+def list_geofences():
+    """
+    List geofences
+    ---
+    tags:
+      - Geofences
+    responses:
+      200:
+        description: All field boundaries and exclusion zones
+    """
+    with SessionLocal() as db:
+        geofences = GeofenceService(db).list_geofences()
+        return jsonify([geofence.to_dict() for geofence in geofences]), HTTPStatus.OK
+
+
+@geofence_router.route("/", methods=["POST"])
+def create_geofence():
+    """
+    Create a geofence
+    ---
+    tags:
+      - Geofences
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              name:
+                type: string
+              fence_type:
+                type: string
+                enum: [field, exclusion]
+              polygon:
+                type: array
+                items:
+                  type: array
+                  items:
+                    type: number
+              active:
+                type: boolean
+    responses:
+      201:
+        description: Geofence created
+      400:
+        description: Invalid geofence
+    """
+    try:
+        geofence_data = GeofenceCreate(**(request.get_json() or {}))
+        with SessionLocal() as db:
+            geofence = GeofenceService(db).create_geofence(geofence_data)
+            return jsonify(geofence.to_dict()), HTTPStatus.CREATED
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error creating geofence: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@geofence_router.route("/<geofence_id>", methods=["GET"])
+def get_geofence(geofence_id: str):
+    """
+    Get a geofence
+    ---
+    tags:
+      - Geofences
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+    responses:
+      200:
+        description: Geofence
+      404:
+        description: Geofence not found
+    """
+    with SessionLocal() as db:
+        geofence = GeofenceService(db).get_geofence(geofence_id)
+        if not geofence:
+            return jsonify({"error": "Geofence not found"}), HTTPStatus.NOT_FOUND
+        return jsonify(geofence.to_dict()), HTTPStatus.OK
+
+
+@geofence_router.route("/<geofence_id>", methods=["PUT"])
+def update_geofence(geofence_id: str):
+    """
+    Update a geofence
+    ---
+    tags:
+      - Geofences
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+    responses:
+      200:
+        description: Geofence updated
+      400:
+        description: Invalid geofence
+      404:
+        description: Geofence not found
+    """
+    try:
+        geofence_data = GeofenceUpdate(**(request.get_json() or {}))
+        with SessionLocal() as db:
+            geofence = GeofenceService(db).update_geofence(geofence_id, geofence_data)
+            if not geofence:
+                return jsonify({"error": "Geofence not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(geofence.to_dict()), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error updating geofence: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@geofence_router.route("/<geofence_id>", methods=["DELETE"])
+def delete_geofence(geofence_id: str):
+    """
+    Delete a geofence
+    ---
+    tags:
+      - Geofences
+    parameters:
+      - name: geofence_id
+        in: path
+        schema:
+          type: string
+        required: true
+    responses:
+      200:
+        description: Geofence deleted
+      404:
+        description: Geofence not found
+    """
+    with SessionLocal() as db:
+        if not GeofenceService(db).delete_geofence(geofence_id):
+            return jsonify({"error": "Geofence not found"}), HTTPStatus.NOT_FOUND
+        return jsonify({"message": "Geofence deleted"}), HTTPStatus.OK
@@ -1,15 +1,34 @@
 """Robot location routes."""
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response
+from datetime import datetime, timedelta, timezone
+from typing import List, Mapping, Optional, Tuple
+import json
 from app.data.database import SessionLocal
+from app.api.location.batch import LocationBatch
+from app.api.location.service import LocationService
+from app.config import Config
+from app.middleware.response_cache import cached_response
 from app.api.robot.service import RobotService
-from app.api.step.model import RobotStep
-from app.api.step.service import StepService
+from app.api.trajectory.playback import PlaybackService
+from app.api.trajectory.service import TrajectoryService
+from app.api.trajectory.simplify import SIMPLIFY_ALGORITHMS, tolerance_for_zoom
 
 location_router = Blueprint("location", __name__)
 
 
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp query parameter as naive UTC"""
+    if not value:
+        return None
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
 @location_router.route("/robots/<robot_id>/location", methods=["GET"])
+@cached_response(lambda robot_id: [("robot", robot_id), ("location", robot_id)])
 def get_robot_location(robot_id: str):
     """
     Get the latest location of a robot
@@ -37,25 +56,22 @@ def get_robot_location(robot_id: str):
                   type: array
                   items:
                     type: number
+                heading:
+                  type: number
+                timestamp:
+                  type: string
       404:
         description: No location data available or robot not found
     """
-    db = SessionLocal()
-    try:
-        robot_service = RobotService(db)
+    with SessionLocal() as db:
+        location = LocationService(db).get_latest(robot_id)
+        if location:
+            return jsonify(location.to_dict())
 
-        # Check if robot exists
-        robot = robot_service.get_robot(robot_id)
-        if not robot:
+        # Only a miss needs to tell an unknown robot apart from one without data
+        if not RobotService(db).get_robot(robot_id):
             return jsonify({"error": "Robot not found"}), 404
-
-        location = robot_service.get_latest_location(robot_id)
-        if not location:
-            return jsonify({"error": "No location data available"}), 404
-
-        return jsonify({"robot_id": robot_id, "location": location})
-    finally:
-        db.close()
+        return jsonify({"error": "No location data available"}), 404
 
 
 @location_router.route("/robots/<robot_id>/location", methods=["POST"])
@@ -82,6 +98,11 @@ def update_robot_location(robot_id: str):
                 type: array
                 items:
                   type: number
+              heading:
+                type: number
+              timestamp:
+                type: string
+                format: date-time
     responses:
       200:
         description: Location updated
@@ -98,28 +119,421 @@ def update_robot_location(robot_id: str):
             return jsonify({"error": "Location must be an array of [x, y]"}), 400
 
         x, y = location
+        timestamp = location_data.get("timestamp")
+        if timestamp:
+            timestamp = datetime.fromisoformat(timestamp)
 
-        db = SessionLocal()
-        try:
+        with SessionLocal() as db:
             # First check if the robot exists
-            robot_service = RobotService(db)
-            robot = robot_service.get_robot(robot_id)
+            robot = RobotService(db).get_robot(robot_id)
             if not robot:
                 return jsonify({"error": "Robot not found"}), 404
 
-            # Create a new step for the robot
-            step_service = StepService(db)
-            step = RobotStep(location=(float(x), float(y)))
-            step_service.create_step(step, robot_id)
+            latest = LocationService(db).record_location(
+                robot_id, x, y, heading=location_data.get("heading"), timestamp=timestamp
+            )
 
             return jsonify(
                 {
                     "message": "Location updated",
                     "robot_id": robot_id,
-                    "location": [x, y],
+                    "location": [latest.x, latest.y],
+                    "heading": latest.heading,
+                    "timestamp": latest.timestamp.isoformat(),
                 }
             )
-        finally:
-            db.close()
     except Exception as e:
         return jsonify({"error": f"Error updating location: {str(e)}"}), 400
+
+
+@location_router.route("/locations/batch", methods=["POST"])
+def record_location_batch():
+    """
+    Post buffered location fixes of one or more robots
+    ---
+    tags:
+      - Locations
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              robot_id:
+                type: string
+                description: Robot of fixes that do not name one
+              fixes:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    robot_id:
+                      type: string
+                    location:
+                      type: array
+                      items:
+                        type: number
+                    heading:
+                      type: number
+                    timestamp:
+                      type: string
+                      format: date-time
+    responses:
+      200:
+        description: Fixes recorded, with the latest location of each robot
+      400:
+        description: Invalid fixes or unknown robots
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        batch = LocationBatch.from_fixes(data.get("fixes"), data.get("robot_id"), Config.LOCATION_BATCH_MAX_FIXES)
+        with SessionLocal() as db:
+            latest = LocationService(db).record_batch(batch)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error recording locations: {str(e)}"}), 500
+    return jsonify({
+        "message": "Locations recorded",
+        "count": len(batch),
+        "locations": [location.to_dict() for location in latest],
+    })
+
+
+@location_router.route("/robots/<robot_id>/track", methods=["GET"])
+def get_robot_track(robot_id: str):
+    """
+    Get the simplified track of a robot over a time window
+    ---
+    tags:
+      - Locations
+    parameters:
+      - name: robot_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: start
+        in: query
+        schema:
+          type: string
+          format: date-time
+        description: Window start, defaults to 24 hours before end
+      - name: end
+        in: query
+        schema:
+          type: string
+          format: date-time
+        description: Window end, defaults to now
+      - name: tolerance
+        in: query
+        schema:
+          type: number
+        description: Simplification tolerance in location units
+      - name: zoom
+        in: query
+        schema:
+          type: integer
+        description: Map zoom level, used for a one-pixel tolerance when tolerance is not given
+      - name: algorithm
+        in: query
+        schema:
+          type: string
+          enum: [dp, vw]
+          default: dp
+        description: Douglas-Peucker (dp) or Visvalingam-Whyatt (vw)
+    responses:
+      200:
+        description: Track points and timestamps, oldest first
+      400:
+        description: Invalid window or simplification parameters
+    """
+    try:
+        end = parse_timestamp(request.args.get("end"))
+        start = parse_timestamp(request.args.get("start"))
+        if start is None:
+            # Whole minutes keep the default window cacheable between requests
+            start = (end or datetime.utcnow()).replace(second=0, microsecond=0) - timedelta(hours=24)
+        if end and start > end:
+            return jsonify({"error": "start must not be after end"}), 400
+
+        tolerance = request.args.get("tolerance", type=float)
+        zoom = request.args.get("zoom", type=int)
+        if tolerance is None:
+            tolerance = tolerance_for_zoom(zoom) if zoom is not None else 0.0
+        algorithm = request.args.get("algorithm", "dp")
+        if algorithm not in SIMPLIFY_ALGORITHMS:
+            return jsonify({"error": f"algorithm must be one of: {list(SIMPLIFY_ALGORITHMS)}"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with SessionLocal() as db:
+        track = TrajectoryService(db).get_track(robot_id, start, end, tolerance, algorithm)
+    return jsonify(track)
+
+
+def parse_playback_args(args: Mapping) -> Tuple[Optional[List[str]], datetime, datetime, float]:
+    """Robot set, window and speed of a playback request. Raises ValueError."""
+    start = parse_timestamp(args.get("start"))
+    end = parse_timestamp(args.get("end"))
+    if start is None or end is None:
+        raise ValueError("start and end are required")
+    if end <= start:
+        raise ValueError("end must be after start")
+    speed = float(args.get("speed", 1.0))
+    if not 0 <= speed <= Config.PLAYBACK_MAX_SPEED:
+        raise ValueError(f"speed must be between 0 and {Config.PLAYBACK_MAX_SPEED:g}")
+    robot_ids = args.get("robot_ids")
+    if isinstance(robot_ids, str):
+        robot_ids = [robot_id for robot_id in robot_ids.split(",") if robot_id]
+    return robot_ids or None, start, end, speed
+
+
+@location_router.route("/playback", methods=["GET"])
+def get_fleet_playback():
+    """
+    Replay the positions of a set of robots over a time range as NDJSON
+    ---
+    tags:
+      - Locations
+    parameters:
+      - name: start
+        in: query
+        schema:
+          type: string
+          format: date-time
+        required: true
+      - name: end
+        in: query
+        schema:
+          type: string
+          format: date-time
+        required: true
+      - name: robot_ids
+        in: query
+        schema:
+          type: string
+        required: false
+        description: Comma-separated robot IDs, every robot if omitted
+      - name: speed
+        in: query
+        schema:
+          type: number
+        required: false
+        description: Playback speed multiplier, 0 to stream without pacing
+    responses:
+      200:
+        description: One position per line, oldest first, then an end line
+      400:
+        description: Invalid range or speed
+    """
+    try:
+        robot_ids, start, end, speed = parse_playback_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        # The stream outlives the request handler; the service opens a session per read
+        count = 0
+        service = PlaybackService(SessionLocal)
+        for frame in service.frames(service.select_robots(robot_ids), start, end, speed):
+            count += len(frame)
+            yield "".join(json.dumps(position, separators=(",", ":")) + "\n" for position in frame)
+        yield json.dumps({"end": True, "count": count}) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
+@location_router.route("/locations", methods=["GET"])
+def get_fleet_locations():
+    """
+    Get the current location of every robot
+    ---
+    tags:
+      - Locations
+    responses:
+      200:
+        description: Latest location per robot
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                locations:
+                  type: array
+                  items:
+                    type: object
+                count:
+                  type: integer
+    """
+    with SessionLocal() as db:
+        locations = LocationService(db).get_all()
+    return jsonify({"locations": [location.to_dict() for location in locations], "count": len(locations)})
+
+
+@location_router.route("/tiles/<int:z>/<int:x>/<int:y>", methods=["GET"])
+def get_fleet_tile(z: int, x: int, y: int):
+    """
+    Get the robots in a map tile as GeoJSON, clustered at low zoom and with
+    recent trails at high zoom
+    ---
+    tags:
+      - Locations
+    parameters:
+      - name: z
+        in: path
+        schema:
+          type: integer
+        required: true
+      - name: x
+        in: path
+        schema:
+          type: integer
+        required: true
+      - name: y
+        in: path
+        schema:
+          type: integer
+        required: true
+      - name: If-None-Match
+        in: header
+        schema:
+          type: string
+        required: false
+    responses:
+      200:
+        description: GeoJSON FeatureCollection with an ETag that changes when robots in the tile move
+      304:
+        description: Tile unchanged since the given ETag
+      404:
+        description: Tile not found
+    """
+    try:
+        with SessionLocal() as db:
+            etag, body = LocationService(db).get_fleet_tile(z, x, y)
+    except ValueError:
+        return jsonify({"error": "Tile not found"}), 404
+    response = Response(body, mimetype="application/geo+json")
+    response.set_etag(etag)
+    # Clients revalidate every time; unchanged tiles cost a 304
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@location_router.route("/locations/within", methods=["GET"])
+def get_locations_within():
+    """
+    Find robots inside a bounding box or within a radius of a point
+    ---
+    tags:
+      - Locations
+    parameters:
+      - name: min_x
+        in: query
+        schema:
+          type: number
+      - name: min_y
+        in: query
+        schema:
+          type: number
+      - name: max_x
+        in: query
+        schema:
+          type: number
+      - name: max_y
+        in: query
+        schema:
+          type: number
+      - name: x
+        in: query
+        schema:
+          type: number
+        description: Center of a radius query
+      - name: y
+        in: query
+        schema:
+          type: number
+        description: Center of a radius query
+      - name: radius
+        in: query
+        schema:
+          type: number
+    responses:
+      200:
+        description: Robots in the area; radius queries are sorted by distance
+      400:
+        description: Neither a complete bounding box nor a point and radius was given
+    """
+    bbox = [request.args.get(name, type=float) for name in ("min_x", "min_y", "max_x", "max_y")]
+    center = [request.args.get(name, type=float) for name in ("x", "y", "radius")]
+
+    try:
+        with SessionLocal() as db:
+            service = LocationService(db)
+            if all(value is not None for value in bbox):
+                locations = [location.to_dict() for location in service.find_in_bbox(*bbox)]
+            elif all(value is not None for value in center):
+                locations = [
+                    {**location.to_dict(), "distance": distance}
+                    for location, distance in service.find_within_radius(*center)
+                ]
+            else:
+                return jsonify({"error": "Provide min_x, min_y, max_x and max_y, or x, y and radius"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"locations": locations, "count": len(locations)})
+
+
+@location_router.route("/locations/nearest", methods=["GET"])
+def get_nearest_locations():
+    """
+    Find the robots closest to a point
+    ---
+    tags:
+      - Locations
+    parameters:
+      - name: x
+        in: query
+        required: true
+        schema:
+          type: number
+      - name: y
+        in: query
+        required: true
+        schema:
+          type: number
+      - name: n
+        in: query
+        schema:
+          type: integer
+          default: 5
+        description: Number of robots to return
+      - name: max_distance
+        in: query
+        schema:
+          type: number
+    responses:
+      200:
+        description: Closest robots with their distance, nearest first
+      400:
+        description: Missing or invalid point
+    """
+    x = request.args.get("x", type=float)
+    y = request.args.get("y", type=float)
+    count = request.args.get("n", default=5, type=int)
+    max_distance = request.args.get("max_distance", type=float)
+    if x is None or y is None:
+        return jsonify({"error": "x and y are required"}), 400
+    if count < 1:
+        return jsonify({"error": "n must be at least 1"}), 400
+
+    try:
+        with SessionLocal() as db:
+            nearest = LocationService(db).find_nearest(x, y, count, max_distance)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    locations = [{**location.to_dict(), "distance": distance} for location, distance in nearest]
+    return jsonify({"locations": locations, "count": len(locations)})
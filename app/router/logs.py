@@ -0,0 +1,142 @@
+"""Robot log routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+from datetime import datetime, timedelta
+
+from app.data.database import SessionLocal
+from app.data.robot.repository import RobotRepository
+from app.api.logs.service import LogService
+from app.api.logs.stream import LOG_ENCODINGS, LogUploadTooLarge
+from app.router.location import parse_timestamp
+
+log_router = Blueprint("logs", __name__, url_prefix="/api/logs")
+
+
+@log_router.route("/<robot_id>", methods=["POST"])
+def upload_logs(robot_id: str):
+    """
+    Upload a robot log bundle
+    ---
+    tags:
+      - Robot Logs
+    parameters:
+      - name: robot_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: source
+        in: query
+        description: Log the lines come from, e.g. agrobot.service
+        schema:
+          type: string
+      - name: Content-Encoding
+        in: header
+        schema:
+          type: string
+          enum: [gzip, zstd, identity]
+    requestBody:
+      required: true
+      content:
+        application/octet-stream:
+          schema:
+            type: string
+            format: binary
+    responses:
+      201:
+        description: Lines stored
+      400:
+        description: Corrupt or unsupported upload
+      404:
+        description: Robot not found
+      413:
+        description: Upload too large once decompressed
+    """
+    encoding = (request.headers.get("Content-Encoding") or "").lower() or None
+    if encoding is not None and encoding not in LOG_ENCODINGS:
+        return jsonify({"error": f"Unsupported Content-Encoding {encoding}"}), HTTPStatus.BAD_REQUEST
+    try:
+        with SessionLocal() as db:
+            if not RobotRepository(db).get_by_id(robot_id):
+                return jsonify({"error": "Robot not found"}), HTTPStatus.NOT_FOUND
+            upload = LogService(db).ingest(robot_id, request.stream, encoding, request.args.get("source"))
+            return jsonify(upload), HTTPStatus.CREATED
+    except LogUploadTooLarge as e:
+        return jsonify({"error": str(e)}), HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error storing logs of robot {robot_id}: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@log_router.route("/<robot_id>", methods=["GET"])
+def query_logs(robot_id: str):
+    """
+    Query a robot's logs
+    ---
+    tags:
+      - Robot Logs
+    parameters:
+      - name: robot_id
+        in: path
+        schema:
+          type: string
+        required: true
+      - name: start
+        in: query
+        description: Defaults to a day before end
+        schema:
+          type: string
+          format: date-time
+      - name: end
+        in: query
+        description: Defaults to now
+        schema:
+          type: string
+          format: date-time
+      - name: q
+        in: query
+        description: Words that must all appear in a line, as word prefixes
+        schema:
+          type: string
+      - name: level
+        in: query
+        schema:
+          type: string
+      - name: cursor
+        in: query
+        schema:
+          type: string
+      - name: limit
+        in: query
+        schema:
+          type: integer
+    responses:
+      200:
+        description: Matching lines and the cursor of the next page
+      400:
+        description: Invalid parameters
+    """
+    try:
+        end = parse_timestamp(request.args.get("end")) or datetime.utcnow()
+        start = parse_timestamp(request.args.get("start")) or end - timedelta(days=1)
+        if start > end:
+            raise ValueError("start must be before end")
+        with SessionLocal() as db:
+            lines, next_cursor = LogService(db).query(
+                robot_id,
+                start,
+                end,
+                query=request.args.get("q"),
+                level=request.args.get("level"),
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit", type=int),
+            )
+            return jsonify({"robot_id": robot_id, "lines": lines, "next_cursor": next_cursor}), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error querying logs of robot {robot_id}: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
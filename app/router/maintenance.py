@@ -0,0 +1,138 @@
+"""Component maintenance routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.data.enums import ComponentType
+from app.api.component.status import normalize
+from app.api.maintenance.service import MaintenanceService
+from app.router.location import parse_timestamp
+
+maintenance_router = Blueprint("maintenance", __name__, url_prefix="/api/maintenance")
+
+
+def component_type_arg():
+    return normalize(ComponentType, request.args.get("component_type") or None)
+
+
+@maintenance_router.route("/due", methods=["GET"])
+def get_due_maintenance():
+    """
+    List components due for maintenance
+    ---
+    tags:
+      - Maintenance
+    parameters:
+      - name: days
+        in: query
+        description: Horizon in days; overdue components are included. Defaults to MAINTENANCE_DUE_DAYS
+        schema:
+          type: number
+      - name: robot_id
+        in: query
+        schema:
+          type: string
+      - name: component_type
+        in: query
+        schema:
+          type: string
+    responses:
+      200:
+        description: Components grouped by robot and component type, earliest due first
+      400:
+        description: Invalid parameters
+    """
+    try:
+        with SessionLocal() as db:
+            return jsonify(MaintenanceService(db).due(
+                days=request.args.get("days", type=float),
+                robot_id=request.args.get("robot_id"),
+                component_type=component_type_arg(),
+            )), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error listing due maintenance: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@maintenance_router.route("/overdue", methods=["GET"])
+def get_overdue_maintenance():
+    """
+    List components past their maintenance date
+    ---
+    tags:
+      - Maintenance
+    parameters:
+      - name: robot_id
+        in: query
+        schema:
+          type: string
+      - name: component_type
+        in: query
+        schema:
+          type: string
+    responses:
+      200:
+        description: Components grouped by robot and component type, most overdue first
+    """
+    try:
+        with SessionLocal() as db:
+            return jsonify(MaintenanceService(db).overdue(
+                robot_id=request.args.get("robot_id"),
+                component_type=component_type_arg(),
+            )), HTTPStatus.OK
+    except Exception as e:
+        current_app.logger.error(f"Error listing overdue maintenance: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@maintenance_router.route("/components/<component_id>", methods=["POST"])
+def record_maintenance(component_id: str):
+    """
+    Record maintenance of a component
+    ---
+    tags:
+      - Maintenance
+    parameters:
+      - name: component_id
+        in: path
+        schema:
+          type: string
+        required: true
+    requestBody:
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              performed_at:
+                type: string
+                format: date-time
+                description: Defaults to now
+              next_maintenance:
+                type: string
+                format: date-time
+    responses:
+      200:
+        description: The component's new schedule; its usage hours start again from zero
+      400:
+        description: Invalid timestamp
+      404:
+        description: Component not found
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        performed_at = parse_timestamp(body.get("performed_at"))
+        next_maintenance = parse_timestamp(body.get("next_maintenance"))
+        with SessionLocal() as db:
+            schedule = MaintenanceService(db).record_maintenance(component_id, performed_at, next_maintenance)
+            if schedule is None:
+                return jsonify({"error": "Component not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(schedule), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error recording maintenance of component {component_id}: {str(e)}")
+        return jsonify({"error": "Internal server error"}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,186 @@
+"""Mission planning and execution routes."""
+
+from flask import Blueprint, jsonify, request, current_app
+from http import HTTPStatus
+
+from app.data.database import SessionLocal
+from app.api.mission.dto import MissionCreate
+from app.api.mission.service import MissionService
+from app.api.planner.dto import CoveragePlanRequest
+from app.api.planner.service import PlannerService
+
+mission_router = Blueprint("mission", __name__, url_prefix="/api/missions")
+
+
+@mission_router.route("/", methods=["POST"])
+def create_mission():
+    """
+    Create a mission for a robot
+    ---
+    tags:
+      - Missions
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              robot_id:
+                type: string
+              name:
+                type: string
+              description:
+                type: string
+              priority:
+                type: integer
+              steps:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    command_type:
+                      type: string
+                    parameters:
+                      type: object
+                    sequence:
+                      type: integer
+    responses:
+      201:
+        description: Mission created
+      400:
+        description: Invalid mission
+    """
+    try:
+        mission = MissionCreate(**(request.get_json() or {}))
+        with SessionLocal() as db:
+            service = MissionService(db)
+            action = service.create_mission(mission)
+            response = action.to_dict()
+            response["total_steps"] = len(mission.steps)
+            return jsonify(response), HTTPStatus.CREATED
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error creating mission: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@mission_router.route("/plan", methods=["POST"])
+def plan_coverage_missions():
+    """
+    Plan boustrophedon coverage of a field split across robots
+    ---
+    tags:
+      - Missions
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            properties:
+              polygon:
+                type: array
+                items:
+                  type: array
+                  items:
+                    type: number
+              geofence_id:
+                type: string
+              swath_width:
+                type: number
+              overlap:
+                type: number
+              angle:
+                type: number
+              robot_ids:
+                type: array
+                items:
+                  type: string
+              robot_count:
+                type: integer
+              speed:
+                type: number
+              name:
+                type: string
+    responses:
+      200:
+        description: One create_mission command per robot
+      400:
+        description: Invalid plan request
+      404:
+        description: Geofence not found
+    """
+    try:
+        plan_request = CoveragePlanRequest(**(request.get_json() or {}))
+        with SessionLocal() as db:
+            plan = PlannerService(db).plan_coverage(plan_request)
+            if plan is None:
+                return jsonify({"error": "Geofence not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(plan), HTTPStatus.OK
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error planning coverage: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@mission_router.route("/<action_id>/execute", methods=["POST"])
+def execute_mission(action_id: str):
+    """
+    Start or resume executing a mission
+    ---
+    tags:
+      - Missions
+    parameters:
+      - name: action_id
+        in: path
+        type: string
+        required: true
+    responses:
+      202:
+        description: Mission running, returns its progress
+      404:
+        description: Mission not found
+    """
+    try:
+        with SessionLocal() as db:
+            progress = MissionService(db).execute_mission(action_id)
+            if not progress:
+                return jsonify({"error": "Mission not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(progress.dict()), HTTPStatus.ACCEPTED
+    except ValueError as e:
+        return jsonify({"error": str(e)}), HTTPStatus.BAD_REQUEST
+    except Exception as e:
+        current_app.logger.error(f"Error executing mission: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@mission_router.route("/<action_id>/progress", methods=["GET"])
+def get_mission_progress(action_id: str):
+    """
+    Get the progress of a mission
+    ---
+    tags:
+      - Missions
+    parameters:
+      - name: action_id
+        in: path
+        type: string
+        required: true
+    responses:
+      200:
+        description: Mission progress
+      404:
+        description: Mission not found
+    """
+    try:
+        with SessionLocal() as db:
+            progress = MissionService(db).get_progress(action_id)
+            if not progress:
+                return jsonify({"error": "Mission not found"}), HTTPStatus.NOT_FOUND
+            return jsonify(progress.dict()), HTTPStatus.OK
+    except Exception as e:
+        current_app.logger.error(f"Error getting mission progress: {str(e)}")
+        return jsonify({"error": str(e)}), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -0,0 +1,72 @@
+"""Fleet playback over the Socket.IO channel."""
+
+import logging
+import threading
+from typing import Dict
+from flask import request
+from flask_socketio import SocketIO, emit
+
+from app.api.trajectory.playback import PlaybackService
+from app.data.database import SessionLocal
+from app.router.location import parse_playback_args
+
+PLAYBACK_NAMESPACE = "/playback"
+
+logger = logging.getLogger(__name__)
+
+
+def register_playback_events(socketio: SocketIO) -> None:
+    """
+    Clients emit "start" with the same fields as GET /playback (robot_ids
+    may be a list) and receive "positions" frames followed by "end". A new
+    "start", "stop" or a disconnect ends the running playback of that client.
+    """
+    running: Dict[str, threading.Event] = {}
+    lock = threading.Lock()
+
+    def stop(sid: str) -> None:
+        with lock:
+            event = running.pop(sid, None)
+        if event is not None:
+            event.set()
+
+    def stream(sid: str, robot_ids, start, end, speed, stopped: threading.Event) -> None:
+        count = 0
+        try:
+            service = PlaybackService(SessionLocal)
+            for frame in service.frames(service.select_robots(robot_ids), start, end, speed):
+                if stopped.is_set():
+                    break
+                count += len(frame)
+                socketio.emit("positions", frame, to=sid, namespace=PLAYBACK_NAMESPACE)
+        except Exception as e:
+            logger.error(f"Error streaming playback to {sid}: {str(e)}")
+            socketio.emit("error", {"error": f"Playback failed: {str(e)}"}, to=sid, namespace=PLAYBACK_NAMESPACE)
+        finally:
+            # Always end the playback, so the client stops waiting and can start another
+            with lock:
+                if running.get(sid) is stopped:
+                    del running[sid]
+            socketio.emit("end", {"count": count, "stopped": stopped.is_set()}, to=sid, namespace=PLAYBACK_NAMESPACE)
+
+    @socketio.on("start", namespace=PLAYBACK_NAMESPACE)
+    def start_playback(data):
+        try:
+            robot_ids, start, end, speed = parse_playback_args(data or {})
+        except ValueError as e:
+            emit("error", {"error": str(e)})
+            return
+        sid = request.sid
+        stop(sid)
+        stopped = threading.Event()
+        with lock:
+            running[sid] = stopped
+        socketio.start_background_task(stream, sid, robot_ids, start, end, speed, stopped)
+
+    @socketio.on("stop", namespace=PLAYBACK_NAMESPACE)
+    def stop_playback():
+        stop(request.sid)
+
+    @socketio.on("disconnect", namespace=PLAYBACK_NAMESPACE)
+    def disconnect():
+        stop(request.sid)
@@ -22,6 +22,8 @@ from app.api.robot.dto import (
 from app.data.robot.repository import RobotRepository
 from app.api.robot.schemas import Robot
 from app.middleware.ip_verification import verify_robot_ip
+from app.middleware.response_cache import cached_response
+from app.data.versions import ROBOTS
 
 robot_router = Blueprint("robot", __name__, url_prefix="/api/v1")
 
@@ -136,6 +138,7 @@ def process_telemetry():
         }
     }
 })
+@cached_response(lambda: [ROBOTS])
 def list_robots():
     """Get all robots."""
     robot_service = get_robot_service()
@@ -172,6 +175,7 @@ def list_robots():
         }
     }
 })
+@cached_response(lambda robot_id: [("robot", robot_id)])
 def get_robot(robot_id: str):
     """Get a robot by ID."""
     robot_service = get_robot_service()
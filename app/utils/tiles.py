@@ -0,0 +1,35 @@
+import math
+from typing import Tuple
+import numpy as np
+
+TILE_SIZE = 256
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) in degrees of a web mercator tile"""
+    if z < 0 or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise ValueError(f"Tile {z}/{x}/{y} does not exist")
+    n = 2 ** z
+    west = x / n * 360.0 - 180.0
+    east = (x + 1) / n * 360.0 - 180.0
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return south, west, north, east
+
+
+def tile_pixel_centers(z: int, x: int, y: int, size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitudes of pixel rows (north to south) and longitudes of pixel columns of a tile"""
+    n = 2 ** z
+    offsets = (np.arange(size) + 0.5) / size
+    longitudes = (x + offsets) / n * 360.0 - 180.0
+    latitudes = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / n))))
+    return latitudes, longitudes
+
+
+def lat_lon_to_tile(latitude: float, longitude: float, z: int) -> Tuple[int, int]:
+    """Tile containing a position at a zoom level"""
+    n = 2 ** z
+    latitude = max(min(latitude, 85.05112878), -85.05112878)
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
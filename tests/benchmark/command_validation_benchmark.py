@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Command Validation Benchmark - Measures per-command parameter validation cost
+"""
+import argparse
+import timeit
+from rich.console import Console
+from rich.table import Table
+
+from app.api.command.parameters import command_parameter_registry
+from app.data.enums import CommandType
+
+console = Console()
+
+SAMPLE_PARAMETERS = {
+    CommandType.MOVE: {"x": 12.5, "y": -3.0, "z": 0.0, "speed": 0.8},
+    CommandType.GOTO: {"location_id": "field-7-gate", "speed": 1.2},
+    CommandType.SET_MODE: {"mode": "AUTONOMOUS"},
+    CommandType.EXECUTE_MISSION: {"action_id": "3f1c2f9e-5a1b-4c7e-9d2a-0b6f1e8c4a11"},
+    CommandType.CREATE_MISSION: {
+        "name": "North field pass",
+        "steps": [
+            {"sequence": i, "command_type": CommandType.GOTO.value,
+             "parameters": {"location_id": f"waypoint-{i}"}}
+            for i in range(20)
+        ],
+    },
+}
+
+
+def run(iterations: int, repeat: int):
+    table = Table(title=f"Command parameter validation ({iterations} iterations, best of {repeat})")
+    table.add_column("Command type")
+    table.add_column("µs / command", justify="right")
+    table.add_column("commands / s", justify="right")
+
+    for command_type, parameters in SAMPLE_PARAMETERS.items():
+        # Fail fast if a sample no longer matches its schema
+        command_parameter_registry.validate(command_type, parameters)
+        best = min(timeit.repeat(
+            lambda: command_parameter_registry.validate(command_type, parameters),
+            number=iterations,
+            repeat=repeat
+        ))
+        per_command = best / iterations
+        table.add_row(command_type.value, f"{per_command * 1e6:.2f}", f"{1 / per_command:,.0f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark command parameter validation")
+    parser.add_argument("--iterations", type=int, default=10000, help="Validations per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements to take")
+    args = parser.parse_args()
+    run(args.iterations, args.repeat)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Coverage Planner Benchmark - Shows boustrophedon planning time as fields get
+larger and more detailed, against the cost of a memoized plan
+"""
+import argparse
+import math
+import random
+import timeit
+from rich.console import Console
+from rich.table import Table
+
+from app.api.planner.boustrophedon import plan_coverage
+from app.api.planner.service import CoveragePlanner
+
+console = Console()
+
+UNITS_PER_METER = 1 / 111320
+
+
+def make_field(vertices: int, radius_m: float, rng: random.Random):
+    """Irregular star-shaped field, so concave vertices split the sweep into cells"""
+    radius = radius_m * UNITS_PER_METER
+    return [
+        [
+            45.0 + radius * rng.uniform(0.7, 1.0) * math.cos(2 * math.pi * k / vertices),
+            15.0 + radius * rng.uniform(0.7, 1.0) * math.sin(2 * math.pi * k / vertices),
+        ]
+        for k in range(vertices)
+    ]
+
+
+def run(radii, vertices: int, swath: float, robots: int, seed: int):
+    rng = random.Random(seed)
+    # Everything inline, so the planning cost itself is measured
+    planner = CoveragePlanner(cache_size=16, workers=1, pool_min_work=float("inf"), timeout=60)
+    table = Table(title=f"Boustrophedon planning ({vertices} vertices, {swath} m swath, {robots} robots)")
+    table.add_column("Field radius m", justify="right")
+    table.add_column("Passes", justify="right")
+    table.add_column("Cells", justify="right")
+    table.add_column("Plan ms", justify="right")
+    table.add_column("Cached µs", justify="right")
+
+    spacing = swath * UNITS_PER_METER
+    for radius in radii:
+        field = make_field(vertices, radius, rng)
+        plan = plan_coverage(field, spacing, robots)
+        planned = timeit.timeit(lambda: plan_coverage(field, spacing, robots), number=3) / 3
+        planner.plan(field, spacing, robots)
+        cached = timeit.timeit(lambda: planner.plan(field, spacing, robots), number=100) / 100
+        table.add_row(
+            str(radius), str(plan["pass_count"]), str(plan["cell_count"]),
+            f"{planned * 1e3:.1f}", f"{cached * 1e6:.1f}"
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark coverage path planning")
+    parser.add_argument("--radii", type=int, nargs="+", default=[100, 500, 2000], help="Field radii in meters")
+    parser.add_argument("--vertices", type=int, default=200, help="Field polygon vertices")
+    parser.add_argument("--swath", type=float, default=3.0, help="Swath width in meters")
+    parser.add_argument("--robots", type=int, default=4, help="Robots to split the field between")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    run(args.radii, args.vertices, args.swath, args.robots, args.seed)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Fleet Snapshot Benchmark - Shows that a fleet snapshot costs the same
+number of queries whatever the fleet size, and how long it takes. Exits
+non-zero if the query count grows with the fleet.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from rich.console import Console
+from rich.table import Table
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.fleet.service import SNAPSHOT_FIELDS, FleetSnapshotService
+from app.data.models import Alert, Base, Component, Robot, RobotLocation, TelemetryData
+
+console = Console()
+
+
+def make_fleet(session, robots: int, components: int, telemetry: int, alerts: int, rng: random.Random):
+    start = datetime(2024, 1, 1)
+    for i in range(robots):
+        robot_id = f"robot-{i:05d}"
+        session.add(Robot(robot_id=robot_id, name=robot_id, status="online", capabilities="[]"))
+        session.add(RobotLocation(robot_id=robot_id, x=rng.uniform(45, 46), y=rng.uniform(20, 21), timestamp=start))
+        for c in range(components):
+            session.add(Component(robot_id=robot_id, name=f"component-{c}", parameters={}))
+        for t in range(telemetry):
+            session.add(TelemetryData(robot_id=robot_id, timestamp=start + timedelta(seconds=t), data={"battery": {"level": 90}}))
+        for a in range(alerts):
+            session.add(Alert(robot_id=robot_id, type="other", severity=rng.choice(["low", "high"]), message=f"alert {a}"))
+    session.commit()
+
+
+def run(fleet_sizes, components: int, telemetry: int, alerts: int, repeats: int, seed: int) -> bool:
+    rng = random.Random(seed)
+    table = Table(title=f"Fleet snapshot ({components} components, {telemetry} telemetry records, {alerts} alerts per robot)")
+    table.add_column("Robots", justify="right")
+    table.add_column("Fields", justify="left")
+    table.add_column("Queries", justify="right")
+    table.add_column("ms / snapshot", justify="right")
+
+    selections = {"all": list(SNAPSHOT_FIELDS), "status": ["name", "status", "alerts"]}
+    counts = {name: set() for name in selections}
+    for size in fleet_sizes:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            make_fleet(session, size, components, telemetry, alerts, rng)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for name, fields in selections.items():
+            elapsed = 0.0
+            for _ in range(repeats):
+                with Session() as session:
+                    statements.clear()
+                    started = time.perf_counter()
+                    snapshot = FleetSnapshotService(session).snapshot(fields=fields)
+                    elapsed += time.perf_counter() - started
+            assert len(snapshot) == size
+            counts[name].add(len(statements))
+            table.add_row(str(size), name, str(len(statements)), f"{elapsed / repeats * 1e3:.1f}")
+        engine.dispose()
+
+    console.print(table)
+    constant = all(len(values) == 1 for values in counts.values())
+    if not constant:
+        console.print("[red]Snapshot query count depends on the fleet size[/red]")
+    return constant
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fleet snapshots")
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[1, 10, 100, 500], help="Robots in the fleet")
+    parser.add_argument("--components", type=int, default=8, help="Components per robot")
+    parser.add_argument("--telemetry", type=int, default=20, help="Telemetry records per robot")
+    parser.add_argument("--alerts", type=int, default=3, help="Open alerts per robot")
+    parser.add_argument("--repeats", type=int, default=5, help="Snapshots timed per fleet size")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.fleet_sizes, args.components, args.telemetry, args.alerts, args.repeats, args.seed) else 1)
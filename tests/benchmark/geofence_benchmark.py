@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Geofence Benchmark - Shows per-point geofence evaluation cost as the number
+of fences grows, for single positions and numpy-vectorized batches
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from app.api.geofence.evaluator import GeofenceEvaluator
+from app.api.geofence.index import PreparedGeofence
+from app.data.enums import GeofenceType
+
+console = Console()
+
+
+def make_fences(count: int, extent: float, size: float, rng: random.Random):
+    fences = []
+    for i in range(count):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        polygon = [[x, y], [x + size, y + size * 0.2], [x + size * 0.8, y + size], [x - size * 0.1, y + size * 0.7]]
+        fence_type = GeofenceType.EXCLUSION if i % 5 == 0 else GeofenceType.FIELD
+        fences.append(PreparedGeofence(f"fence-{i}", f"Fence {i}", fence_type, polygon))
+    return fences
+
+
+def run(fence_counts, points: int, batch: int, cell_size: float, seed: int):
+    rng = random.Random(seed)
+    table = Table(title=f"Geofence evaluation ({points} points)")
+    table.add_column("Fences", justify="right")
+    table.add_column("Single µs / point", justify="right")
+    table.add_column(f"Batch of {batch} µs / point", justify="right")
+
+    start = datetime(2024, 1, 1)
+    for count in fence_counts:
+        # Fence density stays constant, as when more fields are added to a map
+        extent = 0.01 * count ** 0.5
+        evaluator = GeofenceEvaluator(cell_size, cooldown_seconds=0)
+        evaluator.load(make_fences(count, extent, 0.004, rng))
+        # A robot's telemetry is a continuous track, so each batch covers a small area
+        steps = np.array([[rng.gauss(0, 0.00005), rng.gauss(0, 0.00005)] for _ in range(points)])
+        steps[::batch] = [[rng.uniform(0, extent), rng.uniform(0, extent)] for _ in range(0, points, batch)]
+        for i in range(0, points, batch):
+            steps[i:i + batch] = np.cumsum(steps[i:i + batch], axis=0)
+        xs, ys = steps[:, 0], steps[:, 1]
+        timestamps = [start + timedelta(seconds=i) for i in range(points)]
+
+        single = timeit.timeit(
+            lambda: [evaluator.evaluate("robot", x, y, t) for x, y, t in zip(xs.tolist(), ys.tolist(), timestamps)],
+            number=1
+        ) / points
+        batched = timeit.timeit(
+            lambda: [
+                evaluator.evaluate_batch("robot", xs[i:i + batch], ys[i:i + batch], timestamps[i:i + batch])
+                for i in range(0, points, batch)
+            ],
+            number=1
+        ) / points
+        table.add_row(str(count), f"{single * 1e6:.1f}", f"{batched * 1e6:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark geofence evaluation")
+    parser.add_argument("--fences", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Fence counts to test")
+    parser.add_argument("--points", type=int, default=5000, help="Positions evaluated per fence count")
+    parser.add_argument("--batch", type=int, default=500, help="Positions per telemetry batch")
+    parser.add_argument("--cell-size", type=float, default=0.005, help="Index grid cell size")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    run(args.fences, args.points, args.batch, args.cell_size, args.seed)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Spatial Index Benchmark - Compares fleet proximity queries on the grid index
+against a naive scan of every robot position
+"""
+import argparse
+import heapq
+import math
+import random
+import timeit
+from rich.console import Console
+from rich.table import Table
+
+from app.api.location.spatial import GridSpatialIndex
+
+console = Console()
+
+
+def naive_bbox(points, min_x, min_y, max_x, max_y):
+    return [robot_id for robot_id, (x, y) in points.items() if min_x <= x <= max_x and min_y <= y <= max_y]
+
+
+def naive_radius(points, cx, cy, radius):
+    found = [(robot_id, math.hypot(x - cx, y - cy)) for robot_id, (x, y) in points.items()]
+    return sorted((neighbor for neighbor in found if neighbor[1] <= radius), key=lambda neighbor: neighbor[1])
+
+
+def naive_nearest(points, cx, cy, count):
+    return heapq.nsmallest(
+        count,
+        ((robot_id, math.hypot(x - cx, y - cy)) for robot_id, (x, y) in points.items()),
+        key=lambda neighbor: neighbor[1]
+    )
+
+
+def run(robots: int, extent: float, cell_size: float, queries: int, seed: int):
+    rng = random.Random(seed)
+    points = {f"robot-{i}": (rng.uniform(0, extent), rng.uniform(0, extent)) for i in range(robots)}
+    index = GridSpatialIndex(cell_size)
+    for robot_id, (x, y) in points.items():
+        index.update(robot_id, x, y)
+
+    centers = [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(queries)]
+    box = extent * 0.02
+    radius = extent * 0.01
+
+    # Both implementations must agree before their timings mean anything
+    for cx, cy in centers[:10]:
+        assert sorted(index.within_bbox(cx, cy, cx + box, cy + box)) == sorted(naive_bbox(points, cx, cy, cx + box, cy + box))
+        assert [n[0] for n in index.within_radius(cx, cy, radius)] == [n[0] for n in naive_radius(points, cx, cy, radius)]
+        assert [n[0] for n in index.nearest(cx, cy, 10)] == [n[0] for n in naive_nearest(points, cx, cy, 10)]
+
+    cases = [
+        ("bbox", lambda cx, cy: index.within_bbox(cx, cy, cx + box, cy + box),
+         lambda cx, cy: naive_bbox(points, cx, cy, cx + box, cy + box)),
+        ("radius", lambda cx, cy: index.within_radius(cx, cy, radius),
+         lambda cx, cy: naive_radius(points, cx, cy, radius)),
+        ("nearest 10", lambda cx, cy: index.nearest(cx, cy, 10),
+         lambda cx, cy: naive_nearest(points, cx, cy, 10)),
+    ]
+
+    table = Table(title=f"Proximity queries over {robots} robots ({queries} queries each)")
+    table.add_column("Query")
+    table.add_column("Grid µs / query", justify="right")
+    table.add_column("Naive µs / query", justify="right")
+    table.add_column("Speedup", justify="right")
+
+    for name, indexed, naive in cases:
+        indexed_time = timeit.timeit(lambda: [indexed(cx, cy) for cx, cy in centers], number=1) / queries
+        naive_time = timeit.timeit(lambda: [naive(cx, cy) for cx, cy in centers], number=1) / queries
+        table.add_row(name, f"{indexed_time * 1e6:.1f}", f"{naive_time * 1e6:.1f}", f"{naive_time / indexed_time:.0f}x")
+
+    update_time = timeit.timeit(
+        lambda: index.update("robot-0", rng.uniform(0, extent), rng.uniform(0, extent)),
+        number=queries
+    ) / queries
+    table.add_row("update", f"{update_time * 1e6:.1f}", "-", "-")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the fleet spatial index")
+    parser.add_argument("--robots", type=int, default=10000, help="Number of robots")
+    parser.add_argument("--extent", type=float, default=0.1, help="Width of the square area robots are spread over")
+    parser.add_argument("--cell-size", type=float, default=0.001, help="Grid cell size")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    run(args.robots, args.extent, args.cell_size, args.queries, args.seed)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Telemetry Rules Benchmark - Shows the cost of evaluating the telemetry rules
+per batch and per record as batches grow, and the state kept per robot
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from rich.console import Console
+from rich.table import Table
+
+from app.api.telemetry.engine import TelemetryRuleEngine
+from app.api.telemetry.rules import DEFAULT_RULES, compile_rules
+
+console = Console()
+
+
+def make_records(count: int, start: datetime, rng: random.Random):
+    records = []
+    battery = 100.0
+    for i in range(count):
+        battery = max(0.0, battery - rng.uniform(0, 0.05))
+        gps = {"latitude": 45 + rng.gauss(0, 1e-4), "longitude": 20 + rng.gauss(0, 1e-4)} if rng.random() > 0.02 else {}
+        records.append((start + timedelta(seconds=i), {
+            "gps": gps,
+            "attitude": {"roll": 0.0, "pitch": 0.0, "yaw": rng.uniform(0, 360)},
+            "battery": {"level": battery},
+            "sensors": {"temperature": rng.gauss(60, 8)},
+        }))
+    return records
+
+
+def run(batch_sizes, robots: int, batches: int, seed: int):
+    rng = random.Random(seed)
+    rules = compile_rules(DEFAULT_RULES)
+    table = Table(title=f"Telemetry rule evaluation ({len(rules)} rules, {robots} robots)")
+    table.add_column("Batch size", justify="right")
+    table.add_column("µs / batch", justify="right")
+    table.add_column("µs / record", justify="right")
+    table.add_column("Firings", justify="right")
+    table.add_column("States", justify="right")
+
+    start = datetime(2024, 1, 1)
+    for size in batch_sizes:
+        engine = TelemetryRuleEngine(rules)
+        streams = {f"robot-{i}": make_records(size * batches, start, rng) for i in range(robots)}
+        for b in range(batches):
+            for robot_id, records in streams.items():
+                engine.evaluate(robot_id, records[b * size:(b + 1) * size])
+        stats = engine.stats.as_dict()
+        table.add_row(
+            str(size),
+            f"{stats['mean_batch_seconds'] * 1e6:.1f}",
+            f"{stats['seconds'] / stats['samples'] * 1e6:.2f}",
+            str(stats["firings"]),
+            str(len(engine._states))
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark telemetry rule evaluation")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="Records per batch")
+    parser.add_argument("--robots", type=int, default=20, help="Robots reporting telemetry")
+    parser.add_argument("--batches", type=int, default=20, help="Batches per robot")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    run(args.batch_sizes, args.robots, args.batches, args.seed)
@@ -0,0 +1,62 @@
+"""
+Fleet Snapshot Test - The snapshot must cost the same number of queries
+whatever the fleet size, for every field selection.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# The app's engine is created on import; the tests use their own
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.api.fleet.service import SNAPSHOT_FIELDS, FleetSnapshotService
+from app.data.models import Alert, Base, Component, Robot, RobotLocation, TelemetryData
+
+SELECTIONS = {
+    "all": list(SNAPSHOT_FIELDS),
+    "status": ["name", "status", "alerts"],
+    "default": None,
+}
+
+
+def make_fleet(session, robots: int) -> None:
+    start = datetime(2024, 1, 1)
+    for i in range(robots):
+        robot_id = f"robot-{i:05d}"
+        session.add(Robot(robot_id=robot_id, name=robot_id, status="online", capabilities="[]"))
+        session.add(RobotLocation(robot_id=robot_id, x=45.0 + i * 1e-3, y=20.0, timestamp=start))
+        for c in range(3):
+            session.add(Component(robot_id=robot_id, name=f"component-{c}", parameters={}))
+        for t in range(4):
+            session.add(TelemetryData(robot_id=robot_id, timestamp=start + timedelta(seconds=t), data={"battery": {"level": 90}}))
+        for severity in ("low", "high"):
+            session.add(Alert(robot_id=robot_id, type="other", severity=severity, message=f"{severity} alert"))
+    session.commit()
+
+
+def count_snapshot_queries(robots: int, fields) -> int:
+    engine = create_engine("sqlite://")
+    try:
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            make_fleet(session, robots)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with Session() as session:
+            snapshot = FleetSnapshotService(session).snapshot(fields=fields)
+        assert len(snapshot) == robots
+        return len(statements)
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("selection", sorted(SELECTIONS))
+def test_snapshot_query_count_is_constant(selection):
+    fields = SELECTIONS[selection]
+    counts = {robots: count_snapshot_queries(robots, fields) for robots in (1, 10, 50)}
+    assert len(set(counts.values())) == 1, f"Snapshot queries grow with the fleet: {counts}"
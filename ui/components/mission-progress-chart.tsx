@@ -2,7 +2,29 @@
 
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from "recharts"
 
-const data = [
+// Step counters returned by GET /api/missions/{action_id}/progress
+export interface MissionProgress {
+  action_id: string
+  total_steps: number
+  completed_steps: number
+  failed_steps: number
+}
+
+export interface MissionProgressPoint {
+  day: string
+  completed: number
+  planned: number
+}
+
+export function toProgressPoint(day: string, missions: MissionProgress[]): MissionProgressPoint {
+  return {
+    day,
+    completed: missions.reduce((sum, mission) => sum + mission.completed_steps, 0),
+    planned: missions.reduce((sum, mission) => sum + mission.total_steps, 0),
+  }
+}
+
+const sampleData: MissionProgressPoint[] = [
   { day: "Mon", completed: 8, planned: 10 },
   { day: "Tue", completed: 12, planned: 14 },
   { day: "Wed", completed: 15, planned: 16 },
@@ -12,7 +34,7 @@ const data = [
   { day: "Sun", completed: 7, planned: 8 },
 ]
 
-export function MissionProgressChart() {
+export function MissionProgressChart({ data = sampleData }: { data?: MissionProgressPoint[] }) {
   return (
     <div className="h-[300px]">
       <ResponsiveContainer width="100%" height="100%">